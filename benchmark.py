@@ -0,0 +1,54 @@
+import argparse
+import sys
+
+from runners.benchmark import (BASELINES_PATH, DEFAULT_TOLERANCE, SUITE, compare, load_baselines, run_suite,
+                               save_baselines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the PIBT MAPD benchmark suite and compare against baselines.")
+    parser.add_argument('--cases', nargs='+', choices=[case.name for case in SUITE],
+                        help="Run only these cases (default: all)")
+    parser.add_argument('--baselines', default=BASELINES_PATH, help="Baselines JSON file")
+    parser.add_argument('--update-baselines', action='store_true',
+                        help="Store the results as the new baselines instead of comparing")
+    parser.add_argument('--speed-tolerance', type=float, default=DEFAULT_TOLERANCE['steps_per_sec'],
+                        help="Allowed relative drop of steps/sec")
+    parser.add_argument('--memory-tolerance', type=float, default=DEFAULT_TOLERANCE['peak_rss_mb'],
+                        help="Allowed relative growth of peak RSS")
+    parser.add_argument('--throughput-tolerance', type=float, default=DEFAULT_TOLERANCE['throughput'],
+                        help="Allowed relative drop of throughput")
+    args = parser.parse_args()
+
+    cases = [case for case in SUITE if args.cases is None or case.name in args.cases]
+    results = run_suite(cases)
+    baselines = load_baselines(args.baselines)
+
+    for row in results:
+        baseline = baselines.get(row['name'], {})
+        line = (f"{row['name']}: steps/sec={row['steps_per_sec']:.1f} peak_rss={row['peak_rss_mb']:.1f}MB "
+                f"throughput={row['throughput']:.4f}")
+        if baseline:
+            line += (f" (baseline {baseline['steps_per_sec']:.1f}, {baseline['peak_rss_mb']:.1f}MB, "
+                     f"{baseline['throughput']:.4f})")
+        print(line)
+
+    if args.update_baselines:
+        save_baselines(results, args.baselines)
+        print(f"Updated baselines in {args.baselines}")
+        return
+
+    tolerance = {
+        'steps_per_sec': args.speed_tolerance,
+        'peak_rss_mb': args.memory_tolerance,
+        'throughput': args.throughput_tolerance,
+    }
+    regressions = compare(results, baselines, tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
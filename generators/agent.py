@@ -1,23 +1,30 @@
-
 import random
 from typing import List
+
+import numpy as np
+
 from models.agent import Agent
 from models.layout import Layout
 
 
 def initialize_positions_randomly(agents: List[Agent], layout: Layout) -> None:
     """Randomly initialize agent positions on empty cells of the layout"""
-    empty_cells = [
-        (x, y)
-        for y in range(layout.height)
-        for x in range(layout.width)
-        if layout.get_value(x, y) == Layout.CELL_EMPTY or layout.get_value(x, y) == Layout.CELL_STORAGE or layout.get_value(x, y) == Layout.CELL_OUTPUT
-    ]
-    
+    # Traversable cells (empty, storage, output) in row-major order
+    ys, xs = np.nonzero(layout.grid)
+    empty_cells = list(zip(xs.tolist(), ys.tolist()))
+
     random.shuffle(empty_cells)
-    
+
     for agent in agents:
         if empty_cells:
             agent.x, agent.y = empty_cells.pop()
         else:
-            raise ValueError("Not enough empty cells to place all agents")
\ No newline at end of file
+            raise ValueError("Not enough empty cells to place all agents")
+
+
+def initialize_positions_from_scenario(agents: List[Agent], starts: np.ndarray) -> None:
+    """Place agents on the first len(agents) starts, e.g. Scenario.starts of a MovingAI .scen file"""
+    if len(starts) < len(agents):
+        raise ValueError("Not enough scenario starts to place all agents")
+    for agent, (x, y) in zip(agents, starts.tolist()):
+        agent.x, agent.y = x, y
@@ -1,16 +1,64 @@
+import numpy as np
+
 from models.layout import Layout
 
 
+def _block_pattern(width: int, height: int, block_width: int, block_height: int,
+                   spacing_x: int, spacing_y: int, border_space: int) -> np.ndarray:
+    """Boolean mask of repeating blocks separated by spacing, inside a border.
+
+    Args:
+        width: Layout width.
+        height: Layout height.
+        block_width: Block width in cells.
+        block_height: Block height in cells.
+        spacing_x: Horizontal spacing between blocks.
+        spacing_y: Vertical spacing between blocks.
+        border_space: Space between blocks and borders.
+
+    Returns:
+        Array of shape (height, width), True inside blocks.
+    """
+    # Calculate pattern repeat (block + spacing)
+    pattern_width = block_width + spacing_x
+    pattern_height = block_height + spacing_y
+
+    ys = np.arange(height)[:, None]
+    xs = np.arange(width)[None, :]
+
+    # Position within pattern, blocks only within the border space
+    in_x = ((xs - border_space) % pattern_width < block_width) & (xs >= border_space) & (xs < width - border_space)
+    in_y = ((ys - border_space) % pattern_height < block_height) & (ys >= border_space) & (ys < height - border_space)
+    return in_x & in_y
+
+
+def obstacle_adjacent(obstacles: np.ndarray) -> np.ndarray:
+    """Boolean mask of inner cells 4-adjacent to an obstacle (border cells excluded)."""
+    height, width = obstacles.shape
+    adjacent = np.zeros_like(obstacles)
+    adjacent[1:, :] |= obstacles[:-1, :]
+    adjacent[:-1, :] |= obstacles[1:, :]
+    adjacent[:, 1:] |= obstacles[:, :-1]
+    adjacent[:, :-1] |= obstacles[:, 1:]
+    adjacent[[0, height - 1], :] = False
+    adjacent[:, [0, width - 1]] = False
+    return adjacent
+
+
+def _add_border_outputs(layout: Layout):
+    """Add outputs on every second cell of the top and bottom borders."""
+    layout.fill((0, slice(None, None, 2)), Layout.CELL_OUTPUT)
+    layout.fill((layout.height - 1, slice(None, None, 2)), Layout.CELL_OUTPUT)
+
+
 def storage_floor(width: int, height: int) -> Layout:
     layout = Layout(width, height)
 
     # Storage everywhere
-    for y in range(1, height - 1):
-        for x in range(1, width - 1):
-            layout.set_value(x, y, Layout.CELL_STORAGE)
+    layout.fill((slice(1, height - 1), slice(1, width - 1)), Layout.CELL_STORAGE)
 
     # Output at (0, 0)
-    layout.set_value(0, 0, Layout.CELL_OUTPUT)
+    layout.fill((0, 0), Layout.CELL_OUTPUT)
 
     layout.compute_storage_cells()
     layout.compute_output_cells()
@@ -22,32 +70,13 @@ def storage_walls(width: int, height: int) -> Layout:
 
     # Create shelf blocks of 4x2 with spaces around them
     # Pattern: shelf block (4 wide x 2 tall) + 1 space horizontally, 1 space vertically
-    block_width = 4
-    block_height = 2
-    spacing_x = 1  # Horizontal spacing between blocks
-    spacing_y = 1  # Vertical spacing between blocks
-    border_space = 2  # Space between shelves and borders
-    
-    # Calculate pattern repeat (block + spacing)
-    pattern_width = block_width + spacing_x
-    pattern_height = block_height + spacing_y
-    
     # Leave 2 cells border space
-    for y in range(border_space, height - border_space):
-        for x in range(border_space, width - border_space):
-            # Calculate position within pattern
-            pattern_x = (x - border_space) % pattern_width
-            pattern_y = (y - border_space) % pattern_height
-            
-            # If within shelf block dimensions (not in spacing), place storage
-            if pattern_x < block_width and pattern_y < block_height:
-                layout.set_value(x, y, Layout.CELL_STORAGE)
-    
+    shelves = _block_pattern(width, height, block_width=4, block_height=2,
+                             spacing_x=1, spacing_y=1, border_space=2)
+    layout.fill(shelves, Layout.CELL_STORAGE)
+
     # Add outputs on the borders (top and bottom)
-    for x in range(width):
-        if x % 2 == 0:
-            layout.set_value(x, 0, Layout.CELL_OUTPUT)
-            layout.set_value(x, height - 1, Layout.CELL_OUTPUT)
+    _add_border_outputs(layout)
 
     layout.compute_storage_cells()
     layout.compute_output_cells()
@@ -59,55 +88,17 @@ def obstacle_walls(width: int, height: int) -> Layout:
 
     # Create obstacle blocks with storage around them
     # Pattern: obstacle block (4 wide x 2 tall) + 3 cells spacing between blocks
-    block_width = 4
-    block_height = 2
-    spacing_x = 3  # 3 cells horizontal spacing between obstacle blocks
-    spacing_y = 3  # 3 cells vertical spacing between obstacle blocks
-    border_space = 2  # Space between obstacles and borders
-    
-    # Calculate pattern repeat (block + spacing)
-    pattern_width = block_width + spacing_x
-    pattern_height = block_height + spacing_y
-    
-    # Track obstacle positions
-    obstacle_positions = set()
-    
-    # Place obstacles in a grid pattern
-    for y in range(border_space, height - border_space):
-        for x in range(border_space, width - border_space):
-            # Calculate position within pattern
-            pattern_x = (x - border_space) % pattern_width
-            pattern_y = (y - border_space) % pattern_height
-            
-            # If within obstacle block dimensions (not in spacing), place obstacle
-            if pattern_x < block_width and pattern_y < block_height:
-                layout.set_value(x, y, Layout.CELL_OBSTACLE)
-                obstacle_positions.add((x, y))
-    
-    # Place storage around obstacles (adjacent to obstacle blocks)
-    for y in range(1, height - 1):
-        for x in range(1, width - 1):
-            current_value = layout.get_value(x, y)
-            # If cell is empty, check if it's adjacent to an obstacle
-            if current_value == Layout.CELL_EMPTY:
-                # Check 4 directions for adjacent obstacles
-                adjacent_to_obstacle = False
-                for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                    nx, ny = x + dx, y + dy
-                    if (nx, ny) in obstacle_positions:
-                        adjacent_to_obstacle = True
-                        break
-                
-                if adjacent_to_obstacle:
-                    layout.set_value(x, y, Layout.CELL_STORAGE)
-    
+    obstacles = _block_pattern(width, height, block_width=4, block_height=2,
+                               spacing_x=3, spacing_y=3, border_space=2)
+    layout.fill(obstacles, Layout.CELL_OBSTACLE)
+
+    # Place storage around obstacles: empty inner cells 4-adjacent to an obstacle block
+    layout.fill(obstacle_adjacent(obstacles) & (layout.cells == Layout.CELL_EMPTY), Layout.CELL_STORAGE)
+
     # Add outputs on the borders (top and bottom)
-    for x in range(width):
-        if x % 2 == 0:
-            layout.set_value(x, 0, Layout.CELL_OUTPUT)
-            layout.set_value(x, height - 1, Layout.CELL_OUTPUT)
+    _add_border_outputs(layout)
 
     layout.compute_storage_cells()
     layout.compute_output_cells()
 
-    return layout
\ No newline at end of file
+    return layout
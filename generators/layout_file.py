@@ -0,0 +1,150 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from generators.layout import obstacle_adjacent
+from models.layout import Layout
+
+
+# MovingAI terrain: '.' 'G' passable, 'S' swamp (passable), '@' 'O' out of bounds, 'T' trees, 'W' water
+MOVINGAI_PASSABLE = b'.GS'
+MOVINGAI_BLOCKED = b'@OTW'
+
+# Native format: one character per cell, one line per row
+NATIVE_CHARS = {
+    Layout.CELL_EMPTY: '.',
+    Layout.CELL_STORAGE: 's',
+    Layout.CELL_OBSTACLE: '@',
+    Layout.CELL_OUTPUT: 'o',
+}
+
+
+@dataclass
+class Scenario:
+    """Start/goal pairs of a MovingAI .scen file."""
+    map_name: str
+    starts: np.ndarray  # (n, 2) array of start (x, y)
+    goals: np.ndarray  # (n, 2) array of goal (x, y)
+    optimal_lengths: np.ndarray  # (n,) optimal 8-connected path lengths from the benchmark
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+
+def _lookup_table(mapping: dict[bytes, int]) -> np.ndarray:
+    table = np.full(256, -1, dtype=np.int8)
+    for chars, value in mapping.items():
+        table[np.frombuffer(chars, dtype=np.uint8)] = value
+    return table
+
+
+_MOVINGAI_TABLE = _lookup_table({MOVINGAI_PASSABLE: Layout.CELL_EMPTY, MOVINGAI_BLOCKED: Layout.CELL_OBSTACLE})
+_NATIVE_TABLE = _lookup_table({char.encode(): value for value, char in NATIVE_CHARS.items()})
+
+
+def _parse_cells(body: bytes, width: int, height: int, table: np.ndarray, path) -> np.ndarray:
+    """Decode a block of map rows into cell types in one vectorized pass."""
+    chars = np.frombuffer(body, dtype=np.uint8)
+    chars = chars[(chars != ord('\n')) & (chars != ord('\r'))]
+    if chars.size != width * height:
+        raise ValueError(f"{path}: expected {width}x{height} cells, found {chars.size}")
+    cells = table[chars]
+    invalid = cells < 0
+    if invalid.any():
+        raise ValueError(f"{path}: unknown cell character {chr(chars[np.argmax(invalid)])!r}")
+    return cells.reshape(height, width)
+
+
+def load_movingai_map(path: str | Path) -> Layout:
+    """Load a MovingAI .map file.
+
+    MovingAI maps only distinguish passable and blocked terrain, so storage and
+    outputs are derived the same way as in obstacle_walls: passable inner cells
+    4-adjacent to an obstacle become storage, and every second passable cell of
+    the top and bottom rows becomes an output.
+
+    Args:
+        path: Path to the .map file.
+
+    Returns:
+        New layout with computed storage and output cells.
+    """
+    data = Path(path).read_bytes().replace(b'\r\n', b'\n')
+    header, sep, body = data.partition(b'\nmap\n')
+    if not sep:
+        raise ValueError(f"{path}: missing 'map' line")
+    fields = dict(line.split(None, 1) for line in header.decode().splitlines() if line.strip())
+    if fields.get('type', 'octile') != 'octile':
+        raise ValueError(f"{path}: unsupported map type {fields['type']!r}")
+    width, height = int(fields['width']), int(fields['height'])
+
+    cells = _parse_cells(body.rstrip(b'\n'), width, height, _MOVINGAI_TABLE, path)
+    free = cells == Layout.CELL_EMPTY
+    cells[obstacle_adjacent(~free) & free] = Layout.CELL_STORAGE
+    for y in (0, height - 1):
+        row = cells[y, ::2]
+        row[row == Layout.CELL_EMPTY] = Layout.CELL_OUTPUT
+
+    return Layout.from_cells(cells)
+
+
+def save_movingai_map(layout: Layout, path: str | Path) -> None:
+    """Write a layout as a MovingAI .map file (obstacles '@', everything else '.')."""
+    rows = np.where(layout.cells == Layout.CELL_OBSTACLE, ord('@'), ord('.')).astype(np.uint8)
+    body = b'\n'.join(row.tobytes() for row in rows)
+    header = f"type octile\nheight {layout.height}\nwidth {layout.width}\nmap\n".encode()
+    Path(path).write_bytes(header + body + b'\n')
+
+
+def load_movingai_scen(path: str | Path) -> Scenario:
+    """Load a MovingAI .scen file (version 1).
+
+    Args:
+        path: Path to the .scen file.
+
+    Returns:
+        Scenario with the start and goal of every line, in file order.
+    """
+    with open(path) as f:
+        version = f.readline().split()
+        if version[:1] != ['version']:
+            raise ValueError(f"{path}: missing version line")
+        first = f.readline()
+    map_name = first.split('\t')[1] if first else ''
+    rows = np.loadtxt(path, skiprows=1, delimiter='\t', usecols=(4, 5, 6, 7, 8), ndmin=2)
+    coords = rows[:, :4].astype(np.int64)
+    return Scenario(map_name, coords[:, 0:2], coords[:, 2:4], rows[:, 4])
+
+
+def load_layout(path: str | Path) -> Layout:
+    """Load a layout in the native format.
+
+    Each line is one row of cells: '.' empty, 's' storage, '@' obstacle, 'o' output.
+
+    Args:
+        path: Path to the layout file.
+
+    Returns:
+        New layout with computed storage and output cells.
+    """
+    body = Path(path).read_bytes().replace(b'\r\n', b'\n').strip(b'\n')
+    width = body.index(b'\n') if b'\n' in body else len(body)
+    height = body.count(b'\n') + 1
+    return Layout.from_cells(_parse_cells(body, width, height, _NATIVE_TABLE, path))
+
+
+def save_layout(layout: Layout, path: str | Path) -> None:
+    """Write a layout in the native format."""
+    chars = np.zeros(256, dtype=np.uint8)
+    for value, char in NATIVE_CHARS.items():
+        chars[value] = ord(char)
+    rows = chars[layout.cells.astype(np.uint8)]
+    Path(path).write_bytes(b'\n'.join(row.tobytes() for row in rows) + b'\n')
+
+
+def load_layout_file(path: str | Path) -> Layout:
+    """Load a .map (MovingAI) or any other file (native format) by extension."""
+    if Path(path).suffix == '.map':
+        return load_movingai_map(path)
+    return load_layout(path)
@@ -12,7 +12,7 @@ def next_random(layout: Layout) -> Task:
 
     # Pick random delivery location from output cells
     delivery_idx = random.randint(0, len(layout.output_cells) - 1)
-    while delivery_idx == pickup_idx:
+    while delivery_idx == pickup_idx and len(layout.output_cells) > 1:
         delivery_idx = random.randint(0, len(layout.output_cells) - 1)
     delivery_x, delivery_y = layout.output_cells[delivery_idx]
 
@@ -0,0 +1,118 @@
+import csv
+from typing import Iterator
+
+import numpy as np
+
+from models.layout import Layout
+from models.task import Task
+
+
+def zipf_weights(num_skus: int, exponent: float = 1.0, seed: int = 0) -> np.ndarray:
+    """Zipf order probabilities, one SKU per storage cell.
+
+    The SKU of rank r is ordered with probability proportional to 1 / r^exponent.
+    Ranks are assigned to storage cells in random order, so popular SKUs are
+    scattered over the warehouse.
+
+    Args:
+        num_skus: Number of SKUs (usually len(layout.storage_cells)).
+        exponent: Zipf exponent, 0 gives uniform weights.
+        seed: Seed for the rank assignment.
+
+    Returns:
+        Probabilities summing to 1, indexed like layout.storage_cells.
+    """
+    weights = 1.0 / np.arange(1, num_skus + 1, dtype=float) ** exponent
+    np.random.default_rng(seed).shuffle(weights)
+    return weights / weights.sum()
+
+
+def order_history_weights(layout: Layout, path: str) -> np.ndarray:
+    """Order probabilities of storage cells from an order history CSV file.
+
+    Each row is "x,y" (one order picked at storage cell (x, y)) or "x,y,count".
+    Storage cells never ordered get probability 0.
+
+    Returns:
+        Probabilities summing to 1, indexed like layout.storage_cells.
+    """
+    index = {cell: i for i, cell in enumerate(layout.storage_cells)}
+    counts = np.zeros(len(index), dtype=float)
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            if not row or row[0].strip().startswith('#'):
+                continue
+            cell = (int(row[0]), int(row[1]))
+            if cell not in index:
+                raise ValueError(f"Order history cell {cell} is not a storage cell")
+            counts[index[cell]] += float(row[2]) if len(row) > 2 else 1.0
+    if counts.sum() == 0:
+        raise ValueError(f"Order history {path} contains no orders")
+    return counts / counts.sum()
+
+
+def poisson_arrivals(rate: float, seed: int = 0, block: int = 4096) -> Iterator[int]:
+    """Arrival timesteps of a Poisson process with `rate` tasks per timestep."""
+    rng = np.random.default_rng(seed)
+    t = 0.0
+    while True:
+        times = t + np.cumsum(rng.exponential(1.0 / rate, block))
+        t = times[-1]
+        yield from times.astype(np.int64).tolist()
+
+
+def batch_arrivals(batch_size: int, interval: int, seed: int | None = None) -> Iterator[int]:
+    """Arrival timesteps of batches released every `interval` timesteps.
+
+    With a seed the batch sizes are Poisson distributed with mean batch_size,
+    otherwise every batch has exactly batch_size tasks.
+    """
+    rng = np.random.default_rng(seed) if seed is not None else None
+    t = 0
+    while True:
+        size = batch_size if rng is None else int(rng.poisson(batch_size))
+        for _ in range(size):
+            yield t
+        t += interval
+
+
+def stream_tasks(layout: Layout, arrivals: Iterator[int], pickup_weights: np.ndarray | None = None,
+                 max_tasks: int | None = None, seed: int = 0,
+                 block: int = 4096) -> Iterator[tuple[int, Task]]:
+    """Lazily generate MAPD tasks with their arrival timesteps.
+
+    Pickups are drawn from storage cells by SKU popularity, deliveries
+    uniformly from output cells. Cells are sampled in blocks, tasks are
+    created one at a time as the stream is consumed.
+
+    Args:
+        layout: Layout with storage and output cells.
+        arrivals: Nondecreasing arrival timesteps (e.g. poisson_arrivals).
+        pickup_weights: Probabilities indexed like layout.storage_cells, uniform if None.
+        max_tasks: Stop after this many tasks, endless if None.
+        seed: Seed for pickup and delivery sampling.
+        block: Number of cells sampled at once.
+
+    Yields:
+        (arrival timestep, task) pairs, tasks with status not revealed.
+    """
+    storage = layout.storage_xy
+    output = layout.output_xy
+    if len(storage) == 0 or len(output) == 0:
+        raise ValueError("Layout needs storage and output cells to generate tasks")
+    if pickup_weights is not None and len(pickup_weights) != len(storage):
+        raise ValueError("pickup_weights must have one entry per storage cell")
+
+    rng = np.random.default_rng(seed)
+    emitted = 0
+    while max_tasks is None or emitted < max_tasks:
+        n = block if max_tasks is None else min(block, max_tasks - emitted)
+        pickups = storage[rng.choice(len(storage), size=n, p=pickup_weights)].tolist()
+        deliveries = output[rng.integers(len(output), size=n)].tolist()
+        for (x, y), (delivery_x, delivery_y) in zip(pickups, deliveries):
+            t = next(arrivals, None)
+            if t is None:
+                return
+            yield t, Task(x=x, y=y, delivery_x=delivery_x, delivery_y=delivery_y,
+                          status=Task.STATUS_NOTREVEALED)
+        emitted += n
@@ -0,0 +1,174 @@
+import argparse
+import time
+
+from models.dist_table import build_dist_tables
+from models.dist_table_cache import DistTableCache
+from models.dist_table_store import DistTableStore
+from models.trajectory import TrajectoryRecorder
+from simulations.checkpoint import load_checkpoint, save_checkpoint
+from simulations.guidance import TrafficGuidance
+from simulations.planner import LaCAMPlanner
+from simulations.step_metrics import CProfileHook, StepMetrics
+from runners.headless import (LAYOUT_GENERATORS, build_simulation, build_stream_simulation, layout_name,
+                              run_batched, run_headless)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run PIBT MAPD simulation without GUI.")
+    parser.add_argument('--layout', type=layout_name, default='storage_walls',
+                        help=f"One of {', '.join(sorted(LAYOUT_GENERATORS))} or a .map/.layout file")
+    parser.add_argument('--width', type=int, default=30)
+    parser.add_argument('--height', type=int, default=30)
+    parser.add_argument('--agents', type=int, default=200)
+    parser.add_argument('--tasks', type=int, default=5_000)
+    parser.add_argument('--reveal-interval', type=int, default=1)
+    parser.add_argument('--arrival-rate', type=float, metavar='RATE',
+                        help="Stream tasks with Poisson arrivals of RATE tasks per step instead of --tasks")
+    parser.add_argument('--batch-interval', type=int, metavar='N',
+                        help="With --arrival-rate, release tasks in batches every N steps")
+    parser.add_argument('--zipf', type=float, default=0.0, metavar='S',
+                        help="With --arrival-rate, Zipf exponent of SKU popularity")
+    parser.add_argument('--steps', type=int, default=1_000, help="Maximum number of timesteps")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--batch', type=int, metavar='B',
+                        help="Run seeds seed..seed+B-1 in lockstep with the batched engine and exit")
+    parser.add_argument('--eager-dist-tables', action='store_true',
+                        help="Compute whole distance fields with vectorized BFS")
+    parser.add_argument('--precompute-dist-tables', action='store_true',
+                        help="Build tables for all storage and output cells before running")
+    parser.add_argument('--assign-top-k', type=int, metavar='K',
+                        help="Evaluate at most K exact distances per free agent during assignment")
+    parser.add_argument('--cached-move-order', action='store_true',
+                        help="Cache PIBT candidate orderings per goal (different RNG stream)")
+    parser.add_argument('--landmarks', type=int, metavar='K',
+                        help="Estimate assignment distances from K landmark fields instead of a table per "
+                             "pickup (combine with --dist-table-budget to bound memory)")
+    parser.add_argument('--lacam-budget', type=float, metavar='MS',
+                        help="Plan each step with a LaCAM-style configuration search limited to MS "
+                             "milliseconds, falling back to PIBT")
+    parser.add_argument('--lacam-window', type=int, default=5, metavar='N',
+                        help="With --lacam-budget, search for progress N steps ahead")
+    parser.add_argument('--guidance', action='store_true',
+                        help="Order PIBT candidates by congestion-weighted distances learned from traffic")
+    parser.add_argument('--guidance-interval', type=int, default=20, metavar='N',
+                        help="With --guidance, rebuild the weighted fields every N steps")
+    parser.add_argument('--guidance-weight', type=float, default=2.0, metavar='W',
+                        help="With --guidance, extra cost per unit of recent occupancy and waiting")
+    parser.add_argument('--record', metavar='DIR',
+                        help="Record positions and task events to DIR (view with replay.py)")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help="Write per-step phase timings and counters to FILE as JSON lines")
+    parser.add_argument('--profile-phase', action='append', choices=['assignment', 'planning', 'acting'],
+                        help="Profile a step phase with cProfile (repeatable)")
+    parser.add_argument('--load-checkpoint', metavar='FILE',
+                        help="Continue from a checkpoint (scenario arguments must match, streams are replayed)")
+    parser.add_argument('--save-checkpoint', metavar='FILE', help="Save a checkpoint after the run")
+    storage = parser.add_mutually_exclusive_group()
+    storage.add_argument('--dist-cache', metavar='DIR',
+                         help="Use a persistent memory-mapped distance table cache in DIR")
+    storage.add_argument('--dist-table-budget', type=float, metavar='MB',
+                         help="Bound distance table memory, evicting least recently used goals")
+    args = parser.parse_args()
+    if args.precompute_dist_tables and args.dist_table_budget is not None:
+        parser.error("--precompute-dist-tables cannot be combined with --dist-table-budget")
+
+    if args.batch:
+        results = run_batched(args.layout, args.width, args.height, args.agents, args.tasks,
+                              args.reveal_interval, list(range(args.seed, args.seed + args.batch)), args.steps)
+        elapsed = results[0].elapsed
+        print(f"Instances: {len(results)}")
+        print(f"Steps: {results[0].steps}")
+        print(f"Elapsed: {elapsed:.3f}s")
+        print(f"Aggregate steps/sec: {sum(r.steps for r in results) / elapsed:.1f}")
+        print(f"Throughput: mean={sum(r.throughput for r in results) / len(results):.4f} tasks/step "
+              f"min={min(r.throughput for r in results):.4f} max={max(r.throughput for r in results):.4f}")
+        return
+
+    metrics_file = open(args.metrics, 'w') if args.metrics else None
+    hook = CProfileHook(set(args.profile_phase)) if args.profile_phase else None
+    metrics = StepMetrics(metrics_file, hook) if metrics_file or hook else None
+    sim_kwargs = dict(
+        eager_dist_tables=args.eager_dist_tables,
+        assign_top_k=args.assign_top_k,
+        cached_move_order=args.cached_move_order,
+        landmarks=args.landmarks,
+        lacam_budget=args.lacam_budget / 1000 if args.lacam_budget is not None else None,
+        lacam_window=args.lacam_window,
+        metrics=metrics,
+    )
+    if args.arrival_rate is not None:
+        simulation = build_stream_simulation(
+            layout_name=args.layout,
+            width=args.width,
+            height=args.height,
+            num_agents=args.agents,
+            arrival_rate=args.arrival_rate,
+            batch_interval=args.batch_interval,
+            zipf_exponent=args.zipf,
+            seed=args.seed,
+            **sim_kwargs
+        )
+    else:
+        simulation = build_simulation(
+            layout_name=args.layout,
+            width=args.width,
+            height=args.height,
+            num_agents=args.agents,
+            num_tasks=args.tasks,
+            reveal_interval=args.reveal_interval,
+            seed=args.seed,
+            **sim_kwargs
+        )
+    if args.load_checkpoint:
+        stream = simulation.stream if args.arrival_rate is not None else None
+        simulation.close()
+        simulation = load_checkpoint(args.load_checkpoint, stream=stream, **sim_kwargs)
+    if args.dist_cache:
+        simulation.dist_tables = DistTableCache(simulation.grid, args.dist_cache)
+    if args.dist_table_budget is not None:
+        simulation.dist_tables = DistTableStore(int(args.dist_table_budget * 1024 * 1024))
+    if args.guidance:
+        simulation.guidance = TrafficGuidance(simulation.grid, args.guidance_interval, args.guidance_weight,
+                                              static_goals=simulation.layout.output_cells)
+    if args.precompute_dist_tables:
+        start = time.perf_counter()
+        layout = simulation.layout
+        if isinstance(simulation.dist_tables, DistTableCache):
+            simulation.dist_tables.precompute(layout.storage_cells + layout.output_cells)
+        else:
+            simulation.dist_tables.update(build_dist_tables(layout))
+        print(f"Precomputed distance tables in {time.perf_counter() - start:.3f}s")
+
+    recorder = TrajectoryRecorder(simulation, args.record) if args.record else None
+    result = run_headless(simulation, args.steps, recorder)
+    simulation.close()
+    if recorder is not None:
+        recorder.close()
+        print(f"Recorded {recorder.steps} configurations to {args.record}")
+
+    print(f"Steps: {result.steps}")
+    print(f"Elapsed: {result.elapsed:.3f}s")
+    print(f"Steps/sec: {result.steps_per_sec:.1f}")
+    print(f"Tasks completed: {result.tasks_completed}/{result.tasks_total}")
+    print(f"Throughput: {result.throughput:.4f} tasks/step")
+    if isinstance(simulation.planner, LaCAMPlanner):
+        print(f"Planner: {simulation.planner.searches} searched steps, {simulation.planner.fallbacks} PIBT fallbacks")
+    if isinstance(simulation.dist_tables, DistTableStore):
+        print(f"Distance tables: {simulation.dist_tables.stats()}")
+    if args.save_checkpoint:
+        save_checkpoint(simulation, args.save_checkpoint, dist_tables=True)
+        print(f"Saved checkpoint to {args.save_checkpoint}")
+    if metrics is not None:
+        summary = metrics.summary()
+        for name, stats in summary['phases'].items():
+            print(f"Phase {name}: " + " ".join(f"{k}={v * 1000:.3f}ms" for k, v in stats.items()))
+        for name, stats in summary['counters'].items():
+            print(f"Counter {name}: total={stats['total']} max={stats['max']}")
+    if metrics_file is not None:
+        metrics_file.close()
+    if hook is not None:
+        hook.stats().print_stats(20)
+
+
+if __name__ == "__main__":
+    main()
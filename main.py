@@ -1,5 +1,5 @@
-from demos.pibt_mapd_demo import pibt_mapd_demo
+from demos.pibt_mapd_demo import main
 
 
 if __name__ == "__main__":
-    pibt_mapd_demo()
+    main()
@@ -0,0 +1,119 @@
+import numpy as np
+
+from models.agent import Agent
+from models.task import Task
+
+
+class AgentState:
+    """Struct-of-arrays agent state.
+
+    Positions, goals and priorities are NumPy arrays indexed by agent id, so
+    the simulation can order and move all agents with vectorized operations.
+    Task references stay Python lists; has_task mirrors task for vectorized
+    priority computation.
+    """
+
+    def __init__(self, agents: list[Agent]):
+        assert all(agent.id == i for i, agent in enumerate(agents)), "Agent ids must equal list indices"
+        self.x = np.array([a.x for a in agents], dtype=np.int64)
+        self.y = np.array([a.y for a in agents], dtype=np.int64)
+        self.goal_x = np.array([a.goal_x for a in agents], dtype=np.int64)
+        self.goal_y = np.array([a.goal_y for a in agents], dtype=np.int64)
+        self.elapsed = np.array([a.elapsed for a in agents], dtype=np.int64)
+        self.tie_breaker = np.array([a.tie_breaker for a in agents], dtype=np.float64)
+        self.has_task = np.array([a.task is not None for a in agents], dtype=bool)
+        self.task: list[Task | None] = [a.task for a in agents]
+        self.target_task: list[Task | None] = [a.target_task for a in agents]
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def set_task(self, i: int, task: Task | None) -> None:
+        self.task[i] = task
+        self.has_task[i] = task is not None
+
+    def priority_order(self) -> np.ndarray:
+        """Agent ids sorted by PIBT priority.
+
+        Agents with a task come first, then longer elapsed time, then higher
+        tie breaker.
+        """
+        return np.lexsort((-self.tie_breaker, -self.elapsed, ~self.has_task))
+
+    def views(self) -> list['AgentView']:
+        return [AgentView(self, i) for i in range(len(self))]
+
+
+class AgentView:
+    """Agent-like view of one row of an AgentState (used by the GUI and callers
+    that expect Agent attributes)."""
+
+    __slots__ = ('_state', 'id')
+
+    def __init__(self, state: AgentState, i: int):
+        self._state = state
+        self.id = i
+
+    @property
+    def x(self) -> int:
+        return int(self._state.x[self.id])
+
+    @x.setter
+    def x(self, value: int) -> None:
+        self._state.x[self.id] = value
+
+    @property
+    def y(self) -> int:
+        return int(self._state.y[self.id])
+
+    @y.setter
+    def y(self, value: int) -> None:
+        self._state.y[self.id] = value
+
+    @property
+    def goal_x(self) -> int:
+        return int(self._state.goal_x[self.id])
+
+    @goal_x.setter
+    def goal_x(self, value: int) -> None:
+        self._state.goal_x[self.id] = value
+
+    @property
+    def goal_y(self) -> int:
+        return int(self._state.goal_y[self.id])
+
+    @goal_y.setter
+    def goal_y(self, value: int) -> None:
+        self._state.goal_y[self.id] = value
+
+    @property
+    def elapsed(self) -> int:
+        return int(self._state.elapsed[self.id])
+
+    @elapsed.setter
+    def elapsed(self, value: int) -> None:
+        self._state.elapsed[self.id] = value
+
+    @property
+    def tie_breaker(self) -> float:
+        return float(self._state.tie_breaker[self.id])
+
+    @tie_breaker.setter
+    def tie_breaker(self, value: float) -> None:
+        self._state.tie_breaker[self.id] = value
+
+    @property
+    def task(self) -> Task | None:
+        return self._state.task[self.id]
+
+    @task.setter
+    def task(self, value: Task | None) -> None:
+        self._state.set_task(self.id, value)
+
+    @property
+    def target_task(self) -> Task | None:
+        return self._state.target_task[self.id]
+
+    @target_task.setter
+    def target_task(self, value: Task | None) -> None:
+        self._state.target_task[self.id] = value
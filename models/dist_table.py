@@ -1,10 +1,12 @@
+import heapq
 from collections import deque
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, InitVar
+from typing import ClassVar, Iterable, Iterator, Protocol
 
 import numpy as np
 
 from models.coord import Coord
-from models.layout import Grid
+from models.layout import Grid, Layout
 
 
 def get_neighbors(grid: Grid, coord: Coord) -> list[Coord]:
@@ -48,24 +50,176 @@ def is_valid_coord(grid: Grid, coord: Coord) -> bool:
     return True
 
 
+def dist_dtype(grid_size: int) -> np.dtype:
+    """Smallest unsigned dtype able to hold every distance on a grid.
+
+    Distances never exceed grid_size, which is also the unreachable marker.
+
+    Args:
+        grid_size: Number of cells of the grid.
+
+    Returns:
+        np.uint16 or np.uint32 dtype.
+    """
+    if grid_size <= np.iinfo(np.uint16).max:
+        return np.dtype(np.uint16)
+    return np.dtype(np.uint32)
+
+
+def iter_dist_fields(grid: Grid, goals: list[Coord], dtype=None,
+                     chunk_cells: int = 1 << 24) -> Iterator[tuple[int, np.ndarray]]:
+    """Compute complete BFS distance fields chunk by chunk.
+
+    The grid is padded with an obstacle border and flattened, so a whole BFS
+    frontier expands with four index shifts (-1, +1, -width, +width) and one
+    mask lookup instead of a Python-level loop over cells. Goals of a chunk
+    are processed side by side in one flat array; the obstacle border keeps
+    the shifted indices of one goal from leaking into another. Only one chunk
+    is held in memory at a time.
+
+    Args:
+        grid: 2D boolean array representing the map.
+        goals: Goal positions (x, y).
+        dtype: Dtype of the yielded arrays. Defaults to dist_dtype(grid.size).
+        chunk_cells: Upper bound on padded cells processed in one chunk.
+
+    Yields:
+        Tuples (start, fields) where fields has shape (n, height, width) and
+        fields[k, y, x] is the distance from (x, y) to goals[start + k], or
+        grid.size if unreachable.
+    """
+    if dtype is None:
+        dtype = dist_dtype(grid.size)
+    height, width = grid.shape
+    padded_width = width + 2
+    padded = np.zeros((height + 2, padded_width), dtype=bool)
+    padded[1:-1, 1:-1] = grid
+    padded = padded.ravel()
+    block = padded.size
+    shifts = np.array([-1, 1, -padded_width, padded_width])
+
+    per_chunk = max(1, chunk_cells // block)
+
+    for start in range(0, len(goals), per_chunk):
+        chunk = goals[start:start + per_chunk]
+        unvisited = np.tile(padded, len(chunk))
+        dist = np.full(unvisited.size, grid.size, dtype=np.int64)
+        last_seen = np.empty(unvisited.size, dtype=np.int64)
+
+        frontier = np.array(
+            [k * block + (gy + 1) * padded_width + gx + 1 for k, (gx, gy) in enumerate(chunk)],
+            dtype=np.int64,
+        )
+        dist[frontier] = 0
+        unvisited[frontier] = False
+
+        d = 0
+        while frontier.size > 0:
+            d += 1
+            candidates = (frontier[:, None] + shifts).ravel()
+            candidates = candidates[unvisited[candidates]]
+            # Drop duplicates: keep only the last occurrence of each cell
+            order = np.arange(candidates.size)
+            last_seen[candidates] = order
+            candidates = candidates[last_seen[candidates] == order]
+
+            unvisited[candidates] = False
+            dist[candidates] = d
+            frontier = candidates
+
+        dist = dist.reshape(len(chunk), height + 2, padded_width)
+        yield start, dist[:, 1:-1, 1:-1].astype(dtype)
+
+
+def compute_dist_fields(grid: Grid, goals: list[Coord], dtype=None, chunk_cells: int = 1 << 24) -> np.ndarray:
+    """Compute complete BFS distance fields for several goals at once.
+
+    See iter_dist_fields for the algorithm.
+
+    Args:
+        grid: 2D boolean array representing the map.
+        goals: Goal positions (x, y).
+        dtype: Dtype of the returned array. Defaults to dist_dtype(grid.size).
+        chunk_cells: Upper bound on padded cells processed in one chunk.
+
+    Returns:
+        Array of shape (len(goals), height, width) where [k, y, x] is the
+        distance from (x, y) to goals[k], or grid.size if unreachable.
+    """
+    if dtype is None:
+        dtype = dist_dtype(grid.size)
+    fields = np.empty((len(goals), *grid.shape), dtype=dtype)
+    for start, chunk in iter_dist_fields(grid, goals, dtype, chunk_cells):
+        fields[start:start + len(chunk)] = chunk
+    return fields
+
+
+def compute_dist_field(grid: Grid, goal: Coord, dtype=None) -> np.ndarray:
+    """Compute the complete BFS distance field for a single goal.
+
+    Args:
+        grid: 2D boolean array representing the map.
+        goal: Goal position (x, y).
+        dtype: Dtype of the returned array. Defaults to dist_dtype(grid.size).
+
+    Returns:
+        Array of shape grid.shape with distances to goal (grid.size if unreachable).
+    """
+    return compute_dist_fields(grid, [goal], dtype=dtype)[0]
+
+
 @dataclass
 class DistTable:
     """Distance table for computing shortest path distances using BFS.
 
     Uses lazy BFS evaluation - distances are computed on demand and cached.
+    With eager=True the whole distance field is computed up front with
+    compute_dist_field, and a precomputed field can be passed as table.
+    Distances are stored in the smallest dtype that fits (see dist_dtype).
     Coordinates are in (x, y) format.
+
+    expansions_total counts cells expanded by BFS across all tables (cells
+    reached, for eager tables), for instrumentation.
     """
+    expansions_total: ClassVar[int] = 0
+
     grid: Grid
     goal: Coord  # (x, y)
+    eager: bool = False
+    table: InitVar[np.ndarray | None] = None  # precomputed complete distance field
+    queue: InitVar[list[Coord] | None] = None  # BFS frontier if table is only partially computed
     _queue: deque[Coord] = field(init=False)
     _table: np.ndarray = field(init=False)
 
-    def __post_init__(self) -> None:
+    def __post_init__(self, table: np.ndarray | None, queue: list[Coord] | None) -> None:
         """Initialize distance table with goal position."""
-        self._queue = deque([self.goal])
-        self._table = np.full(self.grid.shape, self.grid.size, dtype=int)
-        gx, gy = self.goal
-        self._table[gy, gx] = 0
+        if table is not None:
+            self._queue = deque(queue or ())
+            self._table = table
+        elif self.eager:
+            self._queue = deque()
+            self._table = compute_dist_field(self.grid, self.goal)
+            DistTable.expansions_total += int(np.count_nonzero(self._table < self.grid.size))
+        else:
+            self._queue = deque([self.goal])
+            self._table = np.full(self.grid.shape, self.grid.size, dtype=dist_dtype(self.grid.size))
+            gx, gy = self.goal
+            self._table[gy, gx] = 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every reachable distance is already known."""
+        return len(self._queue) == 0
+
+    @property
+    def frontier(self) -> list[Coord]:
+        """Cells queued for expansion by the lazy BFS (empty when complete)."""
+        return list(self._queue)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the distance array."""
+        return self._table.nbytes
 
     def get(self, target: Coord) -> int:
         """Get shortest path distance from target to goal.
@@ -85,14 +239,139 @@ class DistTable:
             return int(self._table[ty, tx])
 
         # BFS with lazy evaluation
+        expanded = 0
         while len(self._queue) > 0:
             ux, uy = self._queue.popleft()
+            expanded += 1
             d = int(self._table[uy, ux])
             for vx, vy in get_neighbors(self.grid, (ux, uy)):
                 if d + 1 < self._table[vy, vx]:
                     self._table[vy, vx] = d + 1
                     self._queue.append((vx, vy))
             if (ux, uy) == target:
+                DistTable.expansions_total += expanded
                 return d
 
+        DistTable.expansions_total += expanded
         return self.grid.size
+
+    def _neighbors4(self, coord: Coord) -> list[Coord]:
+        """In-bounds 4-neighbors regardless of traversability."""
+        x, y = coord
+        height, width = self.grid.shape
+        return [(nx, ny) for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1))
+                if 0 <= nx < width and 0 <= ny < height]
+
+    def reset(self) -> None:
+        """Forget all distances and restart the lazy BFS from the goal."""
+        self._queue = deque([self.goal])
+        self._table = np.full(self.grid.shape, self.grid.size, dtype=self._table.dtype)
+        gx, gy = self.goal
+        self._table[gy, gx] = 0
+
+    def repair(self, changed: list[Coord]) -> None:
+        """Update distances after cells of the grid were closed or opened.
+
+        The grid is shared with the layout and already holds the change. A
+        complete table is repaired incrementally: cells that lose every
+        neighbor one step closer to the goal are invalidated in order of
+        increasing distance, then invalidated and opened cells are settled
+        again with a Dijkstra pass seeded from their valid neighbors, so the
+        work is proportional to the cells whose distance changes. A partially
+        computed lazy table is reset if the change touches its explored
+        region and left alone otherwise. Read-only tables (shared memory,
+        memory-mapped cache) are copied before the first write.
+
+        Args:
+            changed: Cells (x, y) whose traversability changed.
+        """
+        grid = self.grid
+        unreachable = grid.size
+        table = self._table
+
+        if not self.complete:
+            touched = any(table[y, x] < unreachable
+                          for cell in changed for x, y in [cell, *self._neighbors4(cell)])
+            if touched:
+                self.reset()
+            return
+
+        if not table.flags.writeable:
+            table = self._table = table.copy()
+
+        # Invalidate cells whose shortest paths went through closed cells
+        heap: list[tuple[int, Coord]] = []
+        for x, y in changed:
+            if not grid[y, x] and (x, y) != self.goal and table[y, x] < unreachable:
+                heap.append((int(table[y, x]), (x, y)))
+        heapq.heapify(heap)
+        invalid: list[Coord] = []
+        expanded = 0
+        while heap:
+            d, (ux, uy) = heapq.heappop(heap)
+            if table[uy, ux] != d:
+                continue
+            expanded += 1
+            neighbors = self._neighbors4((ux, uy))
+            if grid[uy, ux] and any(table[vy, vx] == d - 1 for vx, vy in neighbors):
+                continue  # Still supported by a neighbor closer to the goal
+            table[uy, ux] = unreachable
+            invalid.append((ux, uy))
+            for vx, vy in neighbors:
+                if table[vy, vx] == d + 1:
+                    heapq.heappush(heap, (d + 1, (vx, vy)))
+
+        # Settle invalidated and opened cells from their neighbors with valid distances
+        for ux, uy in invalid + [(x, y) for x, y in changed if grid[y, x]]:
+            if not grid[uy, ux] or (ux, uy) == self.goal:
+                continue
+            d = min((int(table[vy, vx]) for vx, vy in self._neighbors4((ux, uy))), default=unreachable) + 1
+            if d < table[uy, ux]:
+                table[uy, ux] = d
+                heap.append((d, (ux, uy)))
+        heapq.heapify(heap)
+        while heap:
+            d, (ux, uy) = heapq.heappop(heap)
+            if table[uy, ux] != d:
+                continue
+            expanded += 1
+            for vx, vy in get_neighbors(grid, (ux, uy)):
+                if d + 1 < table[vy, vx]:
+                    table[vy, vx] = d + 1
+                    heapq.heappush(heap, (d + 1, (vx, vy)))
+
+        DistTable.expansions_total += expanded
+
+
+class DistTableMap(Protocol):
+    """Storage of distance tables keyed by goal.
+
+    Implemented by a plain dict, DistTableCache and DistTableStore. get may
+    return None for a missing goal, in which case the caller builds the table
+    and stores it with __setitem__. After a layout change the simulation calls
+    repair(changed) if the storage defines it, and DistTable.repair on every
+    table in values() otherwise. Checkpoints save the tables in values() too.
+    """
+
+    def get(self, goal: Coord, default: DistTable | None = None) -> DistTable | None: ...
+
+    def __setitem__(self, goal: Coord, table: DistTable) -> None: ...
+
+    def values(self) -> Iterable[DistTable]: ...
+
+
+def build_dist_tables(layout: Layout, goals: list[Coord] | None = None) -> dict[Coord, DistTable]:
+    """Build complete distance tables for many goals in one vectorized pass.
+
+    Args:
+        layout: Layout to compute distances on.
+        goals: Goal positions. Defaults to all storage and output cells.
+
+    Returns:
+        Dictionary mapping each goal to its complete DistTable.
+    """
+    if goals is None:
+        goals = list(dict.fromkeys(layout.storage_cells + layout.output_cells))
+    grid = layout.grid
+    fields = compute_dist_fields(grid, goals)
+    return {goal: DistTable(grid, goal, table=fields[k]) for k, goal in enumerate(goals)}
@@ -0,0 +1,110 @@
+import hashlib
+import os
+
+import numpy as np
+
+from models.coord import Coord
+from models.layout import Grid
+from models.dist_table import DistTable, iter_dist_fields
+
+
+def layout_hash(grid: Grid) -> str:
+    """Content hash of a traversability grid.
+
+    Args:
+        grid: 2D boolean array representing the map.
+
+    Returns:
+        Hex digest identifying the grid shape and contents.
+    """
+    digest = hashlib.sha1()
+    digest.update(np.asarray(grid.shape, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(grid, dtype=bool).tobytes())
+    return digest.hexdigest()
+
+
+class DistTableCache:
+    """Persistent on-disk cache of complete distance tables.
+
+    Distance fields are stored as one .npy file per goal in a directory named
+    by the layout hash, and loaded with mmap_mode='r' so that processes
+    working on the same layout share the page cache instead of each holding
+    its own copy. Missing fields are computed with the vectorized BFS and
+    written atomically, so concurrent processes may populate the same cache.
+
+    Can be passed as dist_tables to PIBTMAPDSimulation.
+    """
+
+    def __init__(self, grid: Grid, cache_dir: str = '.dist_cache'):
+        self.grid = grid
+        self.cache_dir = cache_dir
+        self.directory = os.path.join(cache_dir, layout_hash(grid))
+        os.makedirs(self.directory, exist_ok=True)
+        self._tables: dict[Coord, DistTable] = {}
+
+    def _path(self, goal: Coord) -> str:
+        gx, gy = goal
+        return os.path.join(self.directory, f"{gx}_{gy}.npy")
+
+    def _save(self, goal: Coord, field: np.ndarray) -> None:
+        """Write a distance field so that readers never see a partial file."""
+        path = self._path(goal)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, field)
+        os.replace(tmp_path, path)
+
+    def precompute(self, goals: list[Coord]) -> None:
+        """Compute and store fields for all goals not yet on disk.
+
+        Args:
+            goals: Goal positions (x, y).
+        """
+        missing = [goal for goal in dict.fromkeys(goals) if not os.path.exists(self._path(goal))]
+        if not missing:
+            return
+        # Fields are written chunk by chunk so only one chunk is ever held in memory
+        for start, fields in iter_dist_fields(self.grid, missing):
+            for k, field in enumerate(fields):
+                self._save(missing[start + k], field)
+
+    def get(self, goal: Coord, default: DistTable | None = None) -> DistTable:
+        """Get the distance table for a goal, computing and storing it if needed."""
+        table = self._tables.get(goal)
+        if table is None:
+            path = self._path(goal)
+            if not os.path.exists(path):
+                self.precompute([goal])
+            # Plain ndarray view of the mapping avoids np.memmap's per-index overhead
+            field = np.load(path, mmap_mode='r').view(np.ndarray)
+            table = DistTable(self.grid, goal, table=field)
+            self._tables[goal] = table
+        return table
+
+    def __getitem__(self, goal: Coord) -> DistTable:
+        return self.get(goal)
+
+    def repair(self, changed: list[Coord]) -> None:
+        """Repair loaded tables after a layout change and switch to the new layout's directory.
+
+        Repaired tables are private copies; fields of the new layout are
+        computed and stored on the next miss as usual.
+        """
+        for table in self._tables.values():
+            table.repair(changed)
+        self.directory = os.path.join(self.cache_dir, layout_hash(self.grid))
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __setitem__(self, goal: Coord, table: DistTable) -> None:
+        """Keep a table in memory for this process without writing it to disk."""
+        self._tables[goal] = table
+
+    def __contains__(self, goal: Coord) -> bool:
+        return goal in self._tables or os.path.exists(self._path(goal))
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def values(self):
+        """Tables loaded by this process."""
+        return self._tables.values()
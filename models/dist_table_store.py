@@ -0,0 +1,75 @@
+from collections import OrderedDict
+
+from models.coord import Coord
+from models.dist_table import DistTable
+
+
+class DistTableStore:
+    """Memory-bounded distance table store with LRU eviction.
+
+    Behaves like the plain dict used by PIBTMAPDSimulation.dist_tables, but
+    keeps the total size of stored distance arrays under max_bytes by evicting
+    the least recently used goals. Evicted tables are simply rebuilt on the
+    next miss.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._tables: OrderedDict[Coord, DistTable] = OrderedDict()
+
+    def get(self, goal: Coord, default: DistTable | None = None) -> DistTable | None:
+        """Get the table for a goal and mark it as most recently used."""
+        table = self._tables.get(goal)
+        if table is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._tables.move_to_end(goal)
+        return table
+
+    def __setitem__(self, goal: Coord, table: DistTable) -> None:
+        old = self._tables.pop(goal, None)
+        if old is not None:
+            self.nbytes -= old.nbytes
+        self._tables[goal] = table
+        self.nbytes += table.nbytes
+
+        # Evict least recently used tables, always keeping the newest one
+        while self.nbytes > self.max_bytes and len(self._tables) > 1:
+            _, evicted = self._tables.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+            self.evictions += 1
+
+    def __getitem__(self, goal: Coord) -> DistTable:
+        table = self.get(goal)
+        if table is None:
+            raise KeyError(goal)
+        return table
+
+    def __contains__(self, goal: Coord) -> bool:
+        return goal in self._tables
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def values(self):
+        return self._tables.values()
+
+    def update(self, tables: dict[Coord, DistTable]) -> None:
+        for goal, table in tables.items():
+            self[goal] = table
+
+    def stats(self) -> dict[str, int]:
+        """Get hit/miss/eviction counters and memory usage."""
+        return {
+            'tables': len(self._tables),
+            'bytes': self.nbytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
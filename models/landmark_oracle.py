@@ -0,0 +1,88 @@
+import random
+
+import numpy as np
+
+from models.coord import Coord
+from models.dist_table import compute_dist_field, dist_dtype
+from models.layout import Grid
+
+
+class LandmarkOracle:
+    """Lower bounds on path distances from a few landmark distance fields (ALT).
+
+    For landmarks L_k with exact distance fields d_k, the triangle inequality
+    gives |d_k(s) - d_k(g)| <= dist(s, g) for every k, and the Manhattan
+    distance is a lower bound on a 4-connected grid as well. estimate()
+    returns the largest of these bounds, using K * cells distances of memory
+    instead of one field per goal. Landmarks are placed by farthest-point
+    sampling, so unreached components get a landmark before covered ones get
+    a second.
+
+    estimate() is 0 only for start == goal, so callers can keep treating 0 as
+    "already there", and it is grid.size (the DistTable unreachable marker)
+    when a landmark sees start and goal in different components.
+
+    The fields are computed for the grid at construction. Opening cells can
+    make the bounds overestimate and closing cells can hide that a goal became
+    unreachable, so after a layout change the oracle must be rebuilt
+    (PIBTMAPDSimulation does so when the layout notifies it).
+    """
+
+    def __init__(self, grid: Grid, num_landmarks: int = 16, seed: int = 0):
+        self.grid = grid
+        self.num_landmarks = num_landmarks
+        self.seed = seed
+        self.width = grid.shape[1]
+        self.unreachable = grid.size
+        dtype = dist_dtype(grid.size)
+
+        ys, xs = np.nonzero(grid)
+        if xs.size == 0:
+            raise ValueError("Grid has no traversable cell")
+        traversable = ys * self.width + xs
+
+        # Start from the cell farthest from a random one, then add the cell farthest from all landmarks
+        rng = random.Random(seed)
+        k = rng.randrange(xs.size)
+        nearest = compute_dist_field(grid, (int(xs[k]), int(ys[k])), dtype).ravel()
+        self.landmarks: list[Coord] = []
+        fields = []
+        while len(self.landmarks) < num_landmarks:
+            cell = int(traversable[np.argmax(nearest[traversable])])
+            if fields and nearest[cell] == 0:
+                break  # Every traversable cell is a landmark already
+            landmark = (cell % self.width, cell // self.width)
+            field = compute_dist_field(grid, landmark, dtype).ravel()
+            self.landmarks.append(landmark)
+            fields.append(field)
+            nearest = field if len(fields) == 1 else np.minimum(nearest, field)
+
+        # Row per cell, so one estimate reads two contiguous rows
+        self.fields = np.ascontiguousarray(np.stack(fields, axis=1))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the landmark fields."""
+        return self.fields.nbytes
+
+    def estimate(self, start: Coord, goal: Coord) -> int:
+        """Lower bound on the path distance from start to goal.
+
+        Args:
+            start: Start position (x, y).
+            goal: Goal position (x, y).
+
+        Returns:
+            Distance bound, 0 only if start == goal, grid.size if unreachable.
+        """
+        if start == goal:
+            return 0
+        (sx, sy), (gx, gy) = start, goal
+        if not self.grid[sy, sx]:
+            return self.unreachable
+        a = self.fields[sy * self.width + sx]
+        b = self.fields[gy * self.width + gx]
+        if ((a == self.unreachable) != (b == self.unreachable)).any():
+            return self.unreachable
+        bound = int((np.maximum(a, b) - np.minimum(a, b)).max())
+        return max(bound, abs(sx - gx) + abs(sy - gy))
@@ -1,4 +1,5 @@
 from dataclasses import dataclass, field
+from typing import Callable
 
 import numpy as np
 
@@ -17,30 +18,83 @@ class Layout:
 
     width: int
     height: int
-    cells: list[list[int]] = field(init=False)
-    storage_cells: list[Coord] = field(init=False)
-    output_cells: list[Coord] = field(init=False)
+    cells: np.ndarray = field(init=False)  # cells[y, x] -> cell type (int8)
+    storage_xy: np.ndarray = field(init=False, repr=False)  # (n, 2) array of storage (x, y)
+    output_xy: np.ndarray = field(init=False, repr=False)  # (n, 2) array of output (x, y)
+    _storage_cells: list[Coord] | None = field(init=False, default=None, repr=False)
+    _output_cells: list[Coord] | None = field(init=False, default=None, repr=False)
     _grid_cache: Grid | None = field(init=False, default=None, repr=False)
+    _cell_ids: np.ndarray | None = field(init=False, default=None, repr=False, compare=False)  # flat ids, see fill
+    revision: int = field(init=False, default=0, repr=False)  # incremented on every cell change
+    # Called with the (x, y) cells whose traversability changed, see fill
+    listeners: list[Callable[[list[Coord]], None]] = field(init=False, default_factory=list, repr=False, compare=False)
 
     def __post_init__(self):
-        self.cells = [[Layout.CELL_EMPTY for _ in range(self.width)] for _ in range(self.height)]
-        self.storage_cells = []
-        self.output_cells = []
+        self.cells = np.full((self.height, self.width), Layout.CELL_EMPTY, dtype=np.int8)
+        self.storage_xy = np.empty((0, 2), dtype=np.int64)
+        self.output_xy = np.empty((0, 2), dtype=np.int64)
+        self._storage_cells = None
+        self._output_cells = None
         self._grid_cache = None
 
+    @classmethod
+    def from_cells(cls, cells: np.ndarray) -> 'Layout':
+        """Create a layout from a 2D array of cell types.
+
+        Storage and output cells are computed from the array.
+
+        Args:
+            cells: Array of shape (height, width) with Layout.CELL_* values.
+
+        Returns:
+            New layout owning a copy of the cells.
+        """
+        height, width = cells.shape
+        layout = cls(width, height)
+        layout.cells[:] = cells
+        layout.compute_storage_cells()
+        layout.compute_output_cells()
+        return layout
+
     @staticmethod
     def traversable_cells() -> set[int]:
         return {Layout.CELL_EMPTY, Layout.CELL_OUTPUT, Layout.CELL_STORAGE}
 
     def set_value(self, x: int, y: int, value: int):
-        self.cells[y][x] = value
-        self._grid_cache = None  # Invalidate cache
+        self.fill((y, x), value)
+
+    def fill(self, index, value: int):
+        """Set all cells selected by a boolean mask or NumPy index to value.
+
+        A built grid is updated in place rather than invalidated, so distance
+        tables holding it see the change. Listeners are called with the cells
+        whose traversability changed, if any.
+        """
+        self.cells[index] = value
+        self.revision += 1
+        if self._grid_cache is None:
+            return
+        traversable = np.isin(self.cells[index], list(Layout.traversable_cells()))
+        if not self.listeners:
+            self._grid_cache[index] = traversable
+            return
+
+        # Compare only the written region, so editing a few cells does not scan the grid
+        before = np.array(self._grid_cache[index])
+        self._grid_cache[index] = traversable
+        if self._cell_ids is None:
+            self._cell_ids = np.arange(self.width * self.height).reshape(self.height, self.width)
+        ids = np.unique(np.asarray(self._cell_ids[index])[np.asarray(before != traversable)])
+        if ids.size > 0:
+            changed = list(zip((ids % self.width).tolist(), (ids // self.width).tolist()))
+            for listener in self.listeners:
+                listener(changed)
 
     def get_value(self, x: int, y: int) -> int:
-        return self.cells[y][x]
+        return int(self.cells[y, x])
 
     def is_traversable(self, x: int, y: int) -> bool:
-        return 0 <= x < self.width and 0 <= y < self.height and self.cells[y][x] in Layout.traversable_cells()
+        return 0 <= x < self.width and 0 <= y < self.height and int(self.cells[y, x]) in Layout.traversable_cells()
 
     @property
     def grid(self) -> Grid:
@@ -50,25 +104,42 @@ class Layout:
             2D boolean array where grid[y, x] is True if traversable.
         """
         if self._grid_cache is None:
-            self._grid_cache = np.zeros((self.height, self.width), dtype=bool)
-            traversable = Layout.traversable_cells()
-            for y in range(self.height):
-                for x in range(self.width):
-                    self._grid_cache[y, x] = self.cells[y][x] in traversable
+            self._grid_cache = np.isin(self.cells, list(Layout.traversable_cells()))
         return self._grid_cache
 
+    @property
+    def storage_cells(self) -> list[Coord]:
+        """Storage cell coordinates (list built from storage_xy on first use)."""
+        if self._storage_cells is None:
+            self._storage_cells = list(zip(self.storage_xy[:, 0].tolist(), self.storage_xy[:, 1].tolist()))
+        return self._storage_cells
+
+    @storage_cells.setter
+    def storage_cells(self, cells: list[Coord]):
+        self._storage_cells = list(cells)
+        self.storage_xy = np.array(self._storage_cells, dtype=np.int64).reshape(-1, 2)
+
+    @property
+    def output_cells(self) -> list[Coord]:
+        """Output cell coordinates (list built from output_xy on first use)."""
+        if self._output_cells is None:
+            self._output_cells = list(zip(self.output_xy[:, 0].tolist(), self.output_xy[:, 1].tolist()))
+        return self._output_cells
+
+    @output_cells.setter
+    def output_cells(self, cells: list[Coord]):
+        self._output_cells = list(cells)
+        self.output_xy = np.array(self._output_cells, dtype=np.int64).reshape(-1, 2)
+
+    def _cells_of_type(self, value: int) -> np.ndarray:
+        """(n, 2) array of (x, y) of all cells of a type, in row-major order."""
+        ys, xs = np.nonzero(self.cells == value)
+        return np.stack([xs, ys], axis=1)
+
     def compute_storage_cells(self):
-        self.storage_cells = [
-            (x, y)
-            for y in range(self.height)
-            for x in range(self.width)
-            if self.get_value(x, y) == Layout.CELL_STORAGE
-        ]
+        self.storage_xy = self._cells_of_type(Layout.CELL_STORAGE)
+        self._storage_cells = None
 
     def compute_output_cells(self):
-        self.output_cells = [
-            (x, y)
-            for y in range(self.height)
-            for x in range(self.width)
-            if self.get_value(x, y) == Layout.CELL_OUTPUT
-        ]
+        self.output_xy = self._cells_of_type(Layout.CELL_OUTPUT)
+        self._output_cells = None
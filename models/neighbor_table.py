@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from models.coord import Coord
+from models.layout import Grid
+
+
+@dataclass
+class NeighborTable:
+    """4-connected adjacency of a grid in CSR form.
+
+    Cells are identified by flat ids y * width + x. The neighbors of cell c are
+    neighbors[offsets[c]:offsets[c + 1]], in the same order as get_neighbors
+    (left, right, up, down).
+    """
+    width: int
+    height: int
+    offsets: np.ndarray  # (width * height + 1,) int64
+    neighbors: np.ndarray  # flat cell ids, int64
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> 'NeighborTable':
+        """Build the adjacency of all cells towards traversable cells.
+
+        Args:
+            grid: 2D boolean array representing the map.
+
+        Returns:
+            Neighbor table of the grid.
+        """
+        height, width = grid.shape
+        ids = np.arange(height * width, dtype=np.int64).reshape(height, width)
+
+        candidates = np.full((height, width, 4), -1, dtype=np.int64)
+        candidates[:, 1:, 0] = np.where(grid[:, :-1], ids[:, :-1], -1)  # left
+        candidates[:, :-1, 1] = np.where(grid[:, 1:], ids[:, 1:], -1)  # right
+        candidates[1:, :, 2] = np.where(grid[:-1, :], ids[:-1, :], -1)  # up
+        candidates[:-1, :, 3] = np.where(grid[1:, :], ids[1:, :], -1)  # down
+        candidates = candidates.reshape(-1, 4)
+
+        valid = candidates >= 0
+        offsets = np.zeros(height * width + 1, dtype=np.int64)
+        np.cumsum(valid.sum(axis=1), out=offsets[1:])
+        return cls(width, height, offsets, candidates[valid])
+
+    def cell(self, coord: Coord) -> int:
+        x, y = coord
+        return y * self.width + x
+
+    def coord(self, cell: int) -> Coord:
+        return (cell % self.width, cell // self.width)
+
+    def get(self, cell: int) -> np.ndarray:
+        """Neighbor cell ids of a cell."""
+        return self.neighbors[self.offsets[cell]:self.offsets[cell + 1]]
+
+    def to_lists(self) -> list[list[int]]:
+        """Neighbor lists of all cells as Python ints, for per-cell loops."""
+        flat = self.neighbors.tolist()
+        bounds = self.offsets.tolist()
+        return [flat[bounds[c]:bounds[c + 1]] for c in range(self.width * self.height)]
+
+    def to_padded(self) -> np.ndarray:
+        """Neighbor ids of all cells as a (cells, 4) array padded with -1, for vectorized lookups."""
+        cells = self.width * self.height
+        counts = np.diff(self.offsets)
+        rows = np.repeat(np.arange(cells), counts)
+        padded = np.full((cells, 4), -1, dtype=np.int64)
+        padded[rows, np.arange(len(self.neighbors)) - self.offsets[rows]] = self.neighbors
+        return padded
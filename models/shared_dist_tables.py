@@ -0,0 +1,129 @@
+import sys
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from models.coord import Coord
+from models.layout import Grid
+from models.dist_table import DistTable, dist_dtype, iter_dist_fields
+
+
+@dataclass(frozen=True)
+class SharedDistTablesHandle:
+    """Picklable description of a shared memory block of distance fields."""
+    name: str
+    shape: tuple[int, int, int]  # (goals, height, width)
+    dtype: str
+    goals: tuple[Coord, ...]
+
+
+def _attach_untracked(name: str) -> SharedMemory:
+    """Attach to an existing block without registering it with the resource tracker.
+
+    Otherwise a worker's resource tracker would unlink the block, which is
+    owned by the parent process, when the worker exits.
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda *args, **kwargs: None
+    try:
+        return SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedDistTables:
+    """Distance fields of many goals in one multiprocessing shared memory block.
+
+    The parent process computes the fields once with create() and passes
+    handle to workers, which attach() read-only NumPy views. An attached
+    instance can be used directly as PIBTMAPDSimulation.dist_tables: goals in
+    the block are served from shared memory, other goals fall back to tables
+    built and kept locally by the worker.
+    """
+
+    def __init__(self, grid: Grid, shm: SharedMemory, handle: SharedDistTablesHandle, owner: bool):
+        self.grid = grid
+        self.handle = handle
+        self._shm = shm
+        self._owner = owner
+        self._fields = np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=shm.buf)
+        if not owner:
+            self._fields.flags.writeable = False
+        self._index = {goal: k for k, goal in enumerate(handle.goals)}
+        self._tables: dict[Coord, DistTable] = {}
+
+    @classmethod
+    def create(cls, grid: Grid, goals: list[Coord]) -> 'SharedDistTables':
+        """Allocate a shared block and compute the fields of all goals into it.
+
+        Args:
+            grid: 2D boolean array representing the map.
+            goals: Goal positions (x, y).
+
+        Returns:
+            Owning instance; call unlink() when workers are done.
+        """
+        goals = list(dict.fromkeys(goals))
+        dtype = dist_dtype(grid.size)
+        shape = (len(goals), *grid.shape)
+        shm = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+        handle = SharedDistTablesHandle(shm.name, shape, dtype.str, tuple(goals))
+        tables = cls(grid, shm, handle, owner=True)
+        for start, fields in iter_dist_fields(grid, goals, dtype):
+            tables._fields[start:start + len(fields)] = fields
+        return tables
+
+    @classmethod
+    def attach(cls, grid: Grid, handle: SharedDistTablesHandle) -> 'SharedDistTables':
+        """Attach read-only to a block created by another process."""
+        return cls(grid, _attach_untracked(handle.name), handle, owner=False)
+
+    def get(self, goal: Coord, default: DistTable | None = None) -> DistTable | None:
+        """Get the table for a goal, None if it is neither shared nor built locally."""
+        table = self._tables.get(goal)
+        if table is None:
+            k = self._index.get(goal)
+            if k is None:
+                return default
+            table = DistTable(self.grid, goal, table=self._fields[k])
+            self._tables[goal] = table
+        return table
+
+    def __setitem__(self, goal: Coord, table: DistTable) -> None:
+        """Keep a locally built table for a goal missing from the shared block."""
+        self._tables[goal] = table
+
+    def __contains__(self, goal: Coord) -> bool:
+        return goal in self._index or goal in self._tables
+
+    def __len__(self) -> int:
+        return len(self._tables)
+
+    def values(self):
+        return self._tables.values()
+
+    def repair(self, changed: list[Coord]) -> None:
+        """Repair tables in use after a layout change.
+
+        Repaired tables become private copies. The shared block describes the
+        old layout, so goals not loaded yet are built locally from now on.
+        """
+        for table in self._tables.values():
+            table.repair(changed)
+        self._index = {}
+
+    def close(self) -> None:
+        """Detach from the block. Tables obtained from it must not be used afterwards."""
+        self._tables.clear()
+        self._fields = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """Close and free the block (owner only)."""
+        assert self._owner, "Only the creating process may unlink shared distance tables"
+        self.close()
+        self._shm.unlink()
@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from models.task import Task
+from models.task_pool import TaskPool
 from models.agent import Agent
 from models.layout import Layout
 
@@ -9,6 +10,10 @@ class SimulationBase:
     layout: Layout
     agents: list[Agent]
     tasks: list[Task]
+    task_pool: TaskPool = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.task_pool = TaskPool(self.tasks)
 
     def step(self):
         """Perform a simulation step. To be implemented by subclasses."""
@@ -13,4 +13,5 @@ class Task:
     y: int  # pickup location y
     delivery_x: int | None = None  # delivery location x (optional for MAPF-only tasks)
     delivery_y: int | None = None  # delivery location y (optional for MAPF-only tasks)
-    status: str = field(default=STATUS_PENDING)
\ No newline at end of file
+    status: str = field(default=STATUS_PENDING)
+    id: int | None = field(default=None, compare=False)  # assigned by TaskPool when added
@@ -0,0 +1,183 @@
+from collections import deque
+from typing import Callable
+
+from models.task import Task
+
+
+class TaskPool:
+    """Tasks indexed by status.
+
+    Keeps per-status buckets and counters that are updated on status
+    transitions, so queries cost O(1) or O(bucket) instead of a scan over all
+    tasks. Pending tasks are further split into available ones and those
+    already targeted by an agent heading to pickup.
+
+    The given task list is shared, not copied, and add() appends to it.
+    With retain_completed=False added tasks are not appended to the list, so
+    the pool references only tasks that are not yet completed and memory stays
+    bounded by the tasks in flight (used for streamed tasks).
+    Task status must be changed through the pool (set_status, reveal_next),
+    otherwise the index goes out of sync.
+
+    Tasks without an id get a sequential one when added. Listeners are called
+    with (event, task, agent) on every lifecycle event: reveal (task became
+    pending), assign (targeted by an agent), pickup (delivering) and deliver
+    (completed). The agent is the index passed by the caller, if any.
+    """
+
+    EVENT_REVEAL = 'reveal'
+    EVENT_ASSIGN = 'assign'
+    EVENT_PICKUP = 'pickup'
+    EVENT_DELIVER = 'deliver'
+    STATUS_EVENTS = {
+        Task.STATUS_PENDING: EVENT_REVEAL,
+        Task.STATUS_DELIVERING: EVENT_PICKUP,
+        Task.STATUS_COMPLETED: EVENT_DELIVER,
+    }
+
+    STATUSES = (
+        Task.STATUS_NOTREVEALED,
+        Task.STATUS_PENDING,
+        Task.STATUS_ASSIGNED,
+        Task.STATUS_DELIVERING,
+        Task.STATUS_COMPLETED,
+    )
+
+    def __init__(self, tasks: list[Task] | None = None, retain_completed: bool = True):
+        self.tasks: list[Task] = tasks if tasks is not None else []
+        self.retain_completed = retain_completed
+        self._total = 0
+        self.listeners: list[Callable[[str, Task, int | None], None]] = []
+        self._counts: dict[str, int] = {status: 0 for status in TaskPool.STATUSES}
+        # Tasks are not hashable (dataclass eq), so buckets are keyed by id()
+        self._reveal_order: deque[Task] = deque()  # may hold stale entries, see reveal_next
+        self._not_revealed: dict[int, Task] = {}
+        self._available: dict[int, Task] = {}  # pending, not targeted
+        self._targeted: dict[int, Task] = {}  # pending, targeted by an agent
+        self._delivering: dict[int, Task] = {}
+
+        for task in self.tasks:
+            self._register(task)
+            self._insert(task)
+
+    def __len__(self) -> int:
+        """Number of tasks ever added, including completed ones not retained."""
+        return self._total
+
+    def add(self, task: Task) -> None:
+        """Add a task with its current status."""
+        if self.retain_completed:
+            self.tasks.append(task)
+        self._register(task)
+        self._insert(task)
+        self._notify(task.status, task, None)
+
+    def _register(self, task: Task) -> None:
+        if task.id is None:
+            task.id = self._total
+        self._total += 1
+
+    def _notify(self, status: str, task: Task, agent: int | None) -> None:
+        event = TaskPool.STATUS_EVENTS.get(status)
+        if event is not None:
+            for listener in self.listeners:
+                listener(event, task, agent)
+
+    def _insert(self, task: Task) -> None:
+        self._counts[task.status] += 1
+        if task.status == Task.STATUS_NOTREVEALED:
+            self._not_revealed[id(task)] = task
+            self._reveal_order.append(task)
+        elif task.status == Task.STATUS_PENDING:
+            self._available[id(task)] = task
+        elif task.status == Task.STATUS_DELIVERING:
+            self._delivering[id(task)] = task
+
+    def _remove(self, task: Task) -> None:
+        self._counts[task.status] -= 1
+        if task.status == Task.STATUS_NOTREVEALED:
+            # Left in _reveal_order, reveal_next skips it
+            del self._not_revealed[id(task)]
+        elif task.status == Task.STATUS_PENDING:
+            if self._available.pop(id(task), None) is None:
+                del self._targeted[id(task)]
+        elif task.status == Task.STATUS_DELIVERING:
+            del self._delivering[id(task)]
+
+    def set_status(self, task: Task, status: str, agent: int | None = None) -> None:
+        """Change task status and update the index.
+
+        Args:
+            task: Task in the pool.
+            status: New status.
+            agent: Index of the agent causing the change, reported to listeners.
+        """
+        if task.status == status:
+            return
+        self._remove(task)
+        task.status = status
+        self._insert(task)
+        if self.listeners:
+            self._notify(status, task, agent)
+
+    def reveal_next(self) -> Task | None:
+        """Reveal the next not revealed task.
+
+        Returns:
+            The revealed task, or None if every task is already revealed.
+        """
+        while self._reveal_order:
+            task = self._reveal_order.popleft()
+            if self._not_revealed.get(id(task)) is task:
+                self.set_status(task, Task.STATUS_PENDING)
+                return task
+        return None
+
+    def target(self, task: Task, agent: int | None = None) -> None:
+        """Mark a pending task as targeted by an agent."""
+        self._targeted[id(task)] = self._available.pop(id(task))
+        for listener in self.listeners:
+            listener(TaskPool.EVENT_ASSIGN, task, agent)
+
+    def available(self) -> list[Task]:
+        """Pending tasks not targeted by any agent, in the order they became pending."""
+        return list(self._available.values())
+
+    def pending(self) -> list[Task]:
+        """All pending tasks, targeted or not."""
+        return list(self._available.values()) + list(self._targeted.values())
+
+    def delivering(self) -> list[Task]:
+        """Tasks picked up and being delivered."""
+        return list(self._delivering.values())
+
+    def buckets(self) -> dict[str, list[Task]]:
+        """Tasks of every bucket in their internal order (used by checkpoints)."""
+        return {
+            'reveal_order': [task for task in self._reveal_order if self._not_revealed.get(id(task)) is task],
+            'available': list(self._available.values()),
+            'targeted': list(self._targeted.values()),
+            'delivering': list(self._delivering.values()),
+        }
+
+    def restore_buckets(self, buckets: dict[str, list[Task]], counts: dict[str, int], total: int) -> None:
+        """Replace the index with buckets saved by buckets() (used by checkpoints).
+
+        Bucket order is restored exactly, since it determines the order of
+        available() and so the random task assignment.
+        """
+        self._counts = dict(counts)
+        self._total = total
+        self._reveal_order = deque(buckets['reveal_order'])
+        self._not_revealed = {id(task): task for task in buckets['reveal_order']}
+        self._available = {id(task): task for task in buckets['available']}
+        self._targeted = {id(task): task for task in buckets['targeted']}
+        self._delivering = {id(task): task for task in buckets['delivering']}
+
+    def count(self, status: str) -> int:
+        """Number of tasks with the given status."""
+        return self._counts[status]
+
+    def is_complete(self) -> bool:
+        """Check if all tasks are completed."""
+        return self._counts[Task.STATUS_COMPLETED] == self._total
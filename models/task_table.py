@@ -0,0 +1,58 @@
+import numpy as np
+
+from models.task import Task
+from models.task_pool import TaskPool
+
+
+class TaskTable:
+    """Tasks numbered in order of first reference, convertible to arrays.
+
+    Used by checkpoints to store task references (of agents, the task pool,
+    arrival queues) as integer indices into one compact table, -1 for None.
+    """
+
+    def __init__(self, tasks: list[Task] | None = None):
+        self.tasks: list[Task] = []
+        self._index: dict[int, int] = {}
+        for task in tasks or []:
+            self.index(task)
+
+    def index(self, task: Task | None) -> int:
+        if task is None:
+            return -1
+        k = self._index.get(id(task))
+        if k is None:
+            k = self._index[id(task)] = len(self.tasks)
+            self.tasks.append(task)
+        return k
+
+    def indices(self, tasks: list[Task | None]) -> np.ndarray:
+        return np.array([self.index(task) for task in tasks], dtype=np.int64)
+
+    def lookup(self, indices: np.ndarray) -> list[Task | None]:
+        return [self.tasks[k] if k >= 0 else None for k in indices.tolist()]
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """Columns of the table: coordinates (x, y, delivery_x, delivery_y), status and id."""
+        coords = np.array([(t.x, t.y,
+                            -1 if t.delivery_x is None else t.delivery_x,
+                            -1 if t.delivery_y is None else t.delivery_y) for t in self.tasks],
+                          dtype=np.int64).reshape(-1, 4)
+        status = np.array([TaskPool.STATUSES.index(t.status) for t in self.tasks], dtype=np.int8)
+        ids = np.array([-1 if t.id is None else t.id for t in self.tasks], dtype=np.int64)
+        return {'task_coords': coords, 'task_status': status, 'task_id': ids}
+
+    @classmethod
+    def from_arrays(cls, arrays) -> 'TaskTable':
+        """Recreate the tasks saved with to_arrays."""
+        tasks = []
+        for (x, y, delivery_x, delivery_y), status, task_id in zip(
+                arrays['task_coords'].tolist(), arrays['task_status'].tolist(), arrays['task_id'].tolist()):
+            tasks.append(Task(
+                x=x, y=y,
+                delivery_x=None if delivery_x < 0 else delivery_x,
+                delivery_y=None if delivery_y < 0 else delivery_y,
+                status=TaskPool.STATUSES[status],
+                id=None if task_id < 0 else task_id,
+            ))
+        return cls(tasks)
@@ -0,0 +1,173 @@
+import json
+import os
+
+import numpy as np
+
+from models.coord import Coord
+from models.layout import Layout
+from models.simulation import SimulationBase
+from models.task import Task
+from models.task_pool import TaskPool
+
+
+POSITIONS_FILE = 'positions.i16'
+EVENTS_FILE = 'events.i32'
+LAYOUT_FILE = 'layout.npy'
+META_FILE = 'meta.json'
+
+EVENT_CODES = {
+    TaskPool.EVENT_REVEAL: 0,
+    TaskPool.EVENT_ASSIGN: 1,
+    TaskPool.EVENT_PICKUP: 2,
+    TaskPool.EVENT_DELIVER: 3,
+}
+# Event record columns (int32)
+EVENT_STEP, EVENT_CODE, EVENT_TASK, EVENT_AGENT, EVENT_X, EVENT_Y, EVENT_DELIVERY_X, EVENT_DELIVERY_Y = range(8)
+EVENT_COLUMNS = 8
+
+
+class TrajectoryRecorder:
+    """Streams agent positions and task events of a running simulation to a directory.
+
+    Positions go to a raw int16 file of shape (T, n_agents, 2), row t holding
+    (x, y) of every agent after t steps (row 0 is the initial configuration).
+    Task events go to a raw int32 file of EVENT_COLUMNS columns, tagged with
+    the step during which they happened. Both are buffered and appended in
+    chunks; meta.json is rewritten on every flush, so a recording interrupted
+    mid-run is still readable up to the last flush.
+    """
+
+    def __init__(self, simulation: SimulationBase, path: str, chunk_steps: int = 1024):
+        layout = simulation.layout
+        if max(layout.width, layout.height) > np.iinfo(np.int16).max:
+            raise ValueError("Layout too large for int16 positions")
+        self.simulation = simulation
+        self.path = path
+        self.num_agents = len(simulation.agents)
+        self._agent_ids = [agent.id for agent in simulation.agents]
+        self.steps = 0
+        self._chunk = np.empty((chunk_steps, self.num_agents, 2), dtype=np.int16)
+        self._buffered = 0
+        self._events: list[tuple[int, ...]] = []
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, LAYOUT_FILE), layout.cells)
+        self._positions_file = open(os.path.join(path, POSITIONS_FILE), 'wb')
+        self._events_file = open(os.path.join(path, EVENTS_FILE), 'wb')
+
+        # Tasks already in flight appear as events of step 0
+        owners = {}
+        for agent in simulation.agents:
+            for task in (agent.task, agent.target_task):
+                if task is not None:
+                    owners[id(task)] = agent.id
+        for task in simulation.task_pool.pending():
+            self._on_event(TaskPool.EVENT_REVEAL, task, None)
+            if id(task) in owners:
+                self._on_event(TaskPool.EVENT_ASSIGN, task, owners[id(task)])
+        for task in simulation.task_pool.delivering():
+            self._on_event(TaskPool.EVENT_PICKUP, task, owners.get(id(task)))
+
+        simulation.task_pool.listeners.append(self._on_event)
+        self.record([(agent.x, agent.y) for agent in simulation.agents])
+
+    def _on_event(self, event: str, task: Task, agent: int | None) -> None:
+        delivery_x = task.delivery_x if task.delivery_x is not None else -1
+        delivery_y = task.delivery_y if task.delivery_y is not None else -1
+        self._events.append((self.steps, EVENT_CODES[event], task.id, -1 if agent is None else agent,
+                             task.x, task.y, delivery_x, delivery_y))
+
+    def step(self) -> list[Coord] | None:
+        """Step the simulation and record the new positions."""
+        positions = self.simulation.step()
+        self.record(positions)
+        return positions
+
+    def record(self, positions: list[Coord]) -> None:
+        """Record the positions after a step (called by step())."""
+        self._chunk[self._buffered] = positions
+        self._buffered += 1
+        self.steps += 1
+        if self._buffered == len(self._chunk):
+            self.flush()
+
+    def flush(self) -> None:
+        """Append buffered positions and events to the files."""
+        self._positions_file.write(self._chunk[:self._buffered].tobytes())
+        self._buffered = 0
+        if self._events:
+            self._events_file.write(np.array(self._events, dtype=np.int32).tobytes())
+            self._events.clear()
+        self._positions_file.flush()
+        self._events_file.flush()
+
+        layout = self.simulation.layout
+        meta = {
+            'num_agents': self.num_agents,
+            'agent_ids': self._agent_ids,
+            'steps': self.steps,
+            'width': layout.width,
+            'height': layout.height,
+            'tasks_total': len(self.simulation.task_pool),
+        }
+        with open(os.path.join(self.path, META_FILE), 'w') as f:
+            json.dump(meta, f)
+
+    def close(self) -> None:
+        """Flush and stop recording."""
+        self.flush()
+        self._positions_file.close()
+        self._events_file.close()
+        self.simulation.task_pool.listeners.remove(self._on_event)
+
+
+class Trajectory:
+    """Read-only view of a recording made by TrajectoryRecorder.
+
+    Positions and events are memory-mapped, so opening a long recording and
+    seeking in it does not load it into memory.
+    """
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.layout = Layout.from_cells(np.load(os.path.join(path, LAYOUT_FILE)))
+        self.num_agents: int = self.meta['num_agents']
+        self.positions = self._memmap(os.path.join(path, POSITIONS_FILE), np.int16, (self.num_agents, 2))
+        self.events = self._memmap(os.path.join(path, EVENTS_FILE), np.int32, (EVENT_COLUMNS,))
+
+    @staticmethod
+    def _memmap(path: str, dtype, row_shape: tuple[int, ...]) -> np.ndarray:
+        row_bytes = int(np.prod(row_shape)) * np.dtype(dtype).itemsize
+        rows = os.path.getsize(path) // row_bytes
+        if rows == 0:
+            return np.empty((0, *row_shape), dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode='r', shape=(rows, *row_shape))
+
+    def __len__(self) -> int:
+        """Number of recorded configurations (steps + 1)."""
+        return len(self.positions)
+
+    def task_states(self, t: int) -> tuple[np.ndarray, np.ndarray, int]:
+        """Tasks in flight after t steps.
+
+        Returns:
+            (pickups, deliveries, completed): pickups are rows (x, y, agent) of
+            pending tasks, deliveries rows (delivery_x, delivery_y, agent) of
+            tasks being delivered, agent -1 if none; completed is the number of
+            tasks delivered so far.
+        """
+        # Events are appended in step order, so the ones up to t form a prefix
+        events = np.asarray(self.events[:np.searchsorted(self.events[:, EVENT_STEP], t, side='right')])
+        codes = events[:, EVENT_CODE]
+        completed = int(np.count_nonzero(codes == EVENT_CODES[TaskPool.EVENT_DELIVER]))
+
+        # Last event of every task
+        _, last = np.unique(events[::-1, EVENT_TASK], return_index=True)
+        latest = events[len(events) - 1 - np.sort(last)]
+        code = latest[:, EVENT_CODE]
+        pending = (code == EVENT_CODES[TaskPool.EVENT_REVEAL]) | (code == EVENT_CODES[TaskPool.EVENT_ASSIGN])
+        delivering = code == EVENT_CODES[TaskPool.EVENT_PICKUP]
+        pickups = latest[pending][:, [EVENT_X, EVENT_Y, EVENT_AGENT]]
+        deliveries = latest[delivering][:, [EVENT_DELIVERY_X, EVENT_DELIVERY_Y, EVENT_AGENT]]
+        return pickups, deliveries, completed
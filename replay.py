@@ -0,0 +1,28 @@
+import argparse
+import sys
+
+from PySide6.QtWidgets import QApplication
+
+from models.trajectory import Trajectory
+from windows.map import MapWindow
+from windows.replay import TrajectoryReplay
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a trajectory recorded with headless.py --record.")
+    parser.add_argument('path', help="Recording directory")
+    parser.add_argument('--cell-size', type=int, default=30)
+    parser.add_argument('--tick-interval', type=int, default=100, help="Milliseconds between replayed steps")
+    args = parser.parse_args()
+
+    replay = TrajectoryReplay(Trajectory(args.path))
+    print(f"Replaying {replay.num_steps} steps of {replay.trajectory.num_agents} agents")
+
+    app = QApplication(sys.argv)
+    window = MapWindow(replay, cell_size=args.cell_size, tick_interval=args.tick_interval)
+    window.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
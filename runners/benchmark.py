@@ -0,0 +1,131 @@
+import json
+import multiprocessing
+import os
+import resource
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from runners.headless import build_simulation, run_headless
+
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+BASELINES_PATH = os.path.join(BENCHMARK_DIR, 'baselines.json')
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One fixed map and agent count of the benchmark suite."""
+    name: str
+    map_file: str  # relative to benchmarks/maps
+    num_agents: int
+    steps: int = 300
+    num_tasks: int = 5_000
+    seed: int = 0
+    landmarks: int | None = None  # see PIBTMAPDSimulation, None for exact distance tables
+
+    @property
+    def map_path(self) -> str:
+        return os.path.join(BENCHMARK_DIR, 'maps', self.map_file)
+
+
+SUITE = [
+    BenchmarkCase('warehouse-64x33-a100', 'warehouse-64x33.map', 100),
+    BenchmarkCase('warehouse-64x33-a300', 'warehouse-64x33.map', 300),
+    BenchmarkCase('warehouse-161x63-a500', 'warehouse-161x63.map', 500),
+    BenchmarkCase('warehouse-161x63-a500-landmarks8', 'warehouse-161x63.map', 500, landmarks=8),
+    BenchmarkCase('storage-walls-48x32-a200', 'storage-walls-48x32.layout', 200),
+]
+
+# Relative slack per metric before a result counts as a regression
+DEFAULT_TOLERANCE = {'steps_per_sec': 0.2, 'peak_rss_mb': 0.2, 'throughput': 0.02}
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_case(case: BenchmarkCase) -> dict:
+    """Run one benchmark case (executed in a fresh worker process).
+
+    Args:
+        case: Case to run.
+
+    Returns:
+        Result row with steps/sec, peak RSS in MB and throughput.
+    """
+    simulation = build_simulation(
+        layout_name=case.map_path,
+        num_agents=case.num_agents,
+        num_tasks=case.num_tasks,
+        seed=case.seed,
+        eager_dist_tables=True,
+        landmarks=case.landmarks,
+    )
+    result = run_headless(simulation, case.steps)
+    simulation.close()
+    return {
+        'name': case.name,
+        'steps': result.steps,
+        'steps_per_sec': result.steps_per_sec,
+        'peak_rss_mb': _peak_rss_mb(),
+        'throughput': result.throughput,
+    }
+
+
+def run_suite(cases: list[BenchmarkCase] = SUITE) -> list[dict]:
+    """Run cases one at a time, each in its own spawned process.
+
+    Running sequentially keeps timings free of contention, and a fresh process
+    per case keeps peak RSS from carrying over between cases.
+
+    Returns:
+        One result row per case, in order.
+    """
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for case in cases:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(run_case, case).result())
+    return results
+
+
+def load_baselines(path: str = BASELINES_PATH) -> dict[str, dict]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(results: list[dict], path: str = BASELINES_PATH) -> None:
+    baselines = load_baselines(path)
+    baselines.update({row['name']: {k: v for k, v in row.items() if k != 'name'} for row in results})
+    with open(path, 'w') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results: list[dict], baselines: dict[str, dict],
+            tolerance: dict[str, float] = DEFAULT_TOLERANCE) -> list[str]:
+    """Compare results against baselines.
+
+    Steps/sec and throughput regress when they drop, peak RSS when it grows,
+    by more than the relative tolerance of the metric.
+
+    Returns:
+        Human readable description of every regression, empty if none.
+    """
+    regressions = []
+    for row in results:
+        baseline = baselines.get(row['name'])
+        if baseline is None:
+            continue
+        for metric, slack in tolerance.items():
+            value, reference = row[metric], baseline[metric]
+            worse = value > reference * (1 + slack) if metric == 'peak_rss_mb' else value < reference * (1 - slack)
+            if worse:
+                regressions.append(f"{row['name']}: {metric} {value:.4g} vs baseline {reference:.4g}")
+    return regressions
+
@@ -0,0 +1,196 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from generators.agent import initialize_positions_randomly
+from generators.layout import storage_floor, storage_walls, obstacle_walls
+from generators.layout_file import load_layout_file
+from generators.task import next_random
+from generators.task_stream import batch_arrivals, poisson_arrivals, stream_tasks, zipf_weights
+from models.agent import Agent
+from models.layout import Layout
+from models.task import Task
+from models.trajectory import TrajectoryRecorder
+from simulations.batched_pibt_mapd import BatchedPIBTMAPD
+from simulations.pibt_mapd_simulation import PIBTMAPDSimulation
+from simulations.pibt_mapd_task_reveal_simulation import PIBTMAPDSimulationWithTaskReveal
+from simulations.pibt_mapd_task_stream_simulation import PIBTMAPDSimulationWithTaskStream
+
+
+LAYOUT_GENERATORS: dict[str, Callable[[int, int], Layout]] = {
+    'storage_floor': storage_floor,
+    'storage_walls': storage_walls,
+    'obstacle_walls': obstacle_walls,
+}
+
+LAYOUT_FILE_SUFFIXES = ('.map', '.layout')
+
+
+def layout_name(value: str) -> str:
+    """Validate a layout name: a key of LAYOUT_GENERATORS or a .map/.layout file path."""
+    if value not in LAYOUT_GENERATORS and not value.endswith(LAYOUT_FILE_SUFFIXES):
+        raise ValueError(f"unknown layout {value!r}")
+    return value
+
+
+def make_layout(layout_name: str, width: int, height: int) -> Layout:
+    """Generate a layout by name or load it from a .map/.layout file.
+
+    Args:
+        layout_name: Key into LAYOUT_GENERATORS or path to a layout file.
+        width: Layout width in cells, ignored for files.
+        height: Layout height in cells, ignored for files.
+
+    Returns:
+        New layout.
+    """
+    if layout_name.endswith(LAYOUT_FILE_SUFFIXES):
+        return load_layout_file(layout_name)
+    return LAYOUT_GENERATORS[layout_name](width, height)
+
+
+@dataclass
+class HeadlessResult:
+    steps: int
+    elapsed: float  # wall clock seconds spent stepping
+    tasks_completed: int
+    tasks_total: int
+
+    @property
+    def steps_per_sec(self) -> float:
+        return self.steps / self.elapsed if self.elapsed > 0 else float('inf')
+
+    @property
+    def throughput(self) -> float:
+        """Completed tasks per simulation timestep."""
+        return self.tasks_completed / self.steps if self.steps > 0 else 0.0
+
+
+def build_simulation(layout_name: str = 'storage_walls', width: int = 30, height: int = 30,
+                     num_agents: int = 200, num_tasks: int = 5_000, reveal_interval: int = 1,
+                     seed: int = 42, **sim_kwargs) -> PIBTMAPDSimulationWithTaskReveal:
+    """Build the demo scenario without any GUI dependencies.
+
+    The generators draw from the global `random` module, which is seeded here so
+    that the same arguments always produce the same scenario.
+
+    Args:
+        layout_name: Key into LAYOUT_GENERATORS or path to a .map/.layout file.
+        width: Layout width in cells, ignored for layout files.
+        height: Layout height in cells, ignored for layout files.
+        num_agents: Number of agents placed randomly on traversable cells.
+        num_tasks: Number of tasks, all initially not revealed.
+        reveal_interval: Timesteps between task reveals.
+        seed: Seed for scenario generation and the simulation RNG.
+        **sim_kwargs: Extra keyword arguments passed to the simulation.
+
+    Returns:
+        Simulation ready to be stepped.
+    """
+    random.seed(seed)
+    layout = make_layout(layout_name, width, height)
+
+    agents = [Agent(id=i, x=0, y=0) for i in range(num_agents)]
+    initialize_positions_randomly(agents, layout)
+
+    tasks = [next_random(layout) for _ in range(num_tasks)]
+
+    return PIBTMAPDSimulationWithTaskReveal(
+        layout, agents, tasks,
+        reveal_interval=reveal_interval,
+        seed=seed,
+        **sim_kwargs
+    )
+
+
+def build_stream_simulation(layout_name: str = 'storage_walls', width: int = 30, height: int = 30,
+                            num_agents: int = 200, arrival_rate: float = 1.0, batch_interval: int | None = None,
+                            zipf_exponent: float = 0.0, pickup_weights: np.ndarray | None = None,
+                            max_tasks: int | None = None, seed: int = 42, **sim_kwargs) -> PIBTMAPDSimulationWithTaskStream:
+    """Build the demo scenario with tasks streamed from stochastic arrivals.
+
+    Args:
+        layout_name: Key into LAYOUT_GENERATORS or path to a .map/.layout file.
+        width: Layout width in cells, ignored for layout files.
+        height: Layout height in cells, ignored for layout files.
+        num_agents: Number of agents placed randomly on traversable cells.
+        arrival_rate: Mean number of new tasks per timestep.
+        batch_interval: Release tasks in batches every this many timesteps
+            instead of a Poisson process.
+        zipf_exponent: Zipf exponent of SKU popularity, 0 for uniform pickups.
+        pickup_weights: Pickup probabilities indexed like layout.storage_cells,
+            overrides zipf_exponent.
+        max_tasks: Total number of tasks, endless if None.
+        seed: Seed for scenario generation and the simulation RNG.
+        **sim_kwargs: Extra keyword arguments passed to the simulation.
+
+    Returns:
+        Simulation ready to be stepped.
+    """
+    random.seed(seed)
+    layout = make_layout(layout_name, width, height)
+
+    agents = [Agent(id=i, x=0, y=0) for i in range(num_agents)]
+    initialize_positions_randomly(agents, layout)
+
+    if batch_interval is None:
+        arrivals = poisson_arrivals(arrival_rate, seed=seed)
+    else:
+        arrivals = batch_arrivals(arrival_rate * batch_interval, batch_interval, seed=seed)
+    if pickup_weights is None and zipf_exponent:
+        pickup_weights = zipf_weights(len(layout.storage_cells), zipf_exponent, seed=seed)
+    stream = stream_tasks(layout, arrivals, pickup_weights, max_tasks=max_tasks, seed=seed)
+
+    return PIBTMAPDSimulationWithTaskStream(layout, agents, stream, seed=seed, **sim_kwargs)
+
+
+def run_headless(simulation: PIBTMAPDSimulation, max_steps: int,
+                 recorder: TrajectoryRecorder | None = None) -> HeadlessResult:
+    """Step a simulation as fast as possible.
+
+    Args:
+        simulation: Simulation to run.
+        max_steps: Maximum number of steps to perform.
+        recorder: Optional recorder of the simulation, stepped instead of it.
+
+    Returns:
+        Step count, wall clock time and task statistics of the run.
+    """
+    steps = 0
+    start = time.perf_counter()
+    step = recorder.step if recorder is not None else simulation.step
+    while steps < max_steps and not simulation.is_complete():
+        step()
+        steps += 1
+    elapsed = time.perf_counter() - start
+
+    return HeadlessResult(
+        steps=steps,
+        elapsed=elapsed,
+        tasks_completed=simulation.task_pool.count(Task.STATUS_COMPLETED),
+        tasks_total=len(simulation.task_pool),
+    )
+
+
+def run_batched(layout_name: str, width: int, height: int, num_agents: int, num_tasks: int,
+                reveal_interval: int, seeds: list[int], max_steps: int) -> list[HeadlessResult]:
+    """Run one scenario for many seeds in lockstep with BatchedPIBTMAPD.
+
+    Returns:
+        One result per seed; elapsed is the wall clock time of the whole batch.
+    """
+    layout = make_layout(layout_name, width, height)
+    batch = BatchedPIBTMAPD(layout, num_agents, seeds, num_tasks, reveal_interval)
+
+    steps = 0
+    start = time.perf_counter()
+    while steps < max_steps and not batch.is_complete():
+        batch.step()
+        steps += 1
+    elapsed = time.perf_counter() - start
+
+    return [HeadlessResult(steps=steps, elapsed=elapsed, tasks_completed=int(completed), tasks_total=num_tasks)
+            for completed in batch.tasks_completed()]
@@ -0,0 +1,179 @@
+import math
+import os
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+import numpy as np
+
+from models.dist_table import iter_dist_fields
+from models.layout import Layout
+from runners.headless import build_stream_simulation, make_layout, run_headless
+
+
+@dataclass(frozen=True)
+class RolloutSpec:
+    """Scenario used to score placements by short headless simulations.
+
+    The arrival rate should exceed the throughput the agents can reach, so
+    that the measured throughput reflects the placement and not the demand.
+    """
+    layout_name: str
+    width: int
+    height: int
+    num_agents: int
+    arrival_rate: float = 2.0
+    steps: int = 500
+    seeds: tuple[int, ...] = (0, 1, 2)
+
+    def layout(self) -> Layout:
+        return make_layout(self.layout_name, self.width, self.height)
+
+
+@dataclass
+class PlacementResult:
+    sku_at_cell: np.ndarray  # SKU stored at each storage cell, indexed like layout.storage_cells
+    throughput: float  # mean rollout throughput of sku_at_cell
+    proxy_cost: float
+    history: list[dict] = field(default_factory=list)  # one row per search iteration
+
+
+def output_distances(layout: Layout) -> np.ndarray:
+    """Mean shortest path distance from each storage cell to the output cells.
+
+    Returns:
+        Array indexed like layout.storage_cells.
+    """
+    xs, ys = layout.storage_xy[:, 0], layout.storage_xy[:, 1]
+    total = np.zeros(len(xs), dtype=float)
+    for _, fields in iter_dist_fields(layout.grid, layout.output_cells):
+        total += fields[:, ys, xs].sum(axis=0, dtype=float)
+    return total / len(layout.output_cells)
+
+
+def pickup_weights(popularity: np.ndarray, sku_at_cell: np.ndarray) -> np.ndarray:
+    """Pickup probability of each storage cell under a placement."""
+    return popularity[sku_at_cell]
+
+
+def proxy_cost(popularity: np.ndarray, sku_at_cell: np.ndarray, distances: np.ndarray) -> float:
+    """Popularity-weighted mean distance between pickups and output cells."""
+    return float(np.dot(pickup_weights(popularity, sku_at_cell), distances))
+
+
+def proxy_placement(popularity: np.ndarray, distances: np.ndarray) -> np.ndarray:
+    """Placement minimizing proxy_cost: the most popular SKUs at the cells closest to outputs."""
+    sku_at_cell = np.empty(len(distances), dtype=np.int64)
+    sku_at_cell[np.argsort(distances, kind='stable')] = np.argsort(-popularity, kind='stable')
+    return sku_at_cell
+
+
+def rollout(spec: RolloutSpec, weights: np.ndarray, seed: int) -> float:
+    """Throughput of one headless simulation (executed in a worker process)."""
+    simulation = build_stream_simulation(
+        layout_name=spec.layout_name,
+        width=spec.width,
+        height=spec.height,
+        num_agents=spec.num_agents,
+        arrival_rate=spec.arrival_rate,
+        pickup_weights=weights,
+        seed=seed,
+        eager_dist_tables=True,
+    )
+    result = run_headless(simulation, spec.steps)
+    simulation.close()
+    return result.throughput
+
+
+def evaluate_placements(pool: Executor, spec: RolloutSpec, popularity: np.ndarray,
+                        placements: list[np.ndarray]) -> list[float]:
+    """Mean rollout throughput of each placement.
+
+    Every placement is simulated with the same seeds (common random numbers):
+    agent starts, arrival times and the uniform draws behind pickup sampling
+    are shared, so differences come from the placements rather than noise.
+    """
+    futures = [[pool.submit(rollout, spec, pickup_weights(popularity, placement), seed) for seed in spec.seeds]
+               for placement in placements]
+    return [float(np.mean([future.result() for future in group])) for group in futures]
+
+
+def _swap_candidates(rng: np.random.Generator, weights: np.ndarray, distances: np.ndarray,
+                     count: int, oversample: int) -> list[tuple[int, int]]:
+    """Random swaps of two storage cells, those increasing proxy cost the least first."""
+    pairs = rng.integers(len(weights), size=(count * oversample, 2))
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    i, j = pairs[:, 0], pairs[:, 1]
+    delta = (weights[i] - weights[j]) * (distances[j] - distances[i])
+    best = np.argsort(delta, kind='stable')[:count]
+    return [(int(a), int(b)) for a, b in pairs[best]]
+
+
+def optimize_placement(spec: RolloutSpec, popularity: np.ndarray, iterations: int = 20,
+                       candidates: int | None = None, temperature: float = 0.01, cooling: float = 0.9,
+                       oversample: int = 8, workers: int | None = None, seed: int = 0,
+                       progress: Callable[[dict], None] | None = None) -> PlacementResult:
+    """Optimize which storage cell holds which SKU for simulated throughput.
+
+    Starts from proxy_placement, then runs simulated annealing over swaps of
+    two SKUs. Each iteration proposes `candidates` swaps, chosen among random
+    ones as those the proxy penalizes least, scores them all in parallel with
+    rollouts and moves to the best one if it is accepted.
+
+    Args:
+        spec: Rollout scenario.
+        popularity: Order probability of each SKU, one SKU per storage cell.
+        iterations: Annealing iterations, 0 returns the scored proxy placement.
+        candidates: Swaps scored per iteration. Defaults to the number of workers.
+        temperature: Initial temperature in units of throughput.
+        cooling: Temperature multiplier per iteration.
+        oversample: Random swaps drawn per candidate before proxy filtering.
+        workers: Worker processes (default: one per core).
+        seed: Seed of the search (rollout seeds are in spec).
+        progress: Optional callback receiving each history row.
+
+    Returns:
+        Best placement found.
+    """
+    layout = spec.layout()
+    if len(popularity) != len(layout.storage_cells):
+        raise ValueError("popularity must have one entry per storage cell")
+    workers = workers or os.cpu_count()
+    candidates = candidates or workers
+    rng = np.random.default_rng(seed)
+    accept_rng = random.Random(seed)
+
+    distances = output_distances(layout)
+    current = proxy_placement(popularity, distances)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        score = evaluate_placements(pool, spec, popularity, [current])[0]
+        result = PlacementResult(current.copy(), score, proxy_cost(popularity, current, distances))
+
+        for iteration in range(iterations):
+            swaps = _swap_candidates(rng, pickup_weights(popularity, current), distances, candidates, oversample)
+            neighbors = []
+            for i, j in swaps:
+                neighbor = current.copy()
+                neighbor[[i, j]] = neighbor[[j, i]]
+                neighbors.append(neighbor)
+            scores = evaluate_placements(pool, spec, popularity, neighbors)
+
+            k = int(np.argmax(scores))
+            accepted = scores[k] >= score or accept_rng.random() < math.exp((scores[k] - score) / temperature)
+            if accepted:
+                current, score = neighbors[k], scores[k]
+                if score > result.throughput:
+                    result.sku_at_cell = current.copy()
+                    result.throughput = score
+                    result.proxy_cost = proxy_cost(popularity, current, distances)
+            temperature *= cooling
+
+            row = {'iteration': iteration, 'best_candidate': scores[k], 'accepted': accepted,
+                   'current': score, 'best': result.throughput}
+            result.history.append(row)
+            if progress is not None:
+                progress(row)
+
+    return result
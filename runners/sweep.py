@@ -0,0 +1,198 @@
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict, fields
+from typing import Callable
+
+from runners.headless import build_simulation, make_layout, run_headless
+from models.shared_dist_tables import SharedDistTables, SharedDistTablesHandle
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """One headless simulation run of a parameter sweep."""
+    layout_name: str
+    width: int
+    height: int
+    num_agents: int
+    num_tasks: int
+    reveal_interval: int
+    seed: int
+    steps: int
+
+    @property
+    def run_id(self) -> str:
+        """Stable identifier used to skip finished runs when resuming."""
+        return (f"{self.layout_name}-{self.width}x{self.height}-a{self.num_agents}-t{self.num_tasks}"
+                f"-r{self.reveal_interval}-s{self.seed}-n{self.steps}")
+
+
+CONFIG_FIELDS = [f.name for f in fields(SweepConfig)]
+RESULT_FIELDS = ['run_id', *CONFIG_FIELDS, 'steps_run', 'elapsed', 'steps_per_sec', 'tasks_completed', 'throughput']
+
+
+def expand_grid(layout_names: list[str], sizes: list[tuple[int, int]], agent_counts: list[int],
+                reveal_intervals: list[int], seeds: list[int], num_tasks: int, steps: int) -> list[SweepConfig]:
+    """Build the cartesian product of sweep parameters.
+
+    Args:
+        layout_names: Keys of runners.headless.LAYOUT_GENERATORS or layout file paths.
+        sizes: Layout (width, height) pairs.
+        agent_counts: Numbers of agents.
+        reveal_intervals: Timesteps between task reveals.
+        seeds: Scenario and simulation seeds.
+        num_tasks: Number of tasks per run.
+        steps: Maximum timesteps per run.
+
+    Returns:
+        List of configurations.
+    """
+    return [
+        SweepConfig(layout_name, width, height, num_agents, num_tasks, reveal_interval, seed, steps)
+        for layout_name, (width, height), num_agents, reveal_interval, seed
+        in itertools.product(layout_names, sizes, agent_counts, reveal_intervals, seeds)
+    ]
+
+
+def run_config(config: SweepConfig, shared: SharedDistTablesHandle | None = None) -> dict:
+    """Run one configuration headless (executed in a worker process).
+
+    Args:
+        config: Configuration to run.
+        shared: Handle of shared distance tables for the configuration's layout.
+
+    Returns:
+        Result row with the configuration and the measured statistics.
+    """
+    simulation = build_simulation(
+        layout_name=config.layout_name,
+        width=config.width,
+        height=config.height,
+        num_agents=config.num_agents,
+        num_tasks=config.num_tasks,
+        reveal_interval=config.reveal_interval,
+        seed=config.seed,
+        eager_dist_tables=True,
+    )
+    dist_tables = None
+    if shared is not None:
+        dist_tables = SharedDistTables.attach(simulation.grid, shared)
+        simulation.dist_tables = dist_tables
+
+    result = run_headless(simulation, config.steps)
+    simulation.close()
+
+    if dist_tables is not None:
+        dist_tables.close()
+    return {
+        'run_id': config.run_id,
+        **asdict(config),
+        'steps_run': result.steps,
+        'elapsed': round(result.elapsed, 4),
+        'steps_per_sec': round(result.steps_per_sec, 2),
+        'tasks_completed': result.tasks_completed,
+        'throughput': round(result.throughput, 6),
+    }
+
+
+def completed_run_ids(path: str) -> set[str]:
+    """Run ids already present in a results CSV (empty if it does not exist)."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline='') as f:
+        # Rows cut short by an interrupted write have no throughput and are rerun
+        return {row['run_id'] for row in csv.DictReader(f) if row.get('throughput')}
+
+
+def drop_partial_row(path: str, chunk_size: int = 1 << 16) -> bool:
+    """Truncate a results CSV after its last newline.
+
+    A run killed mid-write leaves a last line without a newline; appending
+    to it would merge it with the next row.
+
+    Returns:
+        True if a partial row was removed.
+    """
+    if not os.path.exists(path):
+        return False
+    with open(path, 'rb+') as f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(0, position - chunk_size)
+            f.seek(start)
+            newline = f.read(position - start).rfind(b'\n')
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position == end:
+            return False
+        f.truncate(position)
+        return True
+
+
+def run_sweep(configs: list[SweepConfig], out_path: str, workers: int | None = None,
+              progress: Callable[[dict], None] | None = None, share_dist_tables: bool = False) -> int:
+    """Run configurations across a process pool and stream results to CSV.
+
+    Each result row is appended and flushed as soon as its run finishes, so an
+    interrupted sweep can be resumed by calling run_sweep again with the same
+    output path; runs already in the file are skipped, and a row cut short by
+    the interruption is dropped and rerun.
+
+    With share_dist_tables, the distance fields of all storage and output
+    cells of each layout are computed once in the parent into shared memory
+    and attached read-only by the workers, instead of every worker building
+    its own copies.
+
+    Args:
+        configs: Configurations to run.
+        out_path: Results CSV path, appended to if it exists.
+        workers: Number of worker processes. Defaults to one per core.
+        progress: Optional callback receiving each result row.
+        share_dist_tables: Share distance fields across workers.
+
+    Returns:
+        Number of runs executed by this call.
+    """
+    drop_partial_row(out_path)
+    done = completed_run_ids(out_path)
+    pending = list({c.run_id: c for c in configs if c.run_id not in done}.values())
+    if not pending:
+        return 0
+
+    write_header = not os.path.exists(out_path) or os.path.getsize(out_path) == 0
+    with open(out_path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        if write_header:
+            writer.writeheader()
+            f.flush()
+
+        shared: dict[tuple[str, int, int], SharedDistTables] = {}
+        try:
+            if share_dist_tables:
+                for config in pending:
+                    key = (config.layout_name, config.width, config.height)
+                    if key not in shared:
+                        layout = make_layout(config.layout_name, config.width, config.height)
+                        shared[key] = SharedDistTables.create(
+                            layout.grid, layout.storage_cells + layout.output_cells)
+
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+                futures = []
+                for config in pending:
+                    tables = shared.get((config.layout_name, config.width, config.height))
+                    futures.append(pool.submit(run_config, config, tables.handle if tables else None))
+                for future in as_completed(futures):
+                    row = future.result()
+                    writer.writerow(row)
+                    f.flush()
+                    if progress is not None:
+                        progress(row)
+        finally:
+            for tables in shared.values():
+                tables.unlink()
+
+    return len(pending)
@@ -0,0 +1,277 @@
+import numpy as np
+
+from models.dist_table import compute_dist_fields
+from models.layout import Layout
+from models.neighbor_table import NeighborTable
+
+
+def _pibt(order: list[int], Q_from: list[int], candidates: list[list[int]]) -> list[int]:
+    """PIBT over one instance with candidate cells already sorted best first.
+
+    Same iterative priority inheritance as PIBTPlanner.func_pibt (see
+    simulations.planner), with occupancy in dicts keyed by cell so nothing
+    grid-sized is touched.
+    Candidates padded with -1 are skipped.
+    """
+    Q_to = [-1] * len(Q_from)
+    occupied_now = {v: i for i, v in enumerate(Q_from)}
+    occupied_nxt: dict[int, int] = {}
+
+    for i in order:
+        if Q_to[i] != -1:
+            continue
+        stack = [[i, 0]]
+        while stack:
+            frame = stack[-1]
+            k = frame[0]
+            C = candidates[k]
+            done = False
+            while frame[1] < len(C):
+                v = C[frame[1]]
+                frame[1] += 1
+                if v < 0 or v in occupied_nxt:
+                    continue
+                j = occupied_now.get(v, -1)
+                # Avoid edge collision (swap)
+                if j != -1 and j != k and Q_to[j] == Q_from[k]:
+                    continue
+                Q_to[k] = v
+                occupied_nxt[v] = k
+                # Priority inheritance
+                if j != -1 and j != k and Q_to[j] == -1:
+                    stack.append([j, 0])
+                else:
+                    done = True
+                break
+            else:
+                # Failed to secure node - stay in place, parent tries its next candidate
+                Q_to[k] = Q_from[k]
+                occupied_nxt[Q_from[k]] = k
+                stack.pop()
+                continue
+            if done:
+                break
+    return Q_to
+
+
+class BatchedPIBTMAPD:
+    """Many independent PIBT MAPD instances of one layout stepped in lockstep.
+
+    Agent and task state are arrays with a leading batch axis; the layout,
+    its adjacency and the distance fields of all storage and output cells are
+    shared. Reveal, assignment bookkeeping, candidate ordering, priorities and
+    acting are vectorized across the batch and agents; only the priority
+    inheritance itself runs per instance, on precomputed candidate lists.
+
+    Every instance follows the rules of PIBTMAPDSimulationWithTaskReveal
+    (greedy nearest-pickup assignment, one task revealed every
+    reveal_interval steps), but draws from its own NumPy generator seeded
+    from `seeds`, so trajectories are not identical to those of the scalar
+    simulation. An instance depends only on its seed, not on the rest of the
+    batch.
+
+    Cells are flat ids y * width + x.
+    """
+
+    STATUS_NOTREVEALED = 0
+    STATUS_PENDING = 1
+    STATUS_TARGETED = 2  # pending, targeted by an agent heading to pickup
+    STATUS_DELIVERING = 3
+    STATUS_COMPLETED = 4
+
+    def __init__(self, layout: Layout, num_agents: int, seeds: list[int], num_tasks: int,
+                 reveal_interval: int = 1, pickup_weights: np.ndarray | None = None):
+        """Create the batch.
+
+        Args:
+            layout: Layout shared by all instances.
+            num_agents: Agents per instance, placed randomly on traversable cells.
+            seeds: One seed per instance.
+            num_tasks: Tasks per instance, all initially not revealed.
+            reveal_interval: Timesteps between task reveals.
+            pickup_weights: Pickup probabilities indexed like layout.storage_cells, uniform if None.
+        """
+        self.layout = layout
+        self.seeds = list(seeds)
+        self.reveal_interval = reveal_interval
+        self.timestep = 0
+        B, n = len(self.seeds), num_agents
+        width = layout.width
+        grid = layout.grid
+        num_cells = grid.size
+
+        # Shared: candidate cells (self first, then neighbors) and distance fields
+        neighbors = NeighborTable.from_grid(grid).to_padded()
+        self.candidates = np.concatenate([np.arange(num_cells)[:, None], neighbors], axis=1)
+        storage = layout.storage_xy[:, 1] * width + layout.storage_xy[:, 0]
+        output = layout.output_xy[:, 1] * width + layout.output_xy[:, 0]
+        goal_cells = np.unique(np.concatenate([storage, output]))
+        self.goal_row = np.full(num_cells, -1, dtype=np.int64)
+        self.goal_row[goal_cells] = np.arange(len(goal_cells))
+        goals = [(int(c % width), int(c // width)) for c in goal_cells]
+        # Compact dtype (grid.size marks unreachable); slices are widened when gathered
+        self.fields = compute_dist_fields(grid, goals).reshape(len(goals), num_cells)
+        self.unreachable = num_cells
+
+        # Per instance
+        self.rngs = [np.random.default_rng(seed) for seed in self.seeds]
+        traversable = np.flatnonzero(grid.ravel())
+        if n > len(traversable):
+            raise ValueError("Not enough empty cells to place all agents")
+        self.cell = np.stack([rng.choice(traversable, n, replace=False) for rng in self.rngs])  # (B, n)
+        self.goal_cell = self.cell.copy()
+        self.elapsed = np.zeros((B, n), dtype=np.int64)
+        self.tie_breaker = np.stack([rng.random(n) for rng in self.rngs])
+        self.task = np.full((B, n), -1, dtype=np.int64)  # carried task
+        self.target = np.full((B, n), -1, dtype=np.int64)  # task heading to pickup
+
+        self.task_pickup = np.stack([storage[rng.choice(len(storage), num_tasks, p=pickup_weights)]
+                                     for rng in self.rngs])  # (B, T)
+        self.task_delivery = np.stack([output[rng.integers(len(output), size=num_tasks)] for rng in self.rngs])
+        self.task_status = np.full((B, num_tasks), self.STATUS_NOTREVEALED, dtype=np.int8)
+
+        self._batch = np.arange(B)[:, None]
+        self._occupancy = np.zeros((B, num_cells), dtype=bool)  # cleared after every use
+
+    @property
+    def batch_size(self) -> int:
+        return len(self.seeds)
+
+    @property
+    def num_agents(self) -> int:
+        return self.cell.shape[1]
+
+    def tasks_completed(self) -> np.ndarray:
+        """Completed tasks of each instance."""
+        return np.count_nonzero(self.task_status == self.STATUS_COMPLETED, axis=1)
+
+    def positions(self) -> np.ndarray:
+        """(B, n, 2) array of agent (x, y)."""
+        width = self.layout.width
+        return np.stack([self.cell % width, self.cell // width], axis=-1)
+
+    def is_complete(self) -> bool:
+        return bool(np.all(self.task_status == self.STATUS_COMPLETED))
+
+    def step(self) -> np.ndarray:
+        """Perform one step of every instance.
+
+        Returns:
+            (B, n, 2) array of agent (x, y) after this step.
+        """
+        if self.timestep % self.reveal_interval == 0:
+            k = self.timestep // self.reveal_interval
+            if k < self.task_status.shape[1]:
+                self.task_status[:, k] = self.STATUS_PENDING
+        self.timestep += 1
+
+        self._assignment_phase()
+        Q_to = self._planning_phase()
+        self._acting_phase(Q_to)
+        return self.positions()
+
+    def _assignment_phase(self) -> None:
+        """Greedily assign the nearest available pickup to every free agent.
+
+        Free agents are served in index order, each taking the nearest task
+        not yet taken (ties broken by a random task order), like
+        PIBTMAPDSimulation. The greedy rounds are vectorized across the batch.
+        """
+        free = (self.task < 0) & (self.target < 0)
+        self.goal_cell[free] = self.cell[free]  # stay unless a task is found
+        if not free.any():
+            return
+
+        agent_lists = [np.flatnonzero(row) for row in free]
+        task_lists = [rng.permutation(np.flatnonzero(status == self.STATUS_PENDING))
+                      for rng, status in zip(self.rngs, self.task_status)]
+        F = max(len(agents) for agents in agent_lists)
+        A = max(len(tasks) for tasks in task_lists)
+        if A == 0:
+            return
+
+        B = self.batch_size
+        inf = np.iinfo(np.int64).max
+        dist = np.full((B, F, A), inf, dtype=np.int64)
+        agent_index = np.zeros((B, F), dtype=np.int64)
+        task_index = np.zeros((B, A), dtype=np.int64)
+        for b, (agents, tasks) in enumerate(zip(agent_lists, task_lists)):
+            if len(agents) and len(tasks):
+                rows = self.goal_row[self.task_pickup[b, tasks]]
+                d = self.fields[rows][:, self.cell[b, agents]].T.astype(np.int64)
+                # Pickups the agent cannot reach are never assigned, like in PIBTMAPDSimulation
+                dist[b, :len(agents), :len(tasks)] = np.where(d < self.unreachable, d, inf)
+            agent_index[b, :len(agents)] = agents
+            task_index[b, :len(tasks)] = tasks
+
+        batch = np.arange(B)
+        taken = np.zeros((B, A), dtype=bool)
+        for r in range(F):
+            d = np.where(taken, inf, dist[:, r, :])
+            j = np.argmin(d, axis=1)
+            d_min = d[batch, j]
+            bs = np.flatnonzero(d_min < inf)
+            if len(bs) == 0:
+                continue
+            js = j[bs]
+            taken[bs, js] = True
+            agents = agent_index[bs, r]
+            tasks = task_index[bs, js]
+
+            self.target[bs, agents] = tasks
+            self.task_status[bs, tasks] = self.STATUS_TARGETED
+            self.goal_cell[bs, agents] = self.task_pickup[bs, tasks]
+
+            # Agent is at pickup location - assign immediately
+            at_pickup = d_min[bs] == 0
+            self._pick_up(bs[at_pickup], agents[at_pickup])
+
+    def _pick_up(self, bs: np.ndarray, agents: np.ndarray) -> None:
+        tasks = self.target[bs, agents]
+        self.task[bs, agents] = tasks
+        self.target[bs, agents] = -1
+        self.task_status[bs, tasks] = self.STATUS_DELIVERING
+        self.goal_cell[bs, agents] = self.task_delivery[bs, tasks]
+
+    def _planning_phase(self) -> np.ndarray:
+        """Sort candidates of all agents at once, then run PIBT per instance."""
+        B, n = self.cell.shape
+        order = np.lexsort((-self.tie_breaker, -self.elapsed, self.task < 0), axis=-1)
+
+        # Candidate ordering: distance to goal, then unoccupied first, then random
+        cand = self.candidates[self.cell]  # (B, n, 5)
+        valid = cand >= 0
+        safe = np.where(valid, cand, 0)
+        rows = self.goal_row[self.goal_cell]
+        # Free agents' goal is their own cell, which need not have a field: neighbors are at distance 1
+        dist = np.where(rows[..., None] >= 0,
+                        self.fields[np.maximum(rows, 0)[..., None], safe].astype(np.int64),
+                        (safe != self.cell[..., None]).astype(np.int64))
+        dist = np.where(valid, dist, np.iinfo(np.int64).max)
+        self._occupancy[self._batch, self.cell] = True
+        occupied = self._occupancy[self._batch[..., None], safe]
+        self._occupancy[self._batch, self.cell] = False
+        noise = np.stack([rng.random((n, cand.shape[2])) for rng in self.rngs])
+        ranking = np.lexsort((noise, occupied, dist), axis=-1)
+        sorted_cand = np.take_along_axis(cand, ranking, axis=-1)
+
+        Q_to = np.empty_like(self.cell)
+        for b in range(B):
+            Q_to[b] = _pibt(order[b].tolist(), self.cell[b].tolist(), sorted_cand[b].tolist())
+        return Q_to
+
+    def _acting_phase(self, Q_to: np.ndarray) -> None:
+        """Move agents and update task states, vectorized over the batch."""
+        at_goal = Q_to == self.goal_cell
+        self.elapsed += 1
+        self.elapsed[at_goal] = 0
+        self.cell = Q_to
+
+        delivered = at_goal & (self.task >= 0)
+        picked = at_goal & (self.task < 0) & (self.target >= 0)
+
+        bs, agents = np.nonzero(delivered)
+        self.task_status[bs, self.task[bs, agents]] = self.STATUS_COMPLETED
+        self.task[bs, agents] = -1
+
+        self._pick_up(*np.nonzero(picked))
@@ -0,0 +1,111 @@
+import json
+from typing import Iterator
+
+import numpy as np
+
+from models.agent import Agent
+from models.dist_table import DistTable, DistTableMap
+from models.layout import Layout
+from models.task import Task
+from models.task_table import TaskTable
+from simulations.guidance import TrafficGuidance
+from simulations.pibt_mapd_simulation import PIBTMAPDSimulation
+from simulations.pibt_mapd_task_reveal_simulation import PIBTMAPDSimulationWithTaskReveal
+from simulations.pibt_mapd_task_stream_simulation import PIBTMAPDSimulationWithTaskStream
+
+
+CHECKPOINT_VERSION = 1
+
+
+def save_checkpoint(simulation: PIBTMAPDSimulation, path: str, dist_tables: bool = False) -> None:
+    """Save the complete state of a simulation to an .npz file.
+
+    Agent state, occupancy, the task table and the task pool buckets in their
+    internal order, the RNG state and the traffic guidance state (if any) are
+    stored, so load_checkpoint continues bit-identically. Distance tables are exact and only affect speed; with
+    dist_tables=True they are saved too (partially computed ones with their
+    BFS frontier), so a restored run starts warm.
+
+    Args:
+        simulation: Simulation between steps.
+        path: Output file (np.savez adds .npz if missing).
+        dist_tables: Also save distance tables.
+    """
+    tasks = TaskTable()
+    data = simulation.checkpoint_state(tasks)
+    meta = data.pop('meta')
+    meta['version'] = CHECKPOINT_VERSION
+    data.update(tasks.to_arrays())
+
+    if dist_tables:
+        tables = list(simulation.dist_tables.values())
+        frontiers = [table.frontier for table in tables]
+        data['dist_goals'] = np.array([table.goal for table in tables], dtype=np.int64).reshape(-1, 2)
+        data['dist_frontier_offsets'] = np.cumsum([0] + [len(frontier) for frontier in frontiers])
+        data['dist_frontiers'] = np.array([c for frontier in frontiers for c in frontier], dtype=np.int64).reshape(-1, 2)
+        if tables:
+            data['dist_fields'] = np.stack([table._table for table in tables])
+
+    np.savez(path, meta=np.array(json.dumps(meta)), **data)
+
+
+def load_checkpoint(path: str, stream: Iterator[tuple[int, Task]] | None = None,
+                    dist_tables: DistTableMap | None = None, **sim_kwargs) -> PIBTMAPDSimulation:
+    """Restore a simulation saved by save_checkpoint.
+
+    Every call returns an independent simulation, so one checkpoint can be
+    forked into many experiment branches.
+
+    Args:
+        path: Checkpoint file.
+        stream: For streamed simulations, a stream producing the same items as
+            the original one (e.g. recreated with the same seeds); it is
+            fast-forwarded to where the checkpoint was taken.
+        dist_tables: Distance table storage for the restored simulation. Saved
+            tables are added to it; defaults to a new dict.
+        **sim_kwargs: Override simulation options saved in the checkpoint.
+
+    Returns:
+        Simulation continuing exactly where the checkpoint was taken.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        data = dict(data)
+    meta = json.loads(str(data['meta']))
+    if meta['version'] != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version {meta['version']}")
+
+    layout = Layout.from_cells(data['layout_cells'])
+    # Keep the saved cell order, which task generators and placements index into
+    layout.storage_cells = [(x, y) for x, y in data['storage_xy'].tolist()]
+    layout.output_cells = [(x, y) for x, y in data['output_xy'].tolist()]
+
+    tasks = TaskTable.from_arrays(data)
+    agents = [Agent(id=i, x=x, y=y) for i, (x, y) in enumerate(zip(data['x'].tolist(), data['y'].tolist()))]
+    pool_tasks = tasks.lookup(data['pool_tasks'])
+
+    if dist_tables is None:
+        dist_tables = {}
+    if 'dist_fields' in data:
+        offsets = data['dist_frontier_offsets'].tolist()
+        frontiers = [(x, y) for x, y in data['dist_frontiers'].tolist()]
+        for k, (goal, field) in enumerate(zip(data['dist_goals'].tolist(), data['dist_fields'])):
+            dist_tables[tuple(goal)] = DistTable(layout.grid, tuple(goal), table=field,
+                                                 queue=frontiers[offsets[k]:offsets[k + 1]])
+
+    kwargs = {**meta['config'], 'dist_tables': dist_tables, **sim_kwargs}
+    if isinstance(kwargs.get('guidance'), dict):
+        kwargs['guidance'] = TrafficGuidance(layout.grid, **kwargs['guidance'])
+    if meta['class'] == PIBTMAPDSimulationWithTaskStream.__name__:
+        if stream is None:
+            raise ValueError("Restoring a streamed simulation requires the stream")
+        simulation = PIBTMAPDSimulationWithTaskStream(layout, agents, stream, **kwargs)
+    elif meta['class'] == PIBTMAPDSimulationWithTaskReveal.__name__:
+        simulation = PIBTMAPDSimulationWithTaskReveal(layout, agents, pool_tasks, meta['reveal_interval'],
+                                                      verbose=meta['verbose'], **kwargs)
+    elif meta['class'] == PIBTMAPDSimulation.__name__:
+        simulation = PIBTMAPDSimulation(layout, agents, pool_tasks, **kwargs)
+    else:
+        raise ValueError(f"Unknown simulation class {meta['class']}")
+
+    simulation.restore_state(data, meta, tasks)
+    return simulation
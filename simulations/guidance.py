@@ -0,0 +1,224 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from models.coord import Coord
+from models.layout import Grid
+
+
+COST_SCALE = 16  # integer cost units per step, so fractional congestion penalties stay exact
+_BLOCKED = 1 << 40  # cost of entering an obstacle, larger than any real path
+_UNREACHED = 1 << 60
+
+
+def weighted_dist_fields(grid: Grid, goals: list[Coord], cost: np.ndarray,
+                         chunk_cells: int = 1 << 22) -> np.ndarray:
+    """Compute cost-to-go fields for several goals with vertex costs.
+
+    The distance of cell u is the minimum over paths to the goal of the summed
+    cost of every cell entered. Instead of a Dijkstra queue per goal, the
+    fields are relaxed with directional min-plus scans (fast sweeping): along
+    a row, going left from x to j costs E[x] - E[j] with E the exclusive
+    cumulative cost, so d[x] = E[x] + min_{j<=x}(d[j] - E[j]) is one
+    np.minimum.accumulate over all rows and goals at once. Sweeping left,
+    right, up and down until nothing changes converges after about as many
+    sweeps as optimal paths have turns; goals whose field stopped changing
+    drop out of the sweeps. Obstacles get a prohibitive entry
+    cost, so no separate masking is needed inside the scans.
+
+    Args:
+        grid: 2D boolean array representing the map.
+        goals: Goal positions (x, y).
+        cost: Integer cost of entering each cell, shape grid.shape.
+        chunk_cells: Upper bound on cells of the goals processed together.
+
+    Returns:
+        Array of shape (len(goals), height, width), float32 in steps
+        (cost / COST_SCALE), inf where unreachable.
+    """
+    height, width = grid.shape
+    cost = np.where(grid, cost, _BLOCKED).astype(np.int64)
+    fields = np.empty((len(goals), height, width), dtype=np.float32)
+    per_chunk = max(1, chunk_cells // grid.size)
+
+    # Exclusive (E) and inclusive (T) cumulative costs along rows and columns
+    row_incl = np.cumsum(cost, axis=1)
+    row_excl = row_incl - cost
+    col_incl = np.cumsum(cost, axis=0)
+    col_excl = col_incl - cost
+
+    for start in range(0, len(goals), per_chunk):
+        chunk = goals[start:start + per_chunk]
+        dist = np.full((len(chunk), height, width), _UNREACHED, dtype=np.int64)
+        for k, (gx, gy) in enumerate(chunk):
+            dist[k, gy, gx] = 0
+
+        # Sweep only the goals whose field still changed in the previous sweep
+        active = np.arange(len(chunk))
+        while active.size > 0:
+            before = dist[active]
+            d = np.minimum(before, row_excl + np.minimum.accumulate(before - row_excl, axis=2))
+            d = np.minimum(d, np.flip(np.minimum.accumulate(np.flip(d + row_incl, 2), axis=2), 2) - row_incl)
+            d = np.minimum(d, col_excl + np.minimum.accumulate(d - col_excl, axis=1))
+            d = np.minimum(d, np.flip(np.minimum.accumulate(np.flip(d + col_incl, 1), axis=1), 1) - col_incl)
+            dist[active] = d
+            active = active[(d != before).any(axis=(1, 2))]
+
+        chunk_fields = dist / COST_SCALE
+        chunk_fields[(dist >= _BLOCKED) | ~grid] = np.inf
+        fields[start:start + len(chunk)] = chunk_fields
+    return fields
+
+
+@dataclass
+class WeightedDistTable:
+    """Cost-to-go field of one goal, usable where PIBT reads a DistTable."""
+    goal: Coord
+    field: np.ndarray  # (height, width) float32, inf if unreachable
+
+    def get(self, target: Coord) -> float:
+        x, y = target
+        height, width = self.field.shape
+        if 0 <= x < width and 0 <= y < height:
+            return float(self.field[y, x])
+        return float('inf')
+
+
+class TrafficGuidance:
+    """Congestion-aware distance fields learned from recent traffic.
+
+    Every step the simulation reports the cells agents moved into and the
+    agents that waited away from their goal. Both counts decay exponentially,
+    so their rates approximate recent occupancy and waiting per cell. Every
+    interval steps the fields of the goals currently in use are rebuilt with
+    cell costs 1 + weight * (occupancy + waiting), in a background thread when
+    background is set. A rebuild started at one interval is swapped in at the
+    next, blocking if it is not finished yet, so runs stay deterministic.
+    Goals without a rebuilt field fall back to exact BFS tables; static_goals
+    (typically the outputs every delivery heads to) are always rebuilt.
+
+    The goals and costs behind the current and the pending fields are kept,
+    so a checkpoint can restore the same fields (see checkpoint_state).
+    """
+
+    def __init__(self, grid: Grid, interval: int = 20, weight: float = 2.0, decay: float = 0.98,
+                 background: bool = True, static_goals: list[Coord] = ()):
+        self.grid = grid
+        self.static_goals = [tuple(goal) for goal in static_goals]
+        self.interval = interval
+        self.weight = weight
+        self.decay = decay
+        self.visits = np.zeros(grid.size, dtype=np.float64)
+        self.waits = np.zeros(grid.size, dtype=np.float64)
+        self.rebuilds = 0
+        self._steps = 0
+        self._tables: dict[Coord, WeightedDistTable] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1) if background else None
+        self._pending: Future | None = None
+        self._built: tuple[list[Coord], np.ndarray] | None = None  # rebuild inputs of _tables
+        self._pending_args: tuple[list[Coord], np.ndarray] | None = None
+
+    def observe(self, Q_from: np.ndarray, Q_to: np.ndarray, at_goal: np.ndarray) -> None:
+        """Accumulate one step of traffic.
+
+        Args:
+            Q_from: Flat cell id of each agent before the step.
+            Q_to: Flat cell id of each agent after the step.
+            at_goal: Whether each agent stands on its goal after the step.
+        """
+        self.visits *= self.decay
+        self.waits *= self.decay
+        self.visits += np.bincount(Q_to, minlength=self.grid.size)
+        self.waits += np.bincount(Q_to[(Q_to == Q_from) & ~at_goal], minlength=self.grid.size)
+
+    def costs(self) -> np.ndarray:
+        """Integer cost of entering each cell, COST_SCALE per uncongested step."""
+        rate = (self.visits + self.waits) * (1 - self.decay)
+        return (COST_SCALE + np.rint(COST_SCALE * self.weight * rate)).astype(np.int64).reshape(self.grid.shape)
+
+    def update(self, goals: list[Coord]) -> bool:
+        """Advance one step and rebuild fields at interval boundaries.
+
+        Args:
+            goals: Current goal of every agent.
+
+        Returns:
+            True if new fields were swapped in this step.
+        """
+        self._steps += 1
+        if self._steps % self.interval != 0:
+            return False
+
+        swapped = False
+        if self._pending is not None:
+            self._tables = self._pending.result()
+            self._built = self._pending_args
+            self._pending = None
+            self._pending_args = None
+            swapped = True
+
+        args = (list(dict.fromkeys(self.static_goals + goals)), self.costs())
+        if self._executor is not None:
+            self._pending = self._executor.submit(self._rebuild, *args)
+            self._pending_args = args
+        else:
+            self._tables = self._rebuild(*args)
+            self._built = args
+            swapped = True
+        return swapped
+
+    def _rebuild(self, goals: list[Coord], cost: np.ndarray) -> dict[Coord, WeightedDistTable]:
+        fields = weighted_dist_fields(self.grid, goals, cost)
+        self.rebuilds += 1
+        return {goal: WeightedDistTable(goal, fields[k]) for k, goal in enumerate(goals)}
+
+    def table(self, goal: Coord) -> WeightedDistTable | None:
+        """Weighted table of a goal, None if the goal had no field at the last rebuild."""
+        return self._tables.get(goal)
+
+    def options(self) -> dict:
+        """Constructor arguments except the grid, JSON-able for checkpoints."""
+        return {
+            'interval': self.interval,
+            'weight': self.weight,
+            'decay': self.decay,
+            'background': self._executor is not None,
+            'static_goals': [list(goal) for goal in self.static_goals],
+        }
+
+    def checkpoint_state(self) -> dict[str, np.ndarray]:
+        """Traffic counts, step count and the rebuild inputs of the current and pending fields."""
+        data = {'visits': self.visits, 'waits': self.waits, 'steps': np.array(self._steps, dtype=np.int64)}
+        for name, args in (('built', self._built), ('pending', self._pending_args)):
+            goals, cost = args if args is not None else ([], np.empty(0, dtype=np.int64))
+            data[f'{name}_goals'] = np.array(goals, dtype=np.int64).reshape(-1, 2)
+            data[f'{name}_cost'] = cost
+        return data
+
+    def restore_state(self, data: dict[str, np.ndarray]) -> None:
+        """Overwrite the state with one saved by checkpoint_state, recomputing the saved fields."""
+        self.visits[:] = data['visits']
+        self.waits[:] = data['waits']
+        self._steps = int(data['steps'])
+        saved = {}
+        for name in ('built', 'pending'):
+            cost = data[f'{name}_cost']
+            goals = [(x, y) for x, y in data[f'{name}_goals'].tolist()]
+            saved[name] = (goals, cost) if cost.size > 0 else None
+
+        self._built = saved['built']
+        self._tables = self._rebuild(*self._built) if self._built is not None else {}
+        self._pending_args = saved['pending']
+        self._pending = None
+        if self._pending_args is not None:
+            if self._executor is not None:
+                self._pending = self._executor.submit(self._rebuild, *self._pending_args)
+            else:
+                self._pending = Future()
+                self._pending.set_result(self._rebuild(*self._pending_args))
+
+    def close(self) -> None:
+        """Stop the background thread."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
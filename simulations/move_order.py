@@ -0,0 +1,55 @@
+from collections import OrderedDict
+
+from models.coord import Coord
+from models.dist_table import DistTable
+
+
+class MoveOrderCache:
+    """Per-goal cache of PIBT candidate orderings.
+
+    For a goal and a cell, the candidates (the cell and its neighbors) are
+    stored pre-sorted by distance to the goal and grouped into runs of equal
+    distance. Distance only depends on (cell, goal), so at runtime only the
+    order inside a tie group (occupancy, then random) is left to resolve, and
+    cells without ties need no distance lookups or RNG calls at all. Goals are
+    evicted least recently used beyond max_goals.
+    """
+
+    def __init__(self, adjacency: list[list[int]], width: int, max_goals: int = 4096):
+        self.adjacency = adjacency
+        self.width = width
+        self.max_goals = max_goals
+        self._orders: OrderedDict[Coord, dict[int, tuple[tuple[int, ...], ...]]] = OrderedDict()
+
+    def groups(self, goal: Coord, v: int, table: DistTable) -> tuple[tuple[int, ...], ...]:
+        """Candidates of cell v grouped by equal distance to goal, nearest first.
+
+        Args:
+            goal: Goal position (x, y).
+            v: Current cell id.
+            table: Distance table of goal, used on a cache miss.
+
+        Returns:
+            Tuple of tie groups of cell ids.
+        """
+        orders = self._orders.get(goal)
+        if orders is None:
+            orders = {}
+            self._orders[goal] = orders
+            if len(self._orders) > self.max_goals:
+                self._orders.popitem(last=False)
+        else:
+            self._orders.move_to_end(goal)
+
+        cached = orders.get(v)
+        if cached is None:
+            width = self.width
+            by_dist: dict[int, list[int]] = {}
+            for u in [v] + self.adjacency[v]:
+                by_dist.setdefault(table.get((u % width, u // width)), []).append(u)
+            cached = tuple(tuple(by_dist[d]) for d in sorted(by_dist))
+            orders[v] = cached
+        return cached
+
+    def clear(self) -> None:
+        self._orders.clear()
@@ -5,9 +5,19 @@ import numpy as np
 from models.simulation import SimulationBase
 from models.task import Task
 from models.agent import Agent
+from models.agent_state import AgentState, AgentView
 from models.layout import Layout, Grid
 from models.coord import Coord
-from models.dist_table import DistTable, get_neighbors
+from models.dist_table import DistTable, DistTableMap
+from models.landmark_oracle import LandmarkOracle
+from models.neighbor_table import NeighborTable
+from models.task_pool import TaskPool
+from models.task_table import TaskTable
+from simulations.guidance import TrafficGuidance
+from simulations.move_order import MoveOrderCache
+from simulations.planner import LaCAMPlanner, PIBTPlanner, Planner
+from simulations.step_metrics import StepMetrics
+from simulations.task_assigner import TaskAssigner
 
 
 class PIBTMAPDSimulation(SimulationBase):
@@ -15,33 +25,89 @@ class PIBTMAPDSimulation(SimulationBase):
 
     This simulation uses PIBT for collision-free path planning while handling
     task assignment for pickup and delivery operations. Each step:
-    1. Assigns unassigned tasks to free agents (greedy by distance)
-    2. Plans one step using PIBT
+    1. Assigns unassigned tasks to free agents (greedy by distance, see TaskAssigner)
+    2. Plans one step using PIBT (or another Planner, see simulations.planner)
     3. Updates agent positions and task states
+
+    Agent state lives in struct-of-arrays form (self.state); self.agents holds
+    AgentView objects reading from it, so the Agent objects passed in are only
+    used for initialization.
     """
 
-    dist_tables: dict[Coord, DistTable]
+    state: AgentState
+    agents: list[AgentView]
+    dist_tables: DistTableMap
     occupied_now: np.ndarray
     occupied_nxt: np.ndarray
     NIL: int
-    NIL_COORD: Coord
+    NIL_CELL: int
+    neighbors: NeighborTable
+    move_order: MoveOrderCache | None
+    eager_dist_tables: bool
+    oracle: LandmarkOracle | None
+    guidance: TrafficGuidance | None
+    pibt: PIBTPlanner
+    planner: Planner
+    assigner: TaskAssigner
+    metrics: StepMetrics | None
     rng: random.Random
 
-    def __init__(self, layout: Layout, agents: list[Agent], tasks: list[Task], seed: int = 0):
+    def __init__(self, layout: Layout, agents: list[Agent], tasks: list[Task], seed: int = 0,
+                 dist_tables: DistTableMap | None = None,
+                 eager_dist_tables: bool = False, assign_top_k: int | None = None,
+                 cached_move_order: bool = False, metrics: StepMetrics | None = None,
+                 landmarks: int | None = None, guidance: TrafficGuidance | None = None,
+                 lacam_budget: float | None = None, lacam_window: int = 5):
         super().__init__(layout, agents, tasks)
 
         self.rng = random.Random(seed)
 
         # Sentinel values
         self.NIL = len(agents)
-        self.NIL_COORD = (layout.width, layout.height)  # Invalid coord
+        self.NIL_CELL = -1  # Invalid flat cell id
 
         # Occupation tracking
         self.occupied_now = np.full((layout.height, layout.width), self.NIL, dtype=int)
         self.occupied_nxt = np.full((layout.height, layout.width), self.NIL, dtype=int)
+        self._occupied_now_flat = self.occupied_now.reshape(-1)
+        self._occupied_nxt_flat = self.occupied_nxt.reshape(-1)
+
+        # Neighbor adjacency precomputed once (CSR), plus Python lists for the PIBT loop
+        self.neighbors = NeighborTable.from_grid(layout.grid)
+        self._adjacency = self.neighbors.to_lists()
+
+        # Optional per-goal candidate ordering cache (changes RNG usage, so off by default)
+        self.move_order = MoveOrderCache(self._adjacency, layout.width) if cached_move_order else None
+
+        # Distance table cache (lazily populated unless prebuilt tables are given)
+        self.dist_tables = dist_tables if dist_tables is not None else {}
+        self.eager_dist_tables = eager_dist_tables
+
+        # Optional landmark lower bounds for assignment distances; exact tables are then only
+        # built for goals agents actually head to, bound their memory with a DistTableStore
+        self.oracle = LandmarkOracle(layout.grid, landmarks) if landmarks else None
+
+        # Optional congestion-weighted fields replacing BFS distances in PIBT candidate ordering
+        self.guidance = guidance
+
+        # Cells closed or opened between steps (e.g. a blocked aisle) are repaired incrementally,
+        # until close() detaches the simulation from the layout
+        layout.listeners.append(self._on_layout_changed)
 
-        # Distance table cache (lazily populated)
-        self.dist_tables = {}
+        # Spatial index of pending tasks for nearest-task assignment
+        self.assigner = TaskAssigner(layout.width, layout.height, top_k=assign_top_k)
+
+        # Optional instrumentation (see StepMetrics) and the counters it reads
+        self.metrics = metrics
+        self._dist_lookups = 0
+        self._dist_misses = 0
+
+        # One-step planner: PIBT, or a configuration search that falls back to it
+        self.pibt = PIBTPlanner(self._occupied_now_flat, self._occupied_nxt_flat, self.NIL, self._sorted_candidates)
+        self.planner = self.pibt
+        if lacam_budget is not None:
+            self.planner = LaCAMPlanner(self.pibt, self._adjacency, self._cell_dist, self.rng,
+                                        time_budget=lacam_budget, window=lacam_window)
 
         # Initialize agents for PIBT
         for agent in agents:
@@ -53,91 +119,114 @@ class PIBTMAPDSimulation(SimulationBase):
             agent.target_task = None
             self.occupied_now[agent.y, agent.x] = agent.id
 
+        self.state = AgentState(agents)
+        self.agents = self.state.views()
+
     @property
     def grid(self) -> Grid:
         """Get the grid from layout."""
         return self.layout.grid
 
+    def _on_layout_changed(self, changed: list[Coord]) -> None:
+        """Update adjacency, repair distance tables and rebuild landmarks after cells changed traversability.
+
+        Called by Layout.fill between steps. Agents standing on a closed cell
+        leave it as soon as a neighbor is free; no agent enters it.
+        """
+        self.neighbors = NeighborTable.from_grid(self.grid)
+        width, height = self.layout.width, self.layout.height
+        for x, y in changed:
+            for nx, ny in ((x, y), (x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+                if 0 <= nx < width and 0 <= ny < height:
+                    c = ny * width + nx
+                    self._adjacency[c] = self.neighbors.get(c).tolist()
+        if self.move_order is not None:
+            self.move_order.clear()
+        if self.oracle is not None:
+            self.oracle = LandmarkOracle(self.grid, self.oracle.num_landmarks, self.oracle.seed)
+
+        repair = getattr(self.dist_tables, 'repair', None)
+        if repair is not None:
+            repair(changed)
+        else:
+            for table in self.dist_tables.values():
+                table.repair(changed)
+
+    def close(self) -> None:
+        """Detach from the layout, so it no longer keeps this simulation alive or repairs its tables.
+
+        Also stops the guidance's background thread. The simulation's state
+        stays readable afterwards.
+        """
+        if self._on_layout_changed in self.layout.listeners:
+            self.layout.listeners.remove(self._on_layout_changed)
+        if self.guidance is not None:
+            self.guidance.close()
+
     def _get_dist_table(self, goal: Coord) -> DistTable:
         """Get or create distance table for a goal position."""
-        if goal not in self.dist_tables:
-            self.dist_tables[goal] = DistTable(self.grid, goal)
-        return self.dist_tables[goal]
+        self._dist_lookups += 1
+        table = self.dist_tables.get(goal)
+        if table is None:
+            self._dist_misses += 1
+            table = DistTable(self.grid, goal, eager=self.eager_dist_tables)
+            self.dist_tables[goal] = table
+        return table
+
+    def _cell_dist(self, v: int, goal: Coord) -> int:
+        """Shortest path distance from flat cell v to goal."""
+        width = self.layout.width
+        return self._get_dist_table(goal).get((v % width, v // width))
 
     def _path_dist(self, start: Coord, goal: Coord) -> int:
-        """Get shortest path distance from start to goal."""
+        """Get shortest path distance from start to goal (a lower bound with landmarks)."""
+        if self.oracle is not None:
+            return self.oracle.estimate(start, goal)
         return self._get_dist_table(goal).get(start)
 
-    def _get_neighbors(self, coord: Coord) -> list[Coord]:
-        """Get valid neighboring coordinates (4-connected grid)."""
-        return get_neighbors(self.grid, coord)
-
-    def _assign_task(self, agent: Agent, task: Task) -> None:
-        """Assign a task to an agent (agent has reached pickup location)."""
+    def _assign_task(self, i: int, task: Task) -> None:
+        """Assign a task to agent i (agent has reached pickup location)."""
         assert task.delivery_x is not None and task.delivery_y is not None, \
             "MAPD tasks must have delivery coordinates"
-        agent.task = task
-        agent.target_task = None
-        task.status = Task.STATUS_DELIVERING
+        self.state.set_task(i, task)
+        self.state.target_task[i] = None
+        self.task_pool.set_status(task, Task.STATUS_DELIVERING, i)
         # Update goal to delivery location
-        agent.goal_x = task.delivery_x
-        agent.goal_y = task.delivery_y
-
-    def _func_pibt(self, Q_from: list[Coord], Q_to: list[Coord], i: int) -> bool:
-        """Core PIBT function for single agent planning with priority inheritance.
+        self.state.goal_x[i] = task.delivery_x
+        self.state.goal_y[i] = task.delivery_y
 
-        Args:
-            Q_from: Current configuration (positions at current timestep).
-            Q_to: Next configuration being constructed (modified in-place).
-            i: Agent index to plan for.
+    def _sorted_candidates(self, v: int, goal: Coord) -> list[int]:
+        """Candidate next cells of an agent at cell v, best first.
 
-        Returns:
-            True if successfully assigned a position to agent i, False otherwise.
+        Candidates are the current cell and its neighbors, ordered by distance
+        to goal, then unoccupied first, then randomly. With cached_move_order
+        the distance order is taken from MoveOrderCache.
         """
-        agent = self.agents[i]
-        goal: Coord = (agent.goal_x, agent.goal_y)
-
-        # Compare function for sorting candidates
-        def compare_key(v: Coord) -> tuple[int, int, float]:
-            d = self._path_dist(v, goal)
+        occupied_now = self._occupied_now_flat
+        width = self.layout.width
+        table = self.guidance.table(goal) if self.guidance is not None else None
+        if table is None:
+            table = self._get_dist_table(goal)
+
+        def compare_key(u: int) -> tuple[int, int, float]:
+            d = table.get((u % width, u // width))
             # Prefer unoccupied cells (occupied_now check)
-            vx, vy = v
-            occupied = 0 if self.occupied_now[vy, vx] == self.NIL else 1
+            occupied = 0 if occupied_now[u] == self.NIL else 1
             return (d, occupied, self.rng.random())
 
-        # Get candidates: current position + neighbors
-        C = [Q_from[i]] + self._get_neighbors(Q_from[i])
+        if self.move_order is not None:
+            # Distance order comes from the cache, only ties are resolved here
+            C = []
+            for group in self.move_order.groups(goal, v, table):
+                if len(group) == 1:
+                    C.append(group[0])
+                else:
+                    C.extend(sorted(group, key=lambda u: (occupied_now[u] != self.NIL, self.rng.random())))
+            return C
+
+        C = [v] + self._adjacency[v]
         self.rng.shuffle(C)
-        C = sorted(C, key=compare_key)
-
-        for v in C:
-            vx, vy = v
-            # Avoid vertex collision
-            if self.occupied_nxt[vy, vx] != self.NIL:
-                continue
-
-            j = self.occupied_now[vy, vx]
-
-            # Avoid edge collision (swap)
-            if j != self.NIL and j != i and Q_to[j] == Q_from[i]:
-                continue
-
-            # Reserve next location
-            Q_to[i] = v
-            self.occupied_nxt[vy, vx] = i
-
-            # Priority inheritance
-            if j != self.NIL and j != i and Q_to[j] == self.NIL_COORD:
-                if not self._func_pibt(Q_from, Q_to, j):
-                    continue
-
-            return True
-
-        # Failed to secure node - stay in place
-        Q_to[i] = Q_from[i]
-        fx, fy = Q_from[i]
-        self.occupied_nxt[fy, fx] = i
-        return False
+        return sorted(C, key=compare_key)
 
     def step(self) -> list[Coord] | None:
         """Perform one simulation step.
@@ -145,113 +234,212 @@ class PIBTMAPDSimulation(SimulationBase):
         Returns:
             List of (x, y) positions for each agent after this step.
         """
-        # 1. Task assignment phase
-        # Get tasks that are already being targeted by other agents
-        targeted_tasks = [a.target_task for a in self.agents if a.target_task is not None]
-        unassigned_tasks = [t for t in self.tasks if t.status == Task.STATUS_PENDING and t not in targeted_tasks]
-        self.rng.shuffle(unassigned_tasks)
+        if self.metrics is not None:
+            return self._measured_step(self.metrics)
+        self._assignment_phase()
+        Q_to = self._planning_phase()
+        return self._acting_phase(Q_to)
+
+    def _measured_step(self, metrics: StepMetrics) -> list[Coord] | None:
+        """step() with phase timers and counters recorded into metrics."""
+        expansions = DistTable.expansions_total
+        lookups, misses = self._dist_lookups, self._dist_misses
+
+        metrics.begin_step()
+        with metrics.phase('assignment'):
+            self._assignment_phase()
+        with metrics.phase('planning'):
+            Q_to = self._planning_phase()
+        with metrics.phase('acting'):
+            positions = self._acting_phase(Q_to)
+
+        metrics.count('bfs_expansions', DistTable.expansions_total - expansions)
+        metrics.count('dist_table_hits', (self._dist_lookups - lookups) - (self._dist_misses - misses))
+        metrics.count('dist_table_misses', self._dist_misses - misses)
+        metrics.count('pibt_inheritances', self.pibt.inheritances)
+        metrics.count('pibt_max_chain', self.pibt.max_chain)
+        metrics.end_step()
+        return positions
 
-        for agent in self.agents:
-            # Agent already has an assigned task (delivering)
-            if agent.task is not None:
-                continue
+    def _assignment_phase(self) -> None:
+        """Assign pending tasks to free agents (greedy nearest pickup)."""
+        # Pending tasks not targeted by other agents (indexed by the task pool)
+        unassigned_tasks = self.task_pool.available()
+        self.rng.shuffle(unassigned_tasks)
+        indexed = False
+        state = self.state
 
+        for i in np.flatnonzero(~state.has_task).tolist():
             # Agent already targeting a task that's still pending - keep targeting it
-            if agent.target_task is not None and agent.target_task.status == Task.STATUS_PENDING:
+            target = state.target_task[i]
+            if target is not None and target.status == Task.STATUS_PENDING:
                 continue
 
             # Free agent - find closest pickup location
-            agent.target_task = None
-            agent.goal_x = agent.x
-            agent.goal_y = agent.y
-            min_dist = self.grid.size
-            best_task = None
-
-            for task in unassigned_tasks:
-                pickup_pos: Coord = (task.x, task.y)
-                agent_pos: Coord = (agent.x, agent.y)
-                d = self._path_dist(agent_pos, pickup_pos)
-
-                if d == 0:
-                    # Agent is at pickup location - assign immediately
-                    self._assign_task(agent, task)
-                    unassigned_tasks.remove(task)
-                    best_task = None
-                    break
-
-                if d < min_dist:
-                    min_dist = d
-                    best_task = task
-
-            # Target the best task found (and remove from available pool)
-            if best_task is not None:
-                agent.goal_x = best_task.x
-                agent.goal_y = best_task.y
-                agent.target_task = best_task
-                unassigned_tasks.remove(best_task)
-
-        # 2. Planning phase using PIBT
+            state.target_task[i] = None
+            state.goal_x[i] = state.x[i]
+            state.goal_y[i] = state.y[i]
+
+            if not indexed:
+                self.assigner.reset(unassigned_tasks)
+                indexed = True
+            pos: Coord = (int(state.x[i]), int(state.y[i]))
+            best_task, d = self.assigner.nearest(pos, self._path_dist)
+            if best_task is None:
+                continue
+            self.assigner.remove(best_task)
+
+            if d == 0:
+                # Agent is at pickup location - assign immediately
+                self._assign_task(i, best_task)
+            else:
+                # Target the best task found (and remove from available pool)
+                state.goal_x[i] = best_task.x
+                state.goal_y[i] = best_task.y
+                state.target_task[i] = best_task
+                self.task_pool.target(best_task, i)
+
+    def _planning_phase(self) -> list[int]:
+        """Plan the next cell of every agent with the planner (PIBT by default).
+
+        Returns:
+            Next flat cell id of each agent.
+        """
+        state = self.state
+
         # Sort agents by priority
-        def priority_key(a: Agent) -> tuple[int, int, float]:
-            has_task = 0 if a.task is not None else 1  # agents with tasks first
-            return (has_task, -a.elapsed, -a.tie_breaker)
-
-        sorted_agents = sorted(self.agents, key=priority_key)
-
-        # Setup configurations
-        Q_from: list[Coord] = [(a.x, a.y) for a in self.agents]
-        Q_to: list[Coord] = [self.NIL_COORD] * len(self.agents)
-
-        # Setup occupied_now
-        for i, (x, y) in enumerate(Q_from):
-            self.occupied_now[y, x] = i
-
-        # Run PIBT for each agent in priority order
-        for agent in sorted_agents:
-            if Q_to[agent.id] == self.NIL_COORD:
-                self._func_pibt(Q_from, Q_to, agent.id)
-
-        # 3. Acting phase - update positions and states
-        positions: list[Coord] = []
-
-        for agent in self.agents:
-            v_now: Coord = (agent.x, agent.y)
-            v_next: Coord = Q_to[agent.id]
-            nx, ny = v_next
-
-            # Clear occupation
-            ox, oy = v_now
-            if self.occupied_now[oy, ox] == agent.id:
-                self.occupied_now[oy, ox] = self.NIL
-            self.occupied_nxt[ny, nx] = self.NIL
-
-            # Update position
-            self.occupied_now[ny, nx] = agent.id
-
-            # Update priority
-            goal: Coord = (agent.goal_x, agent.goal_y)
-            agent.elapsed = 0 if v_next == goal else agent.elapsed + 1
-
-            # Update agent position
-            agent.x, agent.y = v_next
-            positions.append(v_next)
-
-            # Update task info
-            if agent.task is not None:
-                # Check if delivery is complete (delivery coords guaranteed by _assign_task)
-                assert agent.task.delivery_x is not None and agent.task.delivery_y is not None
-                delivery_pos: Coord = (agent.task.delivery_x, agent.task.delivery_y)
-                if v_next == delivery_pos:
-                    agent.task.status = Task.STATUS_COMPLETED
-                    agent.task = None
-            elif agent.target_task is not None:
+        sorted_ids = state.priority_order().tolist()
+
+        # Setup configurations (flat cell ids)
+        width = self.layout.width
+        Q_from: list[int] = (state.y * width + state.x).tolist()
+        goals: list[Coord] = list(zip(state.goal_x.tolist(), state.goal_y.tolist()))
+
+        if self.guidance is not None and self.guidance.update(goals) and self.move_order is not None:
+            self.move_order.clear()
+
+        return self.planner.plan(Q_from, goals, sorted_ids)
+
+    def _acting_phase(self, Q_to: list[int]) -> list[Coord]:
+        """Move agents to their planned cells and update task states.
+
+        Returns:
+            List of (x, y) positions for each agent after this step.
+        """
+        state = self.state
+        width = self.layout.width
+        ids = np.arange(len(state))
+
+        # Update positions and states (vectorized over agents)
+        nxt = np.array(Q_to, dtype=np.int64)
+        nx, ny = nxt % width, nxt // width
+        if self.guidance is not None:
+            prev = state.y * width + state.x
+
+        # Clear occupation, then occupy new positions
+        self.occupied_now[state.y, state.x] = self.NIL
+        self.occupied_nxt[ny, nx] = self.NIL
+        self.occupied_now[ny, nx] = ids
+
+        # Update priority
+        at_goal = (nx == state.goal_x) & (ny == state.goal_y)
+        state.elapsed += 1
+        state.elapsed[at_goal] = 0
+
+        # Update agent positions
+        state.x[:] = nx
+        state.y[:] = ny
+        if self.guidance is not None:
+            self.guidance.observe(prev, nxt, at_goal)
+
+        # Update task info - only agents standing on their goal can change task state
+        for i in np.flatnonzero(at_goal).tolist():
+            task = state.task[i]
+            if task is not None:
+                # Goal of an agent with a task is its delivery location
+                self.task_pool.set_status(task, Task.STATUS_COMPLETED, i)
+                state.set_task(i, None)
+            else:
+                target = state.target_task[i]
                 # Free agent reached pickup location
-                pickup_pos: Coord = (agent.target_task.x, agent.target_task.y)
-                if v_next == pickup_pos and agent.target_task.status == Task.STATUS_PENDING:
-                    self._assign_task(agent, agent.target_task)
+                if target is not None and target.status == Task.STATUS_PENDING:
+                    self._assign_task(i, target)
 
-        return positions
+        return list(zip(nx.tolist(), ny.tolist()))
+
+    def checkpoint_state(self, tasks: TaskTable) -> dict:
+        """Complete simulation state as arrays plus a JSON-able 'meta' dict.
+
+        Task references are stored as indices into `tasks`. Subclasses extend
+        the result with their own state (see simulations.checkpoint).
+        """
+        state = self.state
+        pool = self.task_pool
+        rng_version, rng_internal, rng_gauss = self.rng.getstate()
+        meta = {
+            'class': type(self).__name__,
+            'config': {
+                'eager_dist_tables': self.eager_dist_tables,
+                'assign_top_k': self.assigner.top_k,
+                'cached_move_order': self.move_order is not None,
+                'landmarks': self.oracle.num_landmarks if self.oracle is not None else None,
+                'guidance': self.guidance.options() if self.guidance is not None else None,
+                'lacam_budget': self.planner.time_budget if isinstance(self.planner, LaCAMPlanner) else None,
+                'lacam_window': self.planner.window if isinstance(self.planner, LaCAMPlanner) else 5,
+            },
+            'rng_version': rng_version,
+            'rng_gauss': rng_gauss,
+            'task_counts': [pool.count(status) for status in TaskPool.STATUSES],
+            'task_total': len(pool),
+            'retain_completed': pool.retain_completed,
+        }
+        arrays = {
+            'layout_cells': self.layout.cells,
+            'storage_xy': self.layout.storage_xy,
+            'output_xy': self.layout.output_xy,
+            'x': state.x, 'y': state.y,
+            'goal_x': state.goal_x, 'goal_y': state.goal_y,
+            'elapsed': state.elapsed,
+            'tie_breaker': state.tie_breaker,
+            'agent_task': tasks.indices(state.task),
+            'agent_target_task': tasks.indices(state.target_task),
+            'occupied_now': self.occupied_now,
+            'occupied_nxt': self.occupied_nxt,
+            'rng_internal': np.array(rng_internal, dtype=np.int64),
+            'pool_tasks': tasks.indices(pool.tasks),
+        }
+        for name, bucket in pool.buckets().items():
+            arrays[f'pool_{name}'] = tasks.indices(bucket)
+        if self.guidance is not None:
+            for name, array in self.guidance.checkpoint_state().items():
+                arrays[f'guidance_{name}'] = array
+        return {'meta': meta, **arrays}
+
+    def restore_state(self, data, meta: dict, tasks: TaskTable) -> None:
+        """Overwrite the state with one saved by checkpoint_state."""
+        state = self.state
+        for name in ('x', 'y', 'goal_x', 'goal_y', 'elapsed', 'tie_breaker'):
+            getattr(state, name)[:] = data[name]
+        state.task[:] = tasks.lookup(data['agent_task'])
+        state.target_task[:] = tasks.lookup(data['agent_target_task'])
+        state.has_task[:] = data['agent_task'] >= 0
+        self.occupied_now[:] = data['occupied_now']
+        self.occupied_nxt[:] = data['occupied_nxt']
+
+        self.rng.setstate((meta['rng_version'], tuple(data['rng_internal'].tolist()), meta['rng_gauss']))
+
+        pool = TaskPool(tasks.lookup(data['pool_tasks']), retain_completed=meta['retain_completed'])
+        buckets = {name: tasks.lookup(data[f'pool_{name}'])
+                   for name in ('reveal_order', 'available', 'targeted', 'delivering')}
+        pool.restore_buckets(buckets, dict(zip(TaskPool.STATUSES, meta['task_counts'])), meta['task_total'])
+        self.task_pool = pool
+        self.tasks = pool.tasks
+
+        if self.guidance is not None and 'guidance_visits' in data:
+            prefix = 'guidance_'
+            self.guidance.restore_state({name[len(prefix):]: array for name, array in data.items()
+                                         if name.startswith(prefix)})
 
     def is_complete(self) -> bool:
         """Check if all tasks are completed."""
-        return all(t.status == Task.STATUS_COMPLETED for t in self.tasks)
+        return self.task_pool.is_complete()
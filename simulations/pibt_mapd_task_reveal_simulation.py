@@ -0,0 +1,38 @@
+from models.layout import Layout
+from models.agent import Agent
+from models.task import Task
+from models.task_table import TaskTable
+from simulations.pibt_mapd_simulation import PIBTMAPDSimulation
+
+
+class PIBTMAPDSimulationWithTaskReveal(PIBTMAPDSimulation):
+    """Extended PIBT MAPD simulation that reveals tasks over time."""
+
+    def __init__(self, layout: Layout, agents: list[Agent], tasks: list[Task],
+                 reveal_interval: int = 10, seed: int = 0, verbose: bool = False, **kwargs):
+        super().__init__(layout, agents, tasks, seed, **kwargs)
+        self.reveal_interval = reveal_interval
+        self.verbose = verbose
+        self.timestep = 0
+
+    def step(self) -> list[tuple[int, int]] | None:
+        """Perform one simulation step, revealing tasks at intervals."""
+        # Reveal tasks at intervals
+        if self.timestep % self.reveal_interval == 0:
+            task = self.task_pool.reveal_next()  # Reveal one task per interval
+            if task is not None and self.verbose:
+                print(f"Task revealed: pickup=({task.x}, {task.y}) -> delivery=({task.delivery_x}, {task.delivery_y})")
+
+        self.timestep += 1
+
+        # Perform normal PIBT step
+        return super().step()
+
+    def checkpoint_state(self, tasks: TaskTable) -> dict:
+        data = super().checkpoint_state(tasks)
+        data['meta'].update(reveal_interval=self.reveal_interval, verbose=self.verbose, timestep=self.timestep)
+        return data
+
+    def restore_state(self, data, meta: dict, tasks: TaskTable) -> None:
+        super().restore_state(data, meta, tasks)
+        self.timestep = meta['timestep']
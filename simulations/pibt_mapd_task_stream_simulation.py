@@ -0,0 +1,101 @@
+import heapq
+from typing import Iterator
+
+import numpy as np
+
+from models.layout import Layout
+from models.agent import Agent
+from models.task import Task
+from models.task_pool import TaskPool
+from models.task_table import TaskTable
+from simulations.pibt_mapd_simulation import PIBTMAPDSimulation
+
+
+class PIBTMAPDSimulationWithTaskStream(PIBTMAPDSimulation):
+    """PIBT MAPD simulation pulling tasks lazily from a stream of arrivals.
+
+    The stream (see generators.task_stream.stream_tasks) yields (arrival
+    timestep, task) pairs in nondecreasing time. It is consumed only up to the
+    current timestep; arrived tasks go through a heap keyed by arrival time,
+    which also accepts tasks scheduled explicitly with schedule(). Completed
+    tasks are dropped by default, so memory is bounded by tasks in flight.
+    """
+
+    def __init__(self, layout: Layout, agents: list[Agent], stream: Iterator[tuple[int, Task]],
+                 seed: int = 0, retain_completed: bool = False, **kwargs):
+        super().__init__(layout, agents, [], seed, **kwargs)
+        self.task_pool = TaskPool(retain_completed=retain_completed)
+        self.stream = stream
+        self.timestep = 0
+        self._arrivals: list[tuple[int, int, Task]] = []  # heap of (timestep, seq, task)
+        self._next_seq = 0
+        self._lookahead: tuple[int, Task] | None = None
+        self._stream_done = False
+        self.stream_consumed = 0  # items taken from the stream
+
+    def schedule(self, task: Task, timestep: int) -> None:
+        """Schedule a task to arrive at the given timestep."""
+        heapq.heappush(self._arrivals, (timestep, self._next_seq, task))
+        self._next_seq += 1
+
+    def _pull_stream(self) -> None:
+        """Move stream items arriving up to the current timestep to the heap."""
+        while not self._stream_done:
+            if self._lookahead is None:
+                self._lookahead = next(self.stream, None)
+                if self._lookahead is None:
+                    self._stream_done = True
+                    break
+                self.stream_consumed += 1
+            timestep, task = self._lookahead
+            if timestep > self.timestep:
+                break
+            self.schedule(task, timestep)
+            self._lookahead = None
+
+    def step(self) -> list[tuple[int, int]] | None:
+        """Perform one simulation step after adding the tasks arrived so far."""
+        self._pull_stream()
+        while self._arrivals and self._arrivals[0][0] <= self.timestep:
+            _, _, task = heapq.heappop(self._arrivals)
+            task.status = Task.STATUS_PENDING
+            self.task_pool.add(task)
+
+        self.timestep += 1
+
+        return super().step()
+
+    def is_complete(self) -> bool:
+        """Check if the stream is exhausted and all arrived tasks are completed."""
+        return (self._stream_done and self._lookahead is None and not self._arrivals
+                and self.task_pool.is_complete())
+
+    def checkpoint_state(self, tasks: TaskTable) -> dict:
+        """Extends the base state with the arrival heap and the stream position.
+
+        The stream itself is not saved; restoring requires a stream producing
+        the same items, which is fast-forwarded past stream_consumed items.
+        """
+        data = super().checkpoint_state(tasks)
+        data['meta'].update(timestep=self.timestep, next_seq=self._next_seq, stream_done=self._stream_done,
+                            stream_consumed=self.stream_consumed,
+                            lookahead_timestep=self._lookahead[0] if self._lookahead is not None else None)
+        data['arrival_timestep'] = np.array([t for t, _, _ in self._arrivals], dtype=np.int64)
+        data['arrival_seq'] = np.array([seq for _, seq, _ in self._arrivals], dtype=np.int64)
+        data['arrival_task'] = tasks.indices([task for _, _, task in self._arrivals])
+        data['lookahead_task'] = tasks.indices([self._lookahead[1]] if self._lookahead is not None else [])
+        return data
+
+    def restore_state(self, data, meta: dict, tasks: TaskTable) -> None:
+        super().restore_state(data, meta, tasks)
+        self.timestep = meta['timestep']
+        self._next_seq = meta['next_seq']
+        self._stream_done = meta['stream_done']
+        # Heap order is kept as saved, it is a valid heap
+        self._arrivals = list(zip(data['arrival_timestep'].tolist(), data['arrival_seq'].tolist(),
+                                  tasks.lookup(data['arrival_task'])))
+        lookahead = tasks.lookup(data['lookahead_task'])
+        self._lookahead = (meta['lookahead_timestep'], lookahead[0]) if lookahead else None
+        for _ in range(meta['stream_consumed'] - self.stream_consumed):
+            next(self.stream)
+        self.stream_consumed = meta['stream_consumed']
@@ -0,0 +1,271 @@
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Protocol
+
+import numpy as np
+
+from models.coord import Coord
+
+
+NIL_CELL = -1  # Invalid flat cell id
+
+
+class Planner(Protocol):
+    """One-step planner of a PIBT MAPD simulation.
+
+    Cells are flat ids y * width + x. Agents are indexed like the
+    configuration lists.
+    """
+
+    def plan(self, Q_from: list[int], goals: list[Coord], order: list[int]) -> list[int]:
+        """Compute the next configuration.
+
+        Args:
+            Q_from: Current cell of every agent.
+            goals: Goal of every agent.
+            order: Agents by decreasing priority.
+
+        Returns:
+            Collision-free next cell of every agent.
+        """
+        ...
+
+
+class PIBTPlanner:
+    """Priority Inheritance with Backtracking (PIBT).
+
+    occupied_now and occupied_nxt are flat per-cell agent indices (nil for
+    free) owned by the simulation, which also supplies the candidate ordering
+    of an agent (its cell and neighbors, best first). inheritances and
+    max_chain count priority inheritance of the last plan for instrumentation.
+    """
+
+    def __init__(self, occupied_now: np.ndarray, occupied_nxt: np.ndarray, nil: int,
+                 candidates: Callable[[int, Coord], list[int]]):
+        self.occupied_now = occupied_now
+        self.occupied_nxt = occupied_nxt
+        self.NIL = nil
+        self.candidates = candidates
+        self.inheritances = 0
+        self.max_chain = 0
+
+    def plan(self, Q_from: list[int], goals: list[Coord], order: list[int]) -> list[int]:
+        """Run PIBT for every agent in priority order.
+
+        occupied_nxt is left holding the plan, the simulation clears it when
+        moving the agents.
+        """
+        self.inheritances = 0
+        self.max_chain = 0
+        Q_to, _ = self._run(Q_from, goals, order, ())
+        return Q_to
+
+    def configuration(self, Q_from: list[int], goals: list[Coord], order: list[int],
+                      constraints: tuple[tuple[int, int], ...]) -> list[int] | None:
+        """Next configuration with some agents' next cells fixed, for configuration search.
+
+        The occupation arrays are restored afterwards, so they must be clear
+        of Q_from before the call.
+
+        Args:
+            Q_from: Current cell of every agent.
+            goals: Goal of every agent.
+            order: Agents by decreasing priority.
+            constraints: (agent, next cell) pairs planned before PIBT runs.
+
+        Returns:
+            Next cell of every agent, or None if PIBT cannot satisfy the constraints.
+        """
+        Q_to, ok = self._run(Q_from, goals, order, constraints)
+        self.occupied_now[Q_from] = self.NIL
+        self.occupied_nxt[[v for v in Q_to if v != NIL_CELL]] = self.NIL
+        return Q_to if ok else None
+
+    def _run(self, Q_from: list[int], goals: list[Coord], order: list[int],
+             constraints: tuple[tuple[int, int], ...]) -> tuple[list[int], bool]:
+        occupied_now = self.occupied_now
+        occupied_nxt = self.occupied_nxt
+        NIL = self.NIL
+        Q_to = [NIL_CELL] * len(Q_from)
+        occupied_now[Q_from] = np.arange(len(Q_from))
+
+        for k, v in constraints:
+            j = int(occupied_now[v])
+            if occupied_nxt[v] != NIL or (j != NIL and j != k and Q_to[j] == Q_from[k]):
+                return Q_to, False
+            Q_to[k] = v
+            occupied_nxt[v] = k
+
+        ok = True
+        for i in order:
+            if Q_to[i] == NIL_CELL and not self.func_pibt(Q_from, Q_to, goals, i):
+                ok = False
+                if constraints:
+                    break
+        return Q_to, ok
+
+    def func_pibt(self, Q_from: list[int], Q_to: list[int], goals: list[Coord], i: int) -> bool:
+        """Core PIBT function for single agent planning with priority inheritance.
+
+        Priority inheritance runs on an explicit stack instead of recursion, so
+        long inheritance chains cannot hit the recursion limit. Each frame holds
+        an agent, its sorted candidates and the index of the next candidate to
+        try. A child that secures a cell makes the whole chain succeed; a child
+        that fails makes its parent try its next candidate.
+
+        Args:
+            Q_from: Current configuration (cell ids at current timestep).
+            Q_to: Next configuration being constructed (modified in-place).
+            goals: Goal of each agent.
+            i: Agent index to plan for.
+
+        Returns:
+            True if successfully assigned a position to agent i, False otherwise.
+        """
+        occupied_now = self.occupied_now
+        occupied_nxt = self.occupied_nxt
+        NIL = self.NIL
+
+        stack: list[list] = [[i, self.candidates(Q_from[i], goals[i]), 0]]
+        while stack:
+            frame = stack[-1]
+            k, C = frame[0], frame[1]
+
+            while frame[2] < len(C):
+                v = C[frame[2]]
+                frame[2] += 1
+
+                # Avoid vertex collision
+                if occupied_nxt[v] != NIL:
+                    continue
+
+                j = int(occupied_now[v])
+
+                # Avoid edge collision (swap)
+                if j != NIL and j != k and Q_to[j] == Q_from[k]:
+                    continue
+
+                # Reserve next location
+                Q_to[k] = v
+                occupied_nxt[v] = k
+
+                # Priority inheritance
+                if j != NIL and j != k and Q_to[j] == NIL_CELL:
+                    stack.append([j, self.candidates(Q_from[j], goals[j]), 0])
+                    self.inheritances += 1
+                    if len(stack) > self.max_chain:
+                        self.max_chain = len(stack)
+                    break
+
+                return True
+            else:
+                # Failed to secure node - stay in place, parent tries its next candidate
+                Q_to[k] = Q_from[k]
+                occupied_nxt[Q_from[k]] = k
+                stack.pop()
+
+        return False
+
+
+@dataclass
+class _Node:
+    """High-level search node: a configuration and its pending successor constraints."""
+    Q: tuple[int, ...]
+    parent: '_Node | None'
+    depth: int
+    cost: int  # summed distance of agents to their goals
+    order: list[int]
+    # Low-level search tree of (agent, next cell) constraints, breadth first
+    constraints: deque[tuple[tuple[int, int], ...]] = field(default_factory=lambda: deque([()]))
+
+
+class LaCAMPlanner:
+    """Windowed configuration search (LaCAM-style) with a PIBT fallback.
+
+    From the current configuration, a depth-first search over configurations
+    generates successors with PIBT under growing sets of constraints (LaCAM's
+    lazy low-level search: each revisit of a node fixes the next cell of one
+    more agent), and skips configurations seen before. The first successor of
+    every node is plain PIBT, so the search follows PIBT until it repeats
+    itself. It stops at a configuration window steps ahead with a smaller
+    summed distance to the goals than now, or with every agent at its goal,
+    and the first step towards it is returned. If the budget runs out or the
+    search space is exhausted first, the step is planned by plain PIBT.
+
+    Attributes:
+        searches: Steps planned by the search.
+        fallbacks: Steps planned by the PIBT fallback.
+    """
+
+    def __init__(self, pibt: PIBTPlanner, adjacency: list[list[int]], dist: Callable[[int, Coord], int],
+                 rng: random.Random, time_budget: float = 0.01, window: int = 5):
+        self.pibt = pibt
+        self.adjacency = adjacency
+        self.dist = dist
+        self.rng = rng
+        self.time_budget = time_budget
+        self.window = window
+        self.searches = 0
+        self.fallbacks = 0
+
+    def _node(self, Q: tuple[int, ...], parent: _Node | None, goals: list[Coord], order: list[int]) -> _Node:
+        dists = [self.dist(v, goal) for v, goal in zip(Q, goals)]
+        # Agents away from their goal keep their priority, agents at their goal go last
+        node_order = [i for i in order if dists[i] > 0] + [i for i in order if dists[i] == 0]
+        return _Node(Q, parent, parent.depth + 1 if parent is not None else 0, sum(dists), node_order)
+
+    def plan(self, Q_from: list[int], goals: list[Coord], order: list[int]) -> list[int]:
+        deadline = time.perf_counter() + self.time_budget
+        Q_next = self._search(Q_from, goals, order, deadline)
+        if Q_next is None:
+            self.fallbacks += 1
+            return self.pibt.plan(Q_from, goals, order)
+        self.searches += 1
+        return Q_next
+
+    def _search(self, Q_from: list[int], goals: list[Coord], order: list[int], deadline: float) -> list[int] | None:
+        self.pibt.inheritances = 0
+        self.pibt.max_chain = 0
+        root = self._node(tuple(Q_from), None, goals, order)
+        if root.cost == 0:
+            return None
+
+        # The simulation leaves the current configuration in occupied_now
+        self.pibt.occupied_now[Q_from] = self.pibt.NIL
+        try:
+            explored = {root.Q: root}
+            open_: list[_Node] = [root]
+            while open_ and time.perf_counter() < deadline:
+                node = open_[-1]
+                if node.depth > 0 and (node.cost == 0 or (node.depth >= self.window and node.cost < root.cost)):
+                    while node.depth > 1:
+                        node = node.parent
+                    return list(node.Q)
+                if not node.constraints:
+                    open_.pop()
+                    continue
+
+                # Lazily extend the low-level tree by the next agent in the node's order
+                constraints = node.constraints.popleft()
+                if len(constraints) < len(node.order):
+                    i = node.order[len(constraints)]
+                    cells = [node.Q[i]] + self.adjacency[node.Q[i]]
+                    self.rng.shuffle(cells)
+                    node.constraints.extend(constraints + ((i, v),) for v in cells)
+
+                Q = self.pibt.configuration(list(node.Q), goals, node.order, constraints)
+                if Q is None:
+                    continue
+                Q = tuple(Q)
+                known = explored.get(Q)
+                if known is not None:
+                    open_.append(known)  # Revisit: it will try its next constraint
+                    continue
+                successor = self._node(Q, node, goals, order)
+                explored[Q] = successor
+                open_.append(successor)
+            return None
+        finally:
+            self.pibt.occupied_now[Q_from] = np.arange(len(Q_from))
@@ -0,0 +1,99 @@
+import cProfile
+import json
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Iterator, TextIO
+
+import numpy as np
+
+
+PhaseHook = Callable[[str], ContextManager]
+
+
+class StepMetrics:
+    """Opt-in per-step phase timers and counters of a simulation.
+
+    Pass an instance as PIBTMAPDSimulation(metrics=...). Each step produces
+    one record {"step", "phases": {name: seconds}, "counters": {name: value}},
+    kept in memory for percentiles() and summary() and, if out is given,
+    written to it as one JSON line. Without metrics the simulation takes no
+    timings at all.
+
+    A hook, such as CProfileHook, is entered around every phase and can wrap
+    it with a profiler.
+    """
+
+    def __init__(self, out: TextIO | None = None, hook: PhaseHook | None = None):
+        self.out = out
+        self.hook = hook
+        self.records: list[dict] = []
+        self._current: dict | None = None
+
+    def begin_step(self) -> None:
+        self._current = {'step': len(self.records), 'phases': {}, 'counters': {}}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed code as phase `name` of the current step."""
+        with self.hook(name) if self.hook is not None else nullcontext():
+            start = time.perf_counter()
+            yield
+            self._current['phases'][name] = time.perf_counter() - start
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add to counter `name` of the current step."""
+        counters = self._current['counters']
+        counters[name] = counters.get(name, 0) + value
+
+    def end_step(self) -> None:
+        self.records.append(self._current)
+        if self.out is not None:
+            self.out.write(json.dumps(self._current) + '\n')
+        self._current = None
+
+    def percentiles(self, phase: str, q: tuple[float, ...] = (50, 90, 99)) -> dict[str, float]:
+        """Percentiles of a phase's duration over recorded steps, in seconds."""
+        durations = [record['phases'][phase] for record in self.records if phase in record['phases']]
+        if not durations:
+            return {}
+        return {f"p{p:g}": float(v) for p, v in zip(q, np.percentile(durations, q))}
+
+    def summary(self) -> dict:
+        """Mean and percentiles of every phase, and totals and maxima of every counter."""
+        phases = {name for record in self.records for name in record['phases']}
+        counters = {name for record in self.records for name in record['counters']}
+        return {
+            'steps': len(self.records),
+            'phases': {
+                name: {'mean': float(np.mean([r['phases'][name] for r in self.records if name in r['phases']])),
+                       **self.percentiles(name)}
+                for name in sorted(phases)
+            },
+            'counters': {
+                name: {'total': sum(r['counters'].get(name, 0) for r in self.records),
+                       'max': max(r['counters'].get(name, 0) for r in self.records)}
+                for name in sorted(counters)
+            },
+        }
+
+
+class CProfileHook:
+    """Phase hook profiling selected phases with cProfile.
+
+    Usage: StepMetrics(hook=CProfileHook({'planning'})); afterwards inspect
+    hook.stats() or hook.profile.dump_stats(path). A sampling profiler can be
+    attached the same way with any callable returning a context manager.
+    """
+
+    def __init__(self, phases: set[str] | None = None):
+        self.phases = phases  # None profiles every phase
+        self.profile = cProfile.Profile()
+
+    def __call__(self, name: str) -> ContextManager:
+        if self.phases is not None and name not in self.phases:
+            return nullcontext()
+        return self.profile
+
+    def stats(self) -> pstats.Stats:
+        return pstats.Stats(self.profile).sort_stats('cumulative')
@@ -0,0 +1,117 @@
+import heapq
+from typing import Callable
+
+from models.coord import Coord
+from models.task import Task
+
+
+class TaskAssigner:
+    """Nearest pending task lookup for free agents.
+
+    Pending tasks are indexed in square buckets of bucket_size cells. A query
+    visits buckets in rings of growing Chebyshev distance around the agent and
+    evaluates exact path distances in order of Manhattan distance, which is a
+    lower bound on the path distance. The search stops once no unvisited task
+    can beat the best one found, so without top_k the result is the same as a
+    scan over all tasks: the task with the smallest path distance, ties broken
+    by the order the tasks were given to reset(). With top_k, at most top_k
+    exact distances are evaluated per query.
+    """
+
+    def __init__(self, width: int, height: int, bucket_size: int = 8, top_k: int | None = None):
+        self.bucket_size = bucket_size
+        self.top_k = top_k
+        self.max_dist = width * height  # unreachable marker of DistTable
+        self._buckets_x = (width + bucket_size - 1) // bucket_size
+        self._buckets_y = (height + bucket_size - 1) // bucket_size
+        self._buckets: dict[tuple[int, int], dict[int, Task]] = {}
+        self._ranks: dict[int, int] = {}
+
+    def reset(self, tasks: list[Task]) -> None:
+        """Index tasks, earlier tasks win distance ties."""
+        self._buckets = {}
+        self._ranks = {}
+        for rank, task in enumerate(tasks):
+            key = (task.x // self.bucket_size, task.y // self.bucket_size)
+            self._buckets.setdefault(key, {})[rank] = task
+            self._ranks[id(task)] = rank
+
+    def remove(self, task: Task) -> None:
+        """Remove a task from the index."""
+        rank = self._ranks.pop(id(task))
+        key = (task.x // self.bucket_size, task.y // self.bucket_size)
+        bucket = self._buckets[key]
+        del bucket[rank]
+        if not bucket:
+            del self._buckets[key]
+
+    def _ring(self, bx: int, by: int, r: int) -> list[tuple[int, int]]:
+        """Bucket keys at Chebyshev distance r from (bx, by) that hold tasks."""
+        if r == 0:
+            keys = [(bx, by)]
+        else:
+            keys = []
+            for x in range(bx - r, bx + r + 1):
+                keys.append((x, by - r))
+                keys.append((x, by + r))
+            for y in range(by - r + 1, by + r):
+                keys.append((bx - r, y))
+                keys.append((bx + r, y))
+        return [key for key in keys if key in self._buckets]
+
+    def nearest(self, pos: Coord, dist: Callable[[Coord, Coord], int]) -> tuple[Task | None, int]:
+        """Find the nearest indexed task.
+
+        Args:
+            pos: Agent position (x, y).
+            dist: Path distance function dist(start, goal).
+
+        Returns:
+            Best task and its path distance, or (None, max_dist) if no task is
+            reachable.
+        """
+        if not self._buckets:
+            return None, self.max_dist
+
+        px, py = pos
+        bx, by = px // self.bucket_size, py // self.bucket_size
+        max_ring = max(bx, self._buckets_x - 1 - bx, by, self._buckets_y - 1 - by)
+
+        heap: list[tuple[int, int, Task]] = []  # (manhattan, rank, task)
+        best: tuple[int, int, Task] | None = None  # (path distance, rank, task)
+        evaluated = 0
+        r = 0
+
+        while True:
+            if r <= max_ring:
+                for key in self._ring(bx, by, r):
+                    for rank, task in self._buckets[key].items():
+                        heapq.heappush(heap, (abs(task.x - px) + abs(task.y - py), rank, task))
+                # Every task in a farther ring is at least this far away
+                next_bound = r * self.bucket_size + 1
+                r += 1
+            else:
+                next_bound = self.max_dist + 1
+
+            while heap and heap[0][0] < next_bound:
+                manhattan, rank, task = heap[0]
+                if best is not None and manhattan > best[0]:
+                    return best[2], best[0]
+                heapq.heappop(heap)
+                d = dist(pos, (task.x, task.y))
+                evaluated += 1
+                if d < self.max_dist and (best is None or (d, rank) < (best[0], best[1])):
+                    best = (d, rank, task)
+                if self.top_k is not None and evaluated >= self.top_k:
+                    break
+
+            if self.top_k is not None and evaluated >= self.top_k:
+                break
+            if best is not None and next_bound > best[0]:
+                break
+            if r > max_ring and not heap:
+                break
+
+        if best is None:
+            return None, self.max_dist
+        return best[2], best[0]
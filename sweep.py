@@ -0,0 +1,40 @@
+import argparse
+
+from runners.headless import LAYOUT_GENERATORS, layout_name
+from runners.sweep import expand_grid, run_sweep
+
+
+def parse_size(value: str) -> tuple[int, int]:
+    width, height = value.lower().split('x')
+    return int(width), int(height)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a headless PIBT MAPD parameter sweep across processes.")
+    parser.add_argument('--layouts', nargs='+', type=layout_name, default=['storage_walls'],
+                        help=f"Any of {', '.join(sorted(LAYOUT_GENERATORS))} or .map/.layout files")
+    parser.add_argument('--sizes', nargs='+', type=parse_size, default=[(30, 30)], metavar='WxH')
+    parser.add_argument('--agents', nargs='+', type=int, default=[50, 100, 200])
+    parser.add_argument('--reveal-intervals', nargs='+', type=int, default=[1])
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0, 1, 2])
+    parser.add_argument('--tasks', type=int, default=5_000)
+    parser.add_argument('--steps', type=int, default=1_000)
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per core)")
+    parser.add_argument('--share-dist-tables', action='store_true',
+                        help="Compute distance tables once per layout in shared memory for all workers")
+    parser.add_argument('--out', default='sweep_results.csv', help="Results CSV, resumed if it exists")
+    args = parser.parse_args()
+
+    configs = expand_grid(args.layouts, args.sizes, args.agents, args.reveal_intervals,
+                          args.seeds, args.tasks, args.steps)
+
+    def report(row: dict):
+        print(f"{row['run_id']}: throughput={row['throughput']:.4f} steps/sec={row['steps_per_sec']:.1f}")
+
+    executed = run_sweep(configs, args.out, workers=args.workers, progress=report,
+                         share_dist_tables=args.share_dist_tables)
+    print(f"Executed {executed} of {len(configs)} runs, results in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import random
+
+from models.agent import Agent
+from models.agent_state import AgentState
+from models.task import Task
+
+
+def test_priority_order_matches_sorted_key():
+    rng = random.Random(0)
+    agents = [
+        Agent(id=i, x=i, y=0, elapsed=rng.randrange(4), tie_breaker=rng.random(),
+              task=Task(0, 0) if rng.random() < 0.5 else None)
+        for i in range(50)
+    ]
+    state = AgentState(agents)
+
+    def priority_key(a: Agent) -> tuple[int, int, float]:
+        return (0 if a.task is not None else 1, -a.elapsed, -a.tie_breaker)
+
+    expected = [a.id for a in sorted(agents, key=priority_key)]
+    assert state.priority_order().tolist() == expected
+
+
+def test_views_read_and_write_arrays():
+    state = AgentState([Agent(id=0, x=1, y=2), Agent(id=1, x=3, y=4)])
+    view = state.views()[1]
+    assert (view.x, view.y) == (3, 4)
+
+    view.x = 7
+    assert state.x[1] == 7
+
+    task = Task(0, 0)
+    view.task = task
+    assert state.has_task.tolist() == [False, True]
+    assert state.task[1] is task
+    view.task = None
+    assert not state.has_task[1]
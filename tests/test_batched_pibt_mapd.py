@@ -0,0 +1,60 @@
+import numpy as np
+
+from generators.layout import storage_walls
+from models.layout import Layout
+from models.neighbor_table import NeighborTable
+from simulations.batched_pibt_mapd import BatchedPIBTMAPD
+
+
+def test_padded_neighbors_match_csr():
+    table = NeighborTable.from_grid(storage_walls(12, 10).grid)
+    padded = table.to_padded()
+    for cell in range(12 * 10):
+        assert [c for c in padded[cell].tolist() if c >= 0] == table.get(cell).tolist()
+
+
+def test_moves_are_collision_free():
+    layout = storage_walls(12, 10)
+    batch = BatchedPIBTMAPD(layout, 20, [0, 1, 2], num_tasks=100, reveal_interval=1)
+    allowed = [set(row.tolist()) for row in batch.candidates]
+    for _ in range(100):
+        before = batch.cell.copy()
+        batch.step()
+        for b in range(3):
+            now, prev = batch.cell[b].tolist(), before[b].tolist()
+            assert len(set(now)) == len(now)  # no vertex collisions
+            assert all(v in allowed[u] for u, v in zip(prev, now))  # stay or move to a neighbor
+            moved = {(u, v) for u, v in zip(prev, now) if u != v}
+            assert not any((v, u) in moved for u, v in moved)  # no swaps
+    assert (batch.tasks_completed() > 0).all()
+
+    # Every targeted task has exactly one agent heading to it
+    for b in range(3):
+        targets = batch.target[b][batch.target[b] >= 0]
+        assert len(set(targets.tolist())) == len(targets)
+        assert set(targets.tolist()) == set(np.flatnonzero(batch.task_status[b] == batch.STATUS_TARGETED).tolist())
+
+
+def test_instances_depend_only_on_their_seed():
+    layout = storage_walls(12, 10)
+    alone = BatchedPIBTMAPD(layout, 15, [7], num_tasks=60, reveal_interval=2)
+    batch = BatchedPIBTMAPD(layout, 15, [3, 7], num_tasks=60, reveal_interval=2)
+    for _ in range(80):
+        assert np.array_equal(alone.step()[0], batch.step()[1])
+    assert alone.tasks_completed()[0] == batch.tasks_completed()[1]
+
+
+def test_unreachable_pickups_are_not_assigned():
+    cells = np.full((3, 7), Layout.CELL_EMPTY, dtype=np.int8)
+    cells[:, 3] = Layout.CELL_OBSTACLE  # wall splits the grid in two
+    cells[0, 0] = cells[2, 0] = Layout.CELL_STORAGE  # all pickups on the left
+    cells[1, 2] = Layout.CELL_OUTPUT
+    batch = BatchedPIBTMAPD(Layout.from_cells(cells), 4, list(range(5)), num_tasks=20, reveal_interval=1)
+    right = batch.cell % 7 > 3
+    assert right.any()
+    for _ in range(30):
+        batch.step()
+        bs, agents = np.nonzero(batch.target >= 0)
+        rows = batch.goal_row[batch.task_pickup[bs, batch.target[bs, agents]]]
+        assert (batch.fields[rows, batch.cell[bs, agents]] < batch.unreachable).all()
+    assert (batch.target[right] < 0).all() and (batch.task[right] < 0).all()
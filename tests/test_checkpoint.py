@@ -0,0 +1,57 @@
+from runners.headless import build_simulation, build_stream_simulation
+from simulations.checkpoint import load_checkpoint, save_checkpoint
+from simulations.guidance import TrafficGuidance
+
+
+def run(simulation, steps):
+    return [simulation.step() for _ in range(steps)]
+
+
+def test_reveal_simulation_continues_identically(tmp_path):
+    path = str(tmp_path / 'warm.npz')
+    simulation = build_simulation('storage_walls', 12, 10, num_agents=12, num_tasks=200, reveal_interval=2, seed=5)
+    run(simulation, 30)
+    save_checkpoint(simulation, path, dist_tables=True)
+
+    branches = [load_checkpoint(path) for _ in range(2)]
+    assert len(branches[0].dist_tables) > 0
+    expected = run(simulation, 60)
+    for branch in branches:
+        assert run(branch, 60) == expected
+        assert branch.task_pool.count('completed') == simulation.task_pool.count('completed')
+        assert branch.timestep == simulation.timestep
+
+
+def test_stream_simulation_continues_identically(tmp_path):
+    path = str(tmp_path / 'stream.npz')
+
+    def build():
+        return build_stream_simulation('storage_walls', 12, 10, num_agents=10, arrival_rate=0.7,
+                                       zipf_exponent=1.0, seed=2)
+
+    simulation = build()
+    run(simulation, 40)
+    save_checkpoint(simulation, path)
+
+    restored = load_checkpoint(path, stream=build().stream)
+    assert run(restored, 60) == run(simulation, 60)
+    assert len(restored.task_pool) == len(simulation.task_pool)
+
+
+def test_guided_simulation_continues_identically(tmp_path):
+    path = str(tmp_path / 'guided.npz')
+
+    def build():
+        simulation = build_stream_simulation('storage_walls', 16, 12, num_agents=30, arrival_rate=2.0, seed=3)
+        simulation.guidance = TrafficGuidance(simulation.grid, interval=10, static_goals=simulation.layout.output_cells)
+        return simulation
+
+    simulation = build()
+    run(simulation, 25)  # between rebuilds: fields in use and a rebuild pending
+    save_checkpoint(simulation, path)
+
+    restored = load_checkpoint(path, stream=build().stream)
+    assert restored.guidance.options() == simulation.guidance.options()
+    assert run(restored, 40) == run(simulation, 40)
+    for sim in (simulation, restored):
+        sim.close()
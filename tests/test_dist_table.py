@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from generators.layout import storage_floor, storage_walls, obstacle_walls
+from models.dist_table import DistTable, build_dist_tables, compute_dist_fields, dist_dtype
+from models.layout import Layout
+
+
+@pytest.mark.parametrize('generator', [storage_floor, storage_walls, obstacle_walls])
+def test_eager_matches_lazy(generator):
+    layout = generator(17, 13)
+    grid = layout.grid
+    goals = layout.storage_cells[::7] + layout.output_cells
+    for goal in goals:
+        lazy = DistTable(grid, goal)
+        eager = DistTable(grid, goal, eager=True)
+        assert eager.complete
+        for y in range(layout.height):
+            for x in range(layout.width):
+                assert eager.get((x, y)) == lazy.get((x, y)), (goal, x, y)
+
+
+def test_chunked_fields_match_single_chunk():
+    layout = obstacle_walls(17, 13)
+    goals = layout.storage_cells[:20]
+    whole = compute_dist_fields(layout.grid, goals)
+    chunked = compute_dist_fields(layout.grid, goals, chunk_cells=1)
+    assert (whole == chunked).all()
+    assert whole.dtype == dist_dtype(layout.grid.size)
+
+
+def test_build_dist_tables_covers_storage_and_output():
+    layout = storage_walls(17, 13)
+    tables = build_dist_tables(layout)
+    assert set(tables) == set(layout.storage_cells) | set(layout.output_cells)
+    assert all(table.complete for table in tables.values())
+
+
+def test_repair_matches_recomputation():
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        height, width = rng.integers(3, 12, 2)
+        grid = rng.random((height, width)) < 0.75
+        goal = (int(rng.integers(width)), int(rng.integers(height)))
+        eager = DistTable(grid, goal, eager=True)
+        lazy = DistTable(grid, goal)
+        lazy.get((int(rng.integers(width)), int(rng.integers(height))))
+        for _ in range(4):
+            changed = list({(int(rng.integers(width)), int(rng.integers(height))) for _ in range(3)})
+            for x, y in changed:
+                grid[y, x] = not grid[y, x]
+            eager.repair(changed)
+            lazy.repair(changed)
+            reference = compute_dist_fields(grid, [goal])[0]
+            assert (eager._table == reference).all()
+            for y in range(height):
+                for x in range(width):
+                    assert lazy.get((x, y)) == (reference[y, x] if grid[y, x] else grid.size)
+
+
+def test_repair_copies_read_only_tables():
+    layout = obstacle_walls(17, 13)
+    grid = layout.grid
+    field = compute_dist_fields(grid, [(1, 1)])[0]
+    field.flags.writeable = False
+    table = DistTable(grid, (1, 1), table=field)
+    layout.set_value(2, 1, Layout.CELL_OBSTACLE)
+    table.repair([(2, 1)])
+    assert (table._table == compute_dist_fields(grid, [(1, 1)])[0]).all()
+    assert not (field == table._table).all()
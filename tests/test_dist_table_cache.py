@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+
+from generators.layout import storage_walls
+from models.dist_table import DistTable
+from models.dist_table_cache import DistTableCache, layout_hash
+
+
+def test_layout_hash_depends_on_grid():
+    a = storage_walls(12, 10).grid
+    b = a.copy()
+    assert layout_hash(a) == layout_hash(b)
+    b[0, 1] = not b[0, 1]
+    assert layout_hash(a) != layout_hash(b)
+
+
+def test_miss_writes_file_and_reload_uses_mmap(tmp_path):
+    layout = storage_walls(12, 10)
+    goal = layout.storage_cells[0]
+    expected = DistTable(layout.grid, goal, eager=True)
+
+    cache = DistTableCache(layout.grid, str(tmp_path))
+    assert goal not in cache
+    table = cache.get(goal)
+    assert goal in cache
+    assert cache.get(goal) is table
+    assert os.path.exists(cache._path(goal))
+
+    reloaded = DistTableCache(layout.grid, str(tmp_path)).get(goal)
+    assert isinstance(reloaded._table.base, np.memmap)
+    assert not reloaded._table.flags.writeable
+    for y in range(layout.height):
+        for x in range(layout.width):
+            assert reloaded.get((x, y)) == expected.get((x, y))
+
+
+def test_precompute_writes_all_goals(tmp_path):
+    layout = storage_walls(12, 10)
+    goals = layout.storage_cells + layout.output_cells
+    cache = DistTableCache(layout.grid, str(tmp_path))
+    cache.precompute(goals)
+    assert all(os.path.exists(cache._path(goal)) for goal in goals)
+    assert len(cache) == 0  # nothing loaded until requested
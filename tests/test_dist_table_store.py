@@ -0,0 +1,58 @@
+import pytest
+
+from generators.layout import storage_walls
+from models.dist_table import DistTable
+from models.dist_table_store import DistTableStore
+
+
+def make_tables(count: int) -> list[DistTable]:
+    layout = storage_walls(12, 10)
+    return [DistTable(layout.grid, goal) for goal in layout.storage_cells[:count]]
+
+
+def test_compact_dtype():
+    table = make_tables(1)[0]
+    assert table.nbytes == 12 * 10 * 2
+
+
+def test_lru_eviction_and_byte_accounting():
+    a, b, c = make_tables(3)
+    store = DistTableStore(max_bytes=2 * a.nbytes)
+    store[a.goal] = a
+    store[b.goal] = b
+    assert store.nbytes == 2 * a.nbytes
+
+    # Touch a so that b becomes least recently used
+    assert store.get(a.goal) is a
+    store[c.goal] = c
+    assert b.goal not in store
+    assert a.goal in store and c.goal in store
+    assert store.nbytes == 2 * a.nbytes
+
+    assert store.get(b.goal) is None
+    assert store.stats() == {
+        'tables': 2,
+        'bytes': 2 * a.nbytes,
+        'max_bytes': 2 * a.nbytes,
+        'hits': 1,
+        'misses': 1,
+        'evictions': 1,
+    }
+    with pytest.raises(KeyError):
+        store[b.goal]
+
+
+def test_replacing_goal_keeps_bytes_consistent():
+    a = make_tables(1)[0]
+    store = DistTableStore(max_bytes=10 * a.nbytes)
+    store[a.goal] = a
+    store[a.goal] = DistTable(a.grid, a.goal)
+    assert len(store) == 1
+    assert store.nbytes == a.nbytes
+
+
+def test_newest_table_is_kept_over_budget():
+    a = make_tables(1)[0]
+    store = DistTableStore(max_bytes=1)
+    store[a.goal] = a
+    assert store.get(a.goal) is a
@@ -0,0 +1,30 @@
+from generators.layout import storage_walls
+from models.agent import Agent
+from models.task import Task
+from simulations.pibt_mapd_simulation import PIBTMAPDSimulation
+from windows.frame import Frame
+
+
+def test_capture_labels_tasks_with_agents():
+    layout = storage_walls(12, 10)
+    (px, py), (qx, qy) = layout.storage_cells[:2]
+    (ox, oy) = layout.output_cells[0]
+    tasks = [Task(px, py, ox, oy), Task(qx, qy, ox, oy)]
+    agents = [Agent(id=0, x=0, y=0)]
+    simulation = PIBTMAPDSimulation(layout, agents, tasks, seed=0)
+    simulation.step()
+
+    frame = Frame.capture(simulation, 1)
+    assert frame.step == 1
+    assert frame.agents == ((simulation.agents[0].x, simulation.agents[0].y, 0),)
+    target = simulation.agents[0].target_task
+    assert sorted(frame.pickups) == sorted((t.x, t.y, 0 if t is target else None) for t in tasks)
+    assert frame.deliveries == ()
+    assert (frame.tasks_completed, frame.tasks_total) == (0, 2)
+
+
+def test_layout_revision_tracks_changes():
+    layout = storage_walls(12, 10)
+    revision = layout.revision
+    layout.set_value(0, 0, layout.CELL_OBSTACLE)
+    assert layout.revision == revision + 1
@@ -0,0 +1,69 @@
+import heapq
+
+import numpy as np
+
+from generators.layout import storage_walls
+from models.dist_table import compute_dist_fields
+from runners.headless import build_stream_simulation, run_headless
+from simulations.guidance import COST_SCALE, TrafficGuidance, weighted_dist_fields
+
+
+def dijkstra(grid, goal, cost):
+    """Reference cost-to-go: summed cost of the cells entered on the way to goal."""
+    height, width = grid.shape
+    dist = np.full(grid.shape, np.inf)
+    gx, gy = goal
+    dist[gy, gx] = 0
+    heap = [(0, gx, gy)]
+    while heap:
+        d, x, y = heapq.heappop(heap)
+        if d > dist[y, x]:
+            continue
+        for nx, ny in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= nx < width and 0 <= ny < height and grid[ny, nx] and d + cost[y, x] < dist[ny, nx]:
+                dist[ny, nx] = d + cost[y, x]
+                heapq.heappush(heap, (dist[ny, nx], nx, ny))
+    dist[~grid] = np.inf
+    return dist / COST_SCALE
+
+
+def test_uniform_costs_match_bfs():
+    grid = storage_walls(23, 17).grid
+    goals = [(0, 0), (11, 8), (22, 16)]
+    fields = weighted_dist_fields(grid, goals, np.full(grid.shape, COST_SCALE))
+    reference = compute_dist_fields(grid, goals).astype(np.float32)
+    reference[:, ~grid] = np.inf
+    assert np.array_equal(fields, reference)
+
+
+def test_weighted_fields_match_dijkstra():
+    rng = np.random.default_rng(0)
+    for _ in range(30):
+        height, width = rng.integers(3, 12, 2)
+        grid = rng.random((height, width)) < 0.7
+        goals = [(int(x), int(y)) for y, x in zip(*np.nonzero(grid))][:4]
+        cost = rng.integers(COST_SCALE, 4 * COST_SCALE, grid.shape)
+        fields = weighted_dist_fields(grid, goals, cost, chunk_cells=1)
+        for k, goal in enumerate(goals):
+            np.testing.assert_allclose(fields[k], dijkstra(grid, goal, cost))
+
+
+def test_costs_follow_waiting_traffic():
+    grid = np.ones((1, 4), dtype=bool)
+    guidance = TrafficGuidance(grid, interval=1, weight=1.0, decay=0.5, background=False)
+    # One agent waits on cell 1 away from its goal, another reaches its goal on cell 3
+    guidance.observe(np.array([1, 2]), np.array([1, 3]), np.array([False, True]))
+    costs = guidance.costs().ravel()
+    assert costs[1] > costs[3] > costs[0] == costs[2] == COST_SCALE
+
+
+def test_background_guidance_is_deterministic():
+    results = []
+    for _ in range(2):
+        simulation = build_stream_simulation('storage_walls', 20, 20, num_agents=60, arrival_rate=3.0, seed=0)
+        simulation.guidance = TrafficGuidance(simulation.grid, interval=10, static_goals=simulation.layout.output_cells)
+        result = run_headless(simulation, 60)
+        simulation.close()
+        assert simulation.guidance.rebuilds >= 5
+        results.append((result.tasks_completed, [(a.x, a.y) for a in simulation.agents]))
+    assert results[0] == results[1]
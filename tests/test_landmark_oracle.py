@@ -0,0 +1,53 @@
+import numpy as np
+
+from generators.layout import obstacle_walls
+from models.agent import Agent
+from models.dist_table import compute_dist_fields
+from models.landmark_oracle import LandmarkOracle
+from models.layout import Layout
+from runners.headless import build_simulation, run_headless
+from simulations.pibt_mapd_simulation import PIBTMAPDSimulation
+
+
+def test_estimate_is_a_lower_bound():
+    layout = obstacle_walls(23, 17)
+    oracle = LandmarkOracle(layout.grid, num_landmarks=4)
+    assert len(oracle.landmarks) == 4
+    goals = layout.storage_cells[::5]
+    fields = compute_dist_fields(layout.grid, goals)
+    ys, xs = np.nonzero(layout.grid)
+    for k, goal in enumerate(goals):
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            estimate = oracle.estimate((x, y), goal)
+            assert estimate <= fields[k, y, x]
+            assert (estimate == 0) == ((x, y) == goal)
+
+
+def test_landmarks_cover_components_and_detect_unreachable():
+    layout = Layout(7, 3)
+    layout.fill((slice(None), 3), Layout.CELL_OBSTACLE)  # wall splits the grid in two
+    oracle = LandmarkOracle(layout.grid, num_landmarks=2)
+    assert {x < 3 for x, _ in oracle.landmarks} == {True, False}
+    assert oracle.estimate((0, 0), (6, 2)) == layout.grid.size
+    assert oracle.estimate((0, 0), (2, 2)) == 4
+
+
+def test_simulation_with_landmarks_completes_tasks():
+    simulation = build_simulation('storage_walls', 20, 20, num_agents=20, num_tasks=100, seed=0, landmarks=8)
+    result = run_headless(simulation, 200)
+    assert result.tasks_completed > 0
+    # Exact tables only exist for goals agents headed to, not for every pickup evaluated
+    assert len(simulation.dist_tables) < len(simulation.layout.storage_cells)
+
+
+def test_simulation_rebuilds_landmarks_after_layout_change():
+    layout = Layout(9, 5)
+    layout.fill((slice(0, 4), 4), Layout.CELL_OBSTACLE)  # wall with a gap at the bottom
+    simulation = PIBTMAPDSimulation(layout, [Agent(id=0, x=0, y=0)], [], landmarks=4)
+    assert simulation.oracle.estimate((3, 0), (5, 0)) == 10
+
+    layout.fill((slice(0, 4), 4), Layout.CELL_EMPTY)  # opening the wall shortens paths
+    assert simulation.oracle.estimate((3, 0), (5, 0)) == 2
+
+    layout.fill((slice(None), 4), Layout.CELL_OBSTACLE)  # closing it completely splits the grid
+    assert simulation.oracle.estimate((3, 0), (5, 0)) == layout.grid.size
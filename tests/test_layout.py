@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from generators.layout import storage_floor, storage_walls, obstacle_walls
+from models.layout import Layout
+
+
+def reference_blocks(width, height, block_width, block_height, spacing_x, spacing_y, border_space):
+    cells = set()
+    for y in range(border_space, height - border_space):
+        for x in range(border_space, width - border_space):
+            if ((x - border_space) % (block_width + spacing_x) < block_width
+                    and (y - border_space) % (block_height + spacing_y) < block_height):
+                cells.add((x, y))
+    return cells
+
+
+@pytest.mark.parametrize('width, height', [(30, 30), (41, 37), (5, 4)])
+def test_storage_walls_pattern(width, height):
+    layout = storage_walls(width, height)
+    assert set(layout.storage_cells) == reference_blocks(width, height, 4, 2, 1, 1, 2)
+    assert layout.output_cells == [(x, y) for y in (0, height - 1) for x in range(0, width, 2)]
+
+
+@pytest.mark.parametrize('width, height', [(30, 30), (41, 37)])
+def test_obstacle_walls_storage_is_adjacent_to_obstacles(width, height):
+    layout = obstacle_walls(width, height)
+    obstacles = reference_blocks(width, height, 4, 2, 3, 3, 2)
+    assert {(x, y) for y in range(height) for x in range(width)
+            if layout.get_value(x, y) == Layout.CELL_OBSTACLE} == obstacles
+
+    expected = {
+        (x, y)
+        for y in range(1, height - 1)
+        for x in range(1, width - 1)
+        if (x, y) not in obstacles
+        and any((x + dx, y + dy) in obstacles for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)])
+    }
+    assert set(layout.storage_cells) == expected
+
+
+def test_cells_are_row_major_and_grid_tracks_writes():
+    layout = storage_floor(6, 5)
+    assert layout.storage_cells == sorted(layout.storage_cells, key=lambda c: (c[1], c[0]))
+    assert layout.output_cells == [(0, 0)]
+    assert layout.grid.all()
+
+    layout.set_value(2, 3, Layout.CELL_OBSTACLE)
+    assert not layout.grid[3, 2]
+    assert not layout.is_traversable(2, 3)
+
+
+def test_from_cells_round_trip():
+    layout = obstacle_walls(17, 13)
+    copy = Layout.from_cells(layout.cells)
+    assert np.array_equal(copy.cells, layout.cells)
+    assert copy.storage_cells == layout.storage_cells
+    assert copy.output_cells == layout.output_cells
+    assert copy.storage_xy.shape == (len(layout.storage_cells), 2)
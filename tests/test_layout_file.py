@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from generators.layout import obstacle_walls, storage_walls
+from generators.layout_file import (load_layout, load_movingai_map, load_movingai_scen, save_layout,
+                                    save_movingai_map)
+from models.layout import Layout
+from runners.benchmark import BenchmarkCase, compare
+from runners.headless import build_simulation, run_headless
+
+
+def test_movingai_map_parse(tmp_path):
+    path = tmp_path / 'tiny.map'
+    path.write_bytes(b"type octile\r\nheight 4\r\nwidth 5\r\nmap\r\n.....\r\n.@T..\r\n..W.S\r\nG....\r\n")
+    layout = load_movingai_map(path)
+
+    assert (layout.width, layout.height) == (5, 4)
+    assert {(x, y) for y in range(4) for x in range(5)
+            if layout.get_value(x, y) == Layout.CELL_OBSTACLE} == {(1, 1), (2, 1), (2, 2)}
+    # Storage: passable inner cells next to an obstacle; outputs: every second cell of the top and bottom rows
+    assert set(layout.storage_cells) == {(1, 2), (3, 1), (3, 2)}
+    assert layout.output_cells == [(0, 0), (2, 0), (4, 0), (0, 3), (2, 3), (4, 3)]
+
+
+def test_movingai_map_rejects_unknown_terrain(tmp_path):
+    path = tmp_path / 'bad.map'
+    path.write_text("type octile\nheight 1\nwidth 3\nmap\n.x.\n")
+    with pytest.raises(ValueError, match="'x'"):
+        load_movingai_map(path)
+
+
+def test_movingai_map_round_trip_matches_obstacle_walls(tmp_path):
+    layout = obstacle_walls(41, 37)
+    save_movingai_map(layout, tmp_path / 'walls.map')
+    loaded = load_movingai_map(tmp_path / 'walls.map')
+    np.testing.assert_array_equal(loaded.cells, layout.cells)
+    assert loaded.storage_cells == layout.storage_cells
+
+
+def test_native_layout_round_trip(tmp_path):
+    layout = storage_walls(23, 17)
+    layout.set_value(1, 1, Layout.CELL_OBSTACLE)
+    save_layout(layout, tmp_path / 'walls.layout')
+    loaded = load_layout(tmp_path / 'walls.layout')
+    np.testing.assert_array_equal(loaded.cells, layout.cells)
+    assert loaded.output_cells == layout.output_cells
+
+
+def test_movingai_scen_parse(tmp_path):
+    path = tmp_path / 'tiny.scen'
+    path.write_text("version 1\n"
+                    "0\ttiny.map\t5\t4\t0\t0\t4\t3\t5.00000000\n"
+                    "0\ttiny.map\t5\t4\t3\t1\t0\t3\t3.41421356\n")
+    scenario = load_movingai_scen(path)
+    assert scenario.map_name == 'tiny.map'
+    assert len(scenario) == 2
+    assert scenario.starts.tolist() == [[0, 0], [3, 1]]
+    assert scenario.goals.tolist() == [[4, 3], [0, 3]]
+    np.testing.assert_allclose(scenario.optimal_lengths, [5.0, 3.41421356])
+
+
+def test_simulation_runs_on_layout_file(tmp_path):
+    path = str(tmp_path / 'walls.map')
+    save_movingai_map(obstacle_walls(20, 15), path)
+    result = run_headless(build_simulation(path, num_agents=10, num_tasks=50, seed=0), 50)
+    assert result.steps == 50 and result.tasks_completed > 0
+
+
+def test_benchmark_compare_flags_regressions():
+    baselines = {'a': {'steps_per_sec': 100.0, 'peak_rss_mb': 50.0, 'throughput': 0.5}}
+    ok = {'name': 'a', 'steps_per_sec': 90.0, 'peak_rss_mb': 55.0, 'throughput': 0.5}
+    bad = {'name': 'a', 'steps_per_sec': 70.0, 'peak_rss_mb': 70.0, 'throughput': 0.4}
+    assert compare([ok], baselines) == []
+    assert len(compare([bad], baselines)) == 3
+    assert compare([{**bad, 'name': 'new'}], baselines) == []
+    assert BenchmarkCase('x', 'warehouse-64x33.map', 1).map_path.endswith('benchmarks/maps/warehouse-64x33.map')
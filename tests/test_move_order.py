@@ -0,0 +1,38 @@
+from generators.layout import obstacle_walls
+from models.dist_table import DistTable
+from models.neighbor_table import NeighborTable
+from runners.headless import build_simulation
+from simulations.move_order import MoveOrderCache
+
+
+def test_groups_are_sorted_ties_of_candidates():
+    layout = obstacle_walls(23, 17)
+    neighbors = NeighborTable.from_grid(layout.grid)
+    adjacency = neighbors.to_lists()
+    cache = MoveOrderCache(adjacency, layout.width, max_goals=2)
+    goal = layout.storage_cells[3]
+    table = DistTable(layout.grid, goal)
+
+    for v in range(layout.width * layout.height):
+        if not layout.grid[v // layout.width, v % layout.width]:
+            continue
+        groups = cache.groups(goal, v, table)
+        assert sorted(u for group in groups for u in group) == sorted([v] + adjacency[v])
+        dists = [{table.get(neighbors.coord(u)) for u in group} for group in groups]
+        assert all(len(d) == 1 for d in dists)
+        assert [d.pop() for d in dists] == sorted(table.get(neighbors.coord(group[0])) for group in groups)
+
+
+def test_goal_eviction():
+    layout = obstacle_walls(23, 17)
+    cache = MoveOrderCache(NeighborTable.from_grid(layout.grid).to_lists(), layout.width, max_goals=2)
+    for goal in layout.storage_cells[:3]:
+        cache.groups(goal, 0, DistTable(layout.grid, goal))
+    assert list(cache._orders) == layout.storage_cells[1:3]
+
+
+def test_simulation_with_cache_completes_tasks():
+    simulation = build_simulation('storage_walls', 20, 20, 30, 200, 1, 0, cached_move_order=True)
+    for _ in range(150):
+        simulation.step()
+    assert simulation.task_pool.count('completed') > 0
@@ -0,0 +1,79 @@
+import random
+import sys
+
+import numpy as np
+
+from models.agent import Agent
+from models.layout import Layout
+from models.neighbor_table import NeighborTable
+from models.dist_table import compute_dist_fields, get_neighbors
+from generators.agent import initialize_positions_randomly
+from generators.layout import obstacle_walls
+from generators.task import next_random
+from simulations.pibt_mapd_simulation import PIBTMAPDSimulation
+
+
+def test_neighbor_table_matches_get_neighbors():
+    layout = obstacle_walls(23, 17)
+    table = NeighborTable.from_grid(layout.grid)
+    for y in range(layout.height):
+        for x in range(layout.width):
+            cell = table.cell((x, y))
+            assert [table.coord(c) for c in table.get(cell)] == get_neighbors(layout.grid, (x, y))
+
+
+def test_long_inheritance_chain_does_not_recurse():
+    length = sys.getrecursionlimit() + 500
+    layout = Layout(length + 1, 1)
+    agents = [Agent(id=i, x=i, y=0) for i in range(length)]
+    simulation = PIBTMAPDSimulation(layout, agents, [])
+
+    # Everyone heads to the free cell at the right end, the leftmost agent plans first
+    goal = (length, 0)
+    Q_from = list(range(length))
+    Q_to = [simulation.NIL_CELL] * length
+    assert simulation.pibt.func_pibt(Q_from, Q_to, [goal] * length, 0)
+    assert Q_to == [v + 1 for v in Q_from]
+
+
+def test_blocked_cells_repair_tables_and_are_avoided():
+    random.seed(0)
+    layout = obstacle_walls(23, 17)
+    agents = [Agent(id=i, x=0, y=0) for i in range(20)]
+    initialize_positions_randomly(agents, layout)
+    tasks = [next_random(layout) for _ in range(200)]
+    simulation = PIBTMAPDSimulation(layout, agents, tasks, eager_dist_tables=True)
+    for _ in range(20):
+        simulation.step()
+
+    # Block a whole aisle row (except the border) mid-run
+    blocked = [(x, 8) for x in range(1, 22) if layout.get_value(x, 8) == Layout.CELL_EMPTY]
+    layout.fill((np.array([y for _, y in blocked]), np.array([x for x, _ in blocked])), Layout.CELL_OBSTACLE)
+
+    for goal, table in simulation.dist_tables.items():
+        assert (table._table == compute_dist_fields(layout.grid, [goal])[0]).all()
+    assert all(simulation._adjacency[c] == simulation.neighbors.get(c).tolist() for c in range(layout.grid.size))
+
+    for _ in range(30):
+        simulation.step()
+    assert not any((agent.x, agent.y) in blocked for agent in simulation.agents)
+
+
+def test_layout_reports_changed_cells_and_closed_simulations_detach():
+    layout = obstacle_walls(23, 17)
+    agents = [Agent(id=0, x=1, y=1)]
+    simulation = PIBTMAPDSimulation(layout, agents, [])
+    reports = []
+    layout.listeners.append(reports.append)
+
+    layout.set_value(7, 8, Layout.CELL_OBSTACLE)
+    layout.fill((slice(7, 9), 7), Layout.CELL_OBSTACLE)  # (7, 8) is closed already
+    layout.fill(layout.cells == Layout.CELL_OBSTACLE, Layout.CELL_OBSTACLE)  # no traversability change
+    assert reports == [[(7, 8)], [(7, 7)]]
+    assert 8 * 23 + 7 not in simulation._adjacency[8 * 23 + 6]
+
+    simulation.close()
+    assert layout.listeners == [reports.append]
+    layout.set_value(7, 8, Layout.CELL_EMPTY)
+    assert reports[-1] == [(7, 8)]
+    assert 8 * 23 + 7 not in simulation._adjacency[8 * 23 + 6]  # no longer updated
@@ -0,0 +1,30 @@
+import numpy as np
+
+from generators.task_stream import zipf_weights
+from runners.placement import (RolloutSpec, optimize_placement, output_distances, proxy_cost,
+                               proxy_placement)
+
+
+def test_proxy_placement_puts_popular_skus_near_outputs():
+    spec = RolloutSpec('storage_walls', 12, 10, num_agents=4)
+    layout = spec.layout()
+    distances = output_distances(layout)
+    assert distances.shape == (len(layout.storage_cells),)
+
+    popularity = zipf_weights(len(distances), 1.0, seed=1)
+    placement = proxy_placement(popularity, distances)
+    assert sorted(placement.tolist()) == list(range(len(distances)))
+    assert placement[np.argmin(distances)] == np.argmax(popularity)
+
+    shuffled = np.random.default_rng(0).permutation(placement)
+    assert proxy_cost(popularity, placement, distances) <= proxy_cost(popularity, shuffled, distances)
+
+
+def test_optimize_placement_never_returns_worse_than_start():
+    spec = RolloutSpec('storage_walls', 12, 10, num_agents=6, steps=60, seeds=(0, 1))
+    popularity = zipf_weights(len(spec.layout().storage_cells), 1.0)
+    start = optimize_placement(spec, popularity, iterations=0, workers=2)
+    result = optimize_placement(spec, popularity, iterations=2, candidates=2, workers=2)
+    assert len(result.history) == 2
+    assert result.throughput >= start.throughput
+    assert sorted(result.sku_at_cell.tolist()) == list(range(len(popularity)))
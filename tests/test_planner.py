@@ -0,0 +1,53 @@
+from models.agent import Agent
+from models.layout import Layout
+from runners.headless import build_stream_simulation
+from simulations.pibt_mapd_simulation import PIBTMAPDSimulation
+
+
+def _corridor_swap(lacam_budget, seed, steps=60):
+    """Two agents swap ends of a corridor with a single side pocket."""
+    layout = Layout(7, 2)
+    layout.fill((1, slice(None)), Layout.CELL_OBSTACLE)
+    layout.fill((1, 3), Layout.CELL_EMPTY)
+    goals = [(6, 0), (0, 0)]
+    agents = [Agent(id=0, x=0, y=0), Agent(id=1, x=6, y=0)]
+    simulation = PIBTMAPDSimulation(layout, agents, [], seed=seed, lacam_budget=lacam_budget, lacam_window=3)
+    for step in range(steps):
+        simulation.state.goal_x[:] = [x for x, _ in goals]
+        simulation.state.goal_y[:] = [y for _, y in goals]
+        simulation._acting_phase(simulation._planning_phase())
+        if list(zip(simulation.state.x.tolist(), simulation.state.y.tolist())) == goals:
+            return step + 1
+    return None
+
+
+def test_lacam_resolves_corridor_swap_where_pibt_livelocks():
+    for seed in range(3):
+        assert _corridor_swap(None, seed) is None
+        assert _corridor_swap(1.0, seed) is not None
+
+
+def test_lacam_steps_are_collision_free():
+    simulation = build_stream_simulation('storage_walls', 12, 12, num_agents=40, arrival_rate=5.0, seed=0,
+                                         lacam_budget=0.05, lacam_window=3)
+    width = simulation.layout.width
+    Q_from = (simulation.state.y * width + simulation.state.x).tolist()
+    for _ in range(50):
+        simulation.step()
+        Q_to = (simulation.state.y * width + simulation.state.x).tolist()
+        assert len(set(Q_to)) == len(Q_to)
+        for i, (u, v) in enumerate(zip(Q_from, Q_to)):
+            assert v == u or v in simulation._adjacency[u]
+            j = Q_from.index(v) if v in Q_from else None
+            assert j is None or j == i or Q_to[j] != u
+        Q_from = Q_to
+    assert simulation.planner.searches > 0
+
+
+def test_lacam_without_budget_falls_back_to_pibt():
+    simulation = build_stream_simulation('storage_walls', 12, 12, num_agents=20, arrival_rate=5.0, seed=0,
+                                         lacam_budget=0.0)
+    for _ in range(10):
+        simulation.step()
+    assert simulation.planner.searches == 0
+    assert simulation.planner.fallbacks == 10
@@ -0,0 +1,46 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from generators.layout import storage_walls
+from models.dist_table import DistTable
+from models.shared_dist_tables import SharedDistTables
+
+
+def read_field(width, height, handle, goal):
+    grid = storage_walls(width, height).grid
+    tables = SharedDistTables.attach(grid, handle)
+    table = tables.get(goal)
+    field = [[table.get((x, y)) for x in range(width)] for y in range(height)]
+    writeable = table._table.flags.writeable
+    tables.close()
+    return field, writeable
+
+
+def test_workers_read_shared_fields():
+    layout = storage_walls(12, 10)
+    goals = layout.storage_cells + layout.output_cells
+    shared = SharedDistTables.create(layout.grid, goals)
+    try:
+        goal = goals[-1]
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            field, writeable = pool.submit(read_field, 12, 10, shared.handle, goal).result()
+        expected = DistTable(layout.grid, goal, eager=True)
+        assert not writeable
+        assert field == [[expected.get((x, y)) for x in range(12)] for y in range(10)]
+    finally:
+        shared.unlink()
+
+
+def test_missing_goals_are_kept_locally():
+    layout = storage_walls(12, 10)
+    shared = SharedDistTables.create(layout.grid, layout.output_cells)
+    try:
+        goal = layout.storage_cells[0]
+        assert shared.get(goal) is None
+        table = DistTable(layout.grid, goal)
+        shared[goal] = table
+        assert shared.get(goal) is table
+        assert isinstance(shared.get(layout.output_cells[0])._table, np.ndarray)
+    finally:
+        shared.unlink()
@@ -0,0 +1,51 @@
+import time
+
+from generators.layout import storage_walls
+from models.agent import Agent
+from models.task import Task
+from simulations.pibt_mapd_simulation import PIBTMAPDSimulation
+from windows.simulation_thread import SimulationThread
+
+
+def make_simulation():
+    layout = storage_walls(12, 10)
+    (ox, oy) = layout.output_cells[0]
+    tasks = [Task(x, y, ox, oy) for x, y in layout.storage_cells[:20]]
+    agents = [Agent(id=i, x=x, y=0) for i, x in enumerate(range(0, 12, 3))]
+    return PIBTMAPDSimulation(layout, agents, tasks, seed=0)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline
+        time.sleep(0.001)
+
+
+def test_single_steps_publish_every_frame():
+    thread = SimulationThread(make_simulation())
+    thread.start()
+    try:
+        thread.step_once()
+        thread.step_once()
+        wait_for(lambda: thread.frame.step == 2)
+        time.sleep(0.01)
+        assert thread.step_count == 2
+    finally:
+        thread.stop(timeout=5)
+    assert not thread.is_alive()
+
+
+def test_pause_publishes_latest_frame():
+    thread = SimulationThread(make_simulation(), publish_interval=3600)
+    thread.start()
+    try:
+        thread.resume()
+        wait_for(lambda: thread.step_count >= 10)
+        thread.pause()
+        wait_for(lambda: thread.frame.step == thread.step_count)
+        frame = thread.frame
+        agents = thread.simulation.agents
+        assert frame.agents == tuple((a.x, a.y, a.id) for a in agents)
+    finally:
+        thread.stop(timeout=5)
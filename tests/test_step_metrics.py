@@ -0,0 +1,30 @@
+import io
+import json
+
+from runners.headless import build_simulation
+from simulations.step_metrics import CProfileHook, StepMetrics
+
+
+def test_metrics_record_phases_and_counters():
+    out = io.StringIO()
+    hook = CProfileHook({'planning'})
+    metrics = StepMetrics(out, hook)
+    simulation = build_simulation('storage_walls', 12, 10, num_agents=8, num_tasks=20, seed=3, metrics=metrics)
+    reference = build_simulation('storage_walls', 12, 10, num_agents=8, num_tasks=20, seed=3)
+    for _ in range(20):
+        assert simulation.step() == reference.step()  # instrumentation does not change behavior
+
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(lines) == 20 and lines == metrics.records
+    assert set(lines[0]['phases']) == {'assignment', 'planning', 'acting'}
+    assert lines[0]['counters']['dist_table_misses'] > 0
+    assert lines[0]['counters']['bfs_expansions'] > 0
+
+    summary = metrics.summary()
+    assert summary['steps'] == 20
+    assert set(summary['phases']['planning']) == {'mean', 'p50', 'p90', 'p99'}
+    assert summary['counters']['pibt_max_chain']['max'] >= 0
+
+    profiled = {func[2] for func in hook.stats().stats}
+    assert '_planning_phase' in profiled
+    assert '_assignment_phase' not in profiled
@@ -0,0 +1,44 @@
+import csv
+
+from runners.sweep import expand_grid, run_sweep, completed_run_ids, drop_partial_row
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_sweep_streams_rows_and_resumes(tmp_path):
+    out = str(tmp_path / 'results.csv')
+    configs = expand_grid(['storage_walls', 'storage_floor'], [(12, 10)], [4], [1], [0, 1], num_tasks=30, steps=20)
+    assert len(configs) == 4
+
+    assert run_sweep(configs[:3], out, workers=2) == 3
+    assert len(read_rows(out)) == 3
+
+    # Resuming runs only what is missing
+    assert run_sweep(configs, out, workers=2) == 1
+    rows = read_rows(out)
+    assert len(rows) == 4
+    assert completed_run_ids(out) == {c.run_id for c in configs}
+    assert all(int(row['steps_run']) > 0 for row in rows)
+
+
+def test_resume_drops_row_cut_short(tmp_path):
+    out = str(tmp_path / 'results.csv')
+    configs = expand_grid(['storage_walls'], [(12, 10)], [4], [1], [0, 1], num_tasks=30, steps=20)
+    assert run_sweep(configs, out, workers=2) == 2
+
+    # Simulate a run killed while writing its row: the last row loses its end, throughput included
+    with open(out, 'rb') as f:
+        content = f.read()
+    with open(out, 'wb') as f:
+        f.write(content[:-4])
+    assert len(completed_run_ids(out)) == 2
+
+    assert run_sweep(configs, out, workers=2) == 1
+    rows = read_rows(out)
+    assert len(rows) == 2
+    assert completed_run_ids(out) == {c.run_id for c in configs}
+    assert all(len(row) == len(rows[0]) and None not in row for row in rows)
+    assert not drop_partial_row(out)
@@ -0,0 +1,58 @@
+import random
+
+from generators.layout import obstacle_walls
+from models.dist_table import DistTable
+from models.task import Task
+from simulations.task_assigner import TaskAssigner
+
+
+def brute_force(pos, tasks, dist, max_dist):
+    best, best_d = None, max_dist
+    for task in tasks:
+        d = dist(pos, (task.x, task.y))
+        if d < best_d:
+            best, best_d = task, d
+    return best, best_d
+
+
+def test_matches_linear_scan():
+    rng = random.Random(0)
+    layout = obstacle_walls(40, 30)
+    tables: dict = {}
+
+    def dist(start, goal):
+        if goal not in tables:
+            tables[goal] = DistTable(layout.grid, goal, eager=True)
+        return tables[goal].get(start)
+
+    free_cells = [(x, y) for y in range(layout.height) for x in range(layout.width) if layout.grid[y, x]]
+    tasks = [Task(*rng.choice(layout.storage_cells)) for _ in range(200)]
+    assigner = TaskAssigner(layout.width, layout.height, bucket_size=4)
+    assigner.reset(tasks)
+    remaining = list(tasks)
+
+    for _ in range(150):
+        pos = rng.choice(free_cells)
+        expected = brute_force(pos, remaining, dist, layout.grid.size)
+        task, d = assigner.nearest(pos, dist)
+        assert (task, d) == expected
+        assert task is expected[0]
+        assigner.remove(task)
+        remaining.remove(task)
+
+
+def test_top_k_limits_evaluations():
+    layout = obstacle_walls(40, 30)
+    tasks = [Task(x, y) for x, y in layout.storage_cells[:50]]
+    assigner = TaskAssigner(layout.width, layout.height, top_k=3)
+    assigner.reset(tasks)
+    calls = []
+
+    def dist(start, goal):
+        calls.append(goal)
+        # Far above the Manhattan bound, so only top_k stops the search
+        return abs(start[0] - goal[0]) + abs(start[1] - goal[1]) + 100
+
+    task, _ = assigner.nearest((0, 0), dist)
+    assert task is not None
+    assert len(calls) == 3
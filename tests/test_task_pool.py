@@ -0,0 +1,57 @@
+from models.task import Task
+from models.task_pool import TaskPool
+
+
+def make_task(status: str = Task.STATUS_NOTREVEALED) -> Task:
+    return Task(x=1, y=1, delivery_x=0, delivery_y=0, status=status)
+
+
+def test_counters_through_lifecycle():
+    tasks = [make_task() for _ in range(3)]
+    pool = TaskPool(tasks)
+    assert pool.count(Task.STATUS_NOTREVEALED) == 3
+
+    task = pool.reveal_next()
+    assert task is tasks[0]
+    assert pool.count(Task.STATUS_NOTREVEALED) == 2
+    assert pool.count(Task.STATUS_PENDING) == 1
+    assert pool.available() == [task]
+
+    pool.target(task)
+    assert pool.available() == []
+    assert pool.pending() == [task]
+    assert pool.count(Task.STATUS_PENDING) == 1
+
+    pool.set_status(task, Task.STATUS_DELIVERING)
+    assert pool.pending() == []
+    assert pool.delivering() == [task]
+    assert pool.count(Task.STATUS_DELIVERING) == 1
+
+    pool.set_status(task, Task.STATUS_COMPLETED)
+    assert pool.delivering() == []
+    assert pool.count(Task.STATUS_COMPLETED) == 1
+    assert not pool.is_complete()
+
+
+def test_equal_tasks_are_tracked_by_identity():
+    a, b = make_task(), make_task()
+    assert a == b
+    pool = TaskPool([a, b])
+
+    pool.set_status(b, Task.STATUS_PENDING)
+    assert pool.reveal_next() is a
+    assert pool.reveal_next() is None
+    assert a.status == b.status == Task.STATUS_PENDING
+    assert pool.count(Task.STATUS_NOTREVEALED) == 0
+    assert pool.count(Task.STATUS_PENDING) == 2
+    assert len(pool.available()) == 2
+
+
+def test_add_shares_task_list():
+    tasks = []
+    pool = TaskPool(tasks)
+    pool.add(make_task(Task.STATUS_PENDING))
+    assert len(tasks) == 1
+    assert len(pool) == 1
+    pool.set_status(tasks[0], Task.STATUS_COMPLETED)
+    assert pool.is_complete()
@@ -0,0 +1,69 @@
+import itertools
+
+import numpy as np
+
+from generators.layout import storage_walls
+from generators.task_stream import (batch_arrivals, order_history_weights, poisson_arrivals,
+                                    stream_tasks, zipf_weights)
+from models.agent import Agent
+from models.task import Task
+from simulations.pibt_mapd_task_stream_simulation import PIBTMAPDSimulationWithTaskStream
+
+
+def test_zipf_weights():
+    weights = zipf_weights(100, exponent=1.0, seed=3)
+    assert np.isclose(weights.sum(), 1.0)
+    assert np.isclose(weights.max() / weights.min(), 100.0)
+    assert np.allclose(np.sort(zipf_weights(5, exponent=0.0)), 0.2)
+
+
+def test_order_history_weights(tmp_path):
+    layout = storage_walls(12, 10)
+    a, b = layout.storage_cells[:2]
+    path = tmp_path / 'orders.csv'
+    path.write_text(f"# x,y[,count]\n{a[0]},{a[1]}\n{b[0]},{b[1]},3\n")
+    weights = order_history_weights(layout, str(path))
+    assert weights[0] == 0.25 and weights[1] == 0.75
+    assert weights[2:].sum() == 0
+
+
+def test_arrival_processes():
+    times = list(itertools.islice(poisson_arrivals(2.0, seed=1), 20_000))
+    assert times == sorted(times)
+    assert abs(len(times) / (times[-1] + 1) - 2.0) < 0.1
+    assert list(itertools.islice(batch_arrivals(2, 5), 6)) == [0, 0, 5, 5, 10, 10]
+
+
+def test_stream_draws_pickups_by_weight():
+    layout = storage_walls(12, 10)
+    weights = np.zeros(len(layout.storage_cells))
+    weights[3] = 1.0
+    tasks = [task for _, task in stream_tasks(layout, batch_arrivals(10, 1), weights, max_tasks=25)]
+    assert len(tasks) == 25
+    assert all((task.x, task.y) == layout.storage_cells[3] for task in tasks)
+    assert all((task.delivery_x, task.delivery_y) in layout.output_cells for task in tasks)
+
+
+def test_simulation_pulls_tasks_lazily_and_drops_completed():
+    layout = storage_walls(12, 10)
+    agents = [Agent(id=i, x=x, y=y) for i, (x, y) in enumerate([(0, 0), (11, 9), (0, 9)])]
+    pulled = []
+
+    def stream():
+        for t, task in stream_tasks(layout, batch_arrivals(1, 10), max_tasks=5, seed=2):
+            pulled.append(t)
+            yield t, task
+
+    simulation = PIBTMAPDSimulationWithTaskStream(layout, agents, stream(), seed=0)
+    simulation.step()
+    assert len(simulation.task_pool) == 1
+    assert pulled == [0, 10]  # one task of lookahead
+
+    steps = 1
+    while not simulation.is_complete():
+        simulation.step()
+        steps += 1
+        assert steps < 1_000
+    assert len(simulation.task_pool) == 5
+    assert simulation.task_pool.count(Task.STATUS_COMPLETED) == 5
+    assert simulation.task_pool.tasks == []
@@ -0,0 +1,44 @@
+import numpy as np
+
+from models.task import Task
+from models.trajectory import Trajectory, TrajectoryRecorder
+from runners.headless import build_simulation, run_headless
+from windows.frame import Frame
+from windows.replay import TrajectoryReplay
+
+
+def test_recording_matches_live_frames(tmp_path):
+    simulation = build_simulation('storage_walls', 12, 10, num_agents=5, num_tasks=30, reveal_interval=2, seed=1)
+    recorder = TrajectoryRecorder(simulation, str(tmp_path), chunk_steps=7)
+    live = [Frame.capture(simulation, 0)]
+    for t in range(1, 41):
+        recorder.step()
+        live.append(Frame.capture(simulation, t))
+    recorder.close()
+
+    trajectory = Trajectory(str(tmp_path))
+    assert len(trajectory) == 41
+    assert trajectory.positions.dtype == np.int16
+    assert np.array_equal(trajectory.layout.cells, simulation.layout.cells)
+
+    replay = TrajectoryReplay(trajectory)
+    for t in (40, 0, 17, 33):  # seek in any order
+        replay.seek(t)
+        frame = replay.frame()
+        assert frame.agents == live[t].agents
+        assert sorted(frame.pickups) == sorted(live[t].pickups)
+        assert sorted(frame.deliveries) == sorted(live[t].deliveries)
+        assert frame.tasks_completed == live[t].tasks_completed
+
+
+def test_partial_recording_is_readable(tmp_path):
+    simulation = build_simulation('storage_walls', 12, 10, num_agents=3, num_tasks=10, seed=0)
+    recorder = TrajectoryRecorder(simulation, str(tmp_path), chunk_steps=4)
+    run_headless(simulation, 10, recorder)  # flushed after 4 and 8 configurations, not closed
+    assert len(Trajectory(str(tmp_path))) == 8
+    recorder.close()
+    trajectory = Trajectory(str(tmp_path))
+    assert len(trajectory) == 11
+    assert simulation.task_pool.listeners == []
+    assert trajectory.meta['tasks_total'] == 10
+    assert trajectory.task_states(10)[2] == simulation.task_pool.count(Task.STATUS_COMPLETED)
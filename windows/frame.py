@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+
+from models.simulation import SimulationBase
+from models.task import Task
+
+
+@dataclass(frozen=True)
+class Frame:
+    """Everything MapCanvas draws on top of the layout for one simulation step.
+
+    Captured once per step, so painting is O(agents + tasks) regardless of
+    how often the canvas repaints, and free of Qt so it can be built outside
+    the GUI thread.
+    """
+    step: int
+    agents: tuple[tuple[int, int, int], ...]  # (x, y, agent id)
+    pickups: tuple[tuple[int, int, int | None], ...]  # pending tasks (x, y, id of targeting agent)
+    deliveries: tuple[tuple[int, int, int | None], ...]  # delivering tasks (x, y, id of carrying agent)
+    tasks_completed: int
+    tasks_total: int
+
+    @classmethod
+    def capture(cls, simulation: SimulationBase, step: int) -> 'Frame':
+        """Capture the current simulation state."""
+        # Agent-to-task index, built once instead of an agent scan per task
+        labels: dict[int, int] = {}
+        agents = []
+        for agent in simulation.agents:
+            agents.append((agent.x, agent.y, agent.id))
+            if agent.task is not None:
+                labels[id(agent.task)] = agent.id
+            if agent.target_task is not None:
+                labels[id(agent.target_task)] = agent.id
+
+        task_pool = simulation.task_pool
+        return cls(
+            step=step,
+            agents=tuple(agents),
+            pickups=tuple((task.x, task.y, labels.get(id(task))) for task in task_pool.pending()),
+            deliveries=tuple((task.delivery_x, task.delivery_y, labels.get(id(task)))
+                             for task in task_pool.delivering() if task.delivery_x is not None),
+            tasks_completed=task_pool.count(Task.STATUS_COMPLETED),
+            tasks_total=len(task_pool),
+        )
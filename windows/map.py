@@ -1,23 +1,37 @@
-from PySide6.QtWidgets import QMainWindow, QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QFrame
+from PySide6.QtWidgets import QMainWindow, QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QFrame, QSlider
 from PySide6.QtCore import Qt, QRect, QTimer
-from PySide6.QtGui import QPainter, QColor, QPen, QFont
+from PySide6.QtGui import QPainter, QColor, QPen, QFont, QPixmap
 from models.simulation import SimulationBase
 from models.layout import Layout
+from windows.frame import Frame
+from windows.replay import TrajectoryReplay
+from windows.simulation_thread import SimulationThread
 
 
 class MapWindow(QMainWindow):
-    def __init__(self, simulation: SimulationBase, cell_size: int = 40, tick_interval: int = 500):
+    FRAME_INTERVAL = 16  # ms between canvas refreshes in threaded mode
+
+    def __init__(self, simulation: SimulationBase | TrajectoryReplay, cell_size: int = 40,
+                 tick_interval: int = 500, threaded: bool = False):
         super().__init__()
         self.simulation = simulation
         self.tick_interval = tick_interval
         self.step_count = 0
+        self.replay = simulation if isinstance(simulation, TrajectoryReplay) else None
         
-        self.setWindowTitle("Map Layout")
+        self.setWindowTitle("Map Layout" if self.replay is None else "Map Replay")
         
-        # Create timer for automatic steps
+        # In threaded mode the simulation steps in a worker thread and the timer only
+        # picks up its latest frame; otherwise the timer steps the simulation (or replay) itself
+        threaded = threaded and self.replay is None  # replay steps are cheap
+        self.sim_thread = SimulationThread(simulation, tick_interval / 1000) if threaded else None
         self.timer = QTimer()
-        self.timer.timeout.connect(self.on_timer_tick)
-        self.timer.setInterval(tick_interval)  # milliseconds
+        if self.sim_thread is not None:
+            self.timer.timeout.connect(self.on_frame_tick)
+            self.timer.setInterval(self.FRAME_INTERVAL)
+        else:
+            self.timer.timeout.connect(self.on_timer_tick)
+            self.timer.setInterval(tick_interval)  # milliseconds
         
         # Create central widget with layout
         central_widget = QWidget()
@@ -66,6 +80,18 @@ class MapWindow(QMainWindow):
         separator2.setFrameShape(QFrame.Shape.HLine)
         separator2.setFrameShadow(QFrame.Shadow.Sunken)
         button_layout.addWidget(separator2)
+
+        # Seek control (replay only)
+        self.seek_slider = None
+        if self.replay is not None:
+            seek_label = QLabel("Timestep")
+            seek_label.setStyleSheet("font-weight: bold; margin-top: 10px;")
+            button_layout.addWidget(seek_label)
+
+            self.seek_slider = QSlider(Qt.Orientation.Horizontal)
+            self.seek_slider.setRange(0, self.replay.num_steps)
+            self.seek_slider.valueChanged.connect(self.on_seek)
+            button_layout.addWidget(self.seek_slider)
         
         # Statistics section
         stats_label = QLabel("Statistics")
@@ -74,7 +100,8 @@ class MapWindow(QMainWindow):
         
         self.steps_label = QLabel(f"Steps: {self.step_count}")
         self.speed_label = QLabel(f"Speed: {self.tick_interval}ms")
-        self.tasks_label = QLabel(f"Tasks: 0/{len(simulation.tasks)}")
+        frame = self.capture_frame()
+        self.tasks_label = QLabel(f"Tasks: {frame.tasks_completed}/{frame.tasks_total}")
         
         button_layout.addWidget(self.steps_label)
         button_layout.addWidget(self.speed_label)
@@ -84,7 +111,7 @@ class MapWindow(QMainWindow):
         main_layout.addWidget(left_panel)
         
         # Create canvas for drawing
-        self.canvas = MapCanvas(simulation)
+        self.canvas = MapCanvas(simulation, frame)
         main_layout.addWidget(self.canvas)
         
         # Connect button signals
@@ -98,59 +125,116 @@ class MapWindow(QMainWindow):
         window_width = simulation.layout.width * cell_size + 170  # Extra space for left panel
         window_height = simulation.layout.height * cell_size + 20
         self.resize(window_width, window_height)
+
+        if self.sim_thread is not None:
+            self.sim_thread.start()
+            self.timer.start()
     
-    def on_timer_tick(self):
-        """Called automatically by timer"""
+    def capture_frame(self) -> Frame:
+        """Frame of the current state of the simulation or replay"""
+        if self.replay is not None:
+            return self.replay.frame()
+        return Frame.capture(self.simulation, self.step_count)
+
+    def advance(self):
+        """Perform one step and show it"""
         self.simulation.step()
-        self.step_count += 1
+        if self.replay is not None:
+            self.step_count = self.replay.timestep
+            self.seek_slider.blockSignals(True)
+            self.seek_slider.setValue(self.step_count)
+            self.seek_slider.blockSignals(False)
+        else:
+            self.step_count += 1
+        self.canvas.set_frame(self.capture_frame())  # Trigger repaint
         self.update_stats()
-        self.canvas.update()  # Trigger repaint
+
+    def on_timer_tick(self):
+        """Called automatically by timer"""
+        self.advance()
     
+    def on_seek(self, timestep: int):
+        """Handle seek slider change - jump to a recorded timestep"""
+        self.replay.seek(timestep)
+        self.step_count = self.replay.timestep
+        self.canvas.set_frame(self.capture_frame())
+        self.update_stats()
+
+    def on_frame_tick(self):
+        """Called by timer in threaded mode - show the latest published frame"""
+        frame = self.sim_thread.frame
+        if frame is not self.canvas.frame:
+            self.step_count = frame.step
+            self.canvas.set_frame(frame)
+            self.update_stats()
+
     def on_start(self):
         """Handle start button click"""
-        self.timer.start()
+        if self.sim_thread is not None:
+            self.sim_thread.resume()
+        else:
+            self.timer.start()
         print("Simulation started")
     
     def on_stop(self):
         """Handle stop button click"""
-        self.timer.stop()
+        if self.sim_thread is not None:
+            self.sim_thread.pause()
+        else:
+            self.timer.stop()
         print("Simulation stopped")
     
     def on_step(self):
         """Handle step button click - perform one step"""
-        self.simulation.step()
-        self.step_count += 1
-        self.update_stats()
-        self.canvas.update()  # Trigger repaint
+        if self.sim_thread is not None:
+            self.sim_thread.step_once()
+            return
+        self.advance()
         print("Step executed")
     
     def on_speed_up(self):
         """Handle speed up button click - decrease interval by 20%"""
-        self.tick_interval = max(5, int(self.tick_interval * 0.8))  # Min 5ms
-        self.timer.setInterval(self.tick_interval)
+        if self.sim_thread is not None:
+            # No minimum, below 5ms the thread steps as fast as possible
+            self.tick_interval = int(self.tick_interval * 0.8) if self.tick_interval >= 5 else 0
+            self.sim_thread.step_interval = self.tick_interval / 1000
+        else:
+            self.tick_interval = max(5, int(self.tick_interval * 0.8))  # Min 5ms
+            self.timer.setInterval(self.tick_interval)
         self.update_stats()
         print(f"Speed increased - interval: {self.tick_interval}ms")
     
     def on_slow_down(self):
         """Handle slow down button click - increase interval by 25%"""
-        self.tick_interval = min(5000, int(self.tick_interval * 1.25))  # Max 5000ms
-        self.timer.setInterval(self.tick_interval)
+        self.tick_interval = min(5000, max(5, int(self.tick_interval * 1.25)))  # Max 5000ms
+        if self.sim_thread is not None:
+            self.sim_thread.step_interval = self.tick_interval / 1000
+        else:
+            self.timer.setInterval(self.tick_interval)
         self.update_stats()
         print(f"Speed decreased - interval: {self.tick_interval}ms")
     
     def update_stats(self):
         """Update the statistics labels"""
-        from models.task import Task
-        completed = sum(1 for t in self.simulation.tasks if t.status == Task.STATUS_COMPLETED)
+        # Counts come from the shown frame, the task pool may belong to the worker thread
+        frame = self.canvas.frame
         self.steps_label.setText(f"Steps: {self.step_count}")
-        self.speed_label.setText(f"Speed: {self.tick_interval}ms")
-        self.tasks_label.setText(f"Tasks: {completed}/{len(self.simulation.tasks)}")
+        self.speed_label.setText(f"Speed: {self.tick_interval}ms" if self.tick_interval else "Speed: max")
+        self.tasks_label.setText(f"Tasks: {frame.tasks_completed}/{frame.tasks_total}")
+
+    def closeEvent(self, event):
+        if self.sim_thread is not None:
+            self.sim_thread.stop()
+        super().closeEvent(event)
 
 
 class MapCanvas(QWidget):
-    def __init__(self, simulation: SimulationBase):
+    LABEL_MIN_CELL_SIZE = 8  # px, smaller cells are drawn without id labels
+
+    def __init__(self, simulation: SimulationBase | TrajectoryReplay, frame: Frame):
         super().__init__()
         self.simulation = simulation
+        self.frame = frame
         
         # Define colors for different cell types
         self.colors = {
@@ -162,111 +246,96 @@ class MapCanvas(QWidget):
         # Colors
         self.agent_color = QColor(255, 0, 0)  # Red
         self.task_color = QColor(0, 200, 0)   # Green
-    
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Calculate cell size based on current widget size
+        self.delivery_color = QColor(255, 165, 0)  # Orange for delivery locations
+        self.label_pen = QPen(QColor(255, 255, 255), 2)
+
+        # Static layer (layout cells), re-rendered only on resize or layout change
+        self._static: QPixmap | None = None
+        self._static_key: tuple | None = None
+        self._font = QFont()
+        self._font.setBold(True)
+
+    def set_frame(self, frame: Frame):
+        """Show a new frame (captured after a simulation step)."""
+        self.frame = frame
+        self.update()
+
+    def _geometry(self) -> tuple[float, float, float]:
+        """Cell size and offsets (x, y) that center the grid in the widget."""
+        layout = self.simulation.layout
         padding = 20
-        available_width = self.width() - padding
-        available_height = self.height() - padding
-        
-        cell_width = available_width / self.simulation.layout.width
-        cell_height = available_height / self.simulation.layout.height
+        cell_width = (self.width() - padding) / layout.width
+        cell_height = (self.height() - padding) / layout.height
         
         # Use the smaller dimension to keep cells square
         cell_size = min(cell_width, cell_height)
         
-        # Calculate offset to center the grid
-        offset_x = (self.width() - (cell_size * self.simulation.layout.width)) / 2
-        offset_y = (self.height() - (cell_size * self.simulation.layout.height)) / 2
-        
-        # Draw grid
-        for y in range(self.simulation.layout.height):
-            for x in range(self.simulation.layout.width):
-                cell_value = self.simulation.layout.get_value(x, y)
-                
-                # Get cell color
-                color = self.colors.get(cell_value, QColor(200, 200, 200))
-                
-                # Calculate cell position
-                rect = QRect(
-                    int(x * cell_size + offset_x),
-                    int(y * cell_size + offset_y),
-                    int(cell_size),
-                    int(cell_size)
-                )
-                
-                # Fill cell
-                painter.fillRect(rect, color)
-                
-                # Draw cell border
-                painter.setPen(QPen(QColor(0, 0, 0), 1))
+        offset_x = (self.width() - (cell_size * layout.width)) / 2
+        offset_y = (self.height() - (cell_size * layout.height)) / 2
+        return cell_size, offset_x, offset_y
+
+    def _static_layer(self, cell_size: float, offset_x: float, offset_y: float) -> QPixmap:
+        """Pixmap of the layout cells, cached until the size or the layout changes."""
+        layout = self.simulation.layout
+        key = (self.width(), self.height(), self.devicePixelRatioF(), id(layout), layout.revision)
+        if self._static is not None and self._static_key == key:
+            return self._static
+
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * ratio), int(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setPen(QPen(QColor(0, 0, 0), 1))
+        size = int(cell_size)
+        for y, row in enumerate(layout.cells.tolist()):
+            for x, cell_value in enumerate(row):
+                rect = QRect(int(x * cell_size + offset_x), int(y * cell_size + offset_y), size, size)
+                painter.fillRect(rect, self.colors.get(cell_value, QColor(200, 200, 200)))
                 painter.drawRect(rect)
-        
-        # Draw tasks
-        from models.task import Task
-        delivery_color = QColor(255, 165, 0)  # Orange for delivery locations
-        for task in self.simulation.tasks:
-            # Draw pending tasks (pickup location)
-            if task.status == Task.STATUS_PENDING:
-                task_rect = QRect(
-                    int(task.x * cell_size + offset_x),
-                    int(task.y * cell_size + offset_y),
-                    int(cell_size),
-                    int(cell_size)
-                )
-                painter.fillRect(task_rect, self.task_color)
+        painter.end()
 
-                # Draw agent ID if task is targeted by an agent
-                for agent in self.simulation.agents:
-                    if agent.target_task == task:
-                        painter.setPen(QPen(QColor(255, 255, 255), 2))
-                        font = QFont()
-                        font.setPointSize(max(10, int(cell_size / 2.5)))
-                        font.setBold(True)
-                        painter.setFont(font)
-                        painter.drawText(task_rect, Qt.AlignmentFlag.AlignCenter, str(agent.id))
-                        break
+        self._static = pixmap
+        self._static_key = key
+        return pixmap
 
-            # Draw delivering tasks (delivery location)
-            if task.status == Task.STATUS_DELIVERING and task.delivery_x is not None:
-                delivery_rect = QRect(
-                    int(task.delivery_x * cell_size + offset_x),
-                    int(task.delivery_y * cell_size + offset_y),
-                    int(cell_size),
-                    int(cell_size)
-                )
-                painter.fillRect(delivery_rect, delivery_color)
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        cell_size, offset_x, offset_y = self._geometry()
+        size = int(cell_size)
+
+        # Draw grid
+        painter.drawPixmap(0, 0, self._static_layer(cell_size, offset_x, offset_y))
+
+        frame = self.frame
+        labels = cell_size >= self.LABEL_MIN_CELL_SIZE
+        if labels:
+            self._font.setPointSize(max(10, int(cell_size / 2.5)))
+            painter.setFont(self._font)
+            painter.setPen(self.label_pen)
+
+        def cell_rect(x: int, y: int) -> QRect:
+            return QRect(int(x * cell_size + offset_x), int(y * cell_size + offset_y), size, size)
+
+        # Draw pending tasks (pickup location) and delivering tasks (delivery location),
+        # labeled with the id of the agent targeting or carrying them
+        for tasks, color in ((frame.pickups, self.task_color), (frame.deliveries, self.delivery_color)):
+            for x, y, agent_id in tasks:
+                rect = cell_rect(x, y)
+                painter.fillRect(rect, color)
+                if labels and agent_id is not None:
+                    painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, str(agent_id))
 
-                # Draw agent ID on delivery location
-                for agent in self.simulation.agents:
-                    if agent.task == task:
-                        painter.setPen(QPen(QColor(255, 255, 255), 2))
-                        font = QFont()
-                        font.setPointSize(max(10, int(cell_size / 2.5)))
-                        font.setBold(True)
-                        painter.setFont(font)
-                        painter.drawText(delivery_rect, Qt.AlignmentFlag.AlignCenter, str(agent.id))
-                        break
-        
         # Draw agents as circles
-        for agent in self.simulation.agents:
-            agent_rect = QRect(
-                int(agent.x * cell_size + offset_x),
-                int(agent.y * cell_size + offset_y),
-                int(cell_size),
-                int(cell_size)
-            )
-            painter.setBrush(self.agent_color)
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawEllipse(agent_rect)
-            
-            # Draw agent ID
-            painter.setPen(QPen(QColor(255, 255, 255), 2))
-            font = QFont()
-            font.setPointSize(max(10, int(cell_size / 2.5)))
-            font.setBold(True)
-            painter.setFont(font)
-            painter.drawText(agent_rect, Qt.AlignmentFlag.AlignCenter, str(agent.id))
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setBrush(self.agent_color)
+        painter.setPen(Qt.PenStyle.NoPen)
+        for x, y, _ in frame.agents:
+            painter.drawEllipse(cell_rect(x, y))
+
+        # Draw agent IDs
+        if labels:
+            painter.setPen(self.label_pen)
+            for x, y, agent_id in frame.agents:
+                painter.drawText(cell_rect(x, y), Qt.AlignmentFlag.AlignCenter, str(agent_id))
@@ -0,0 +1,45 @@
+from models.trajectory import Trajectory
+from windows.frame import Frame
+
+
+class TrajectoryReplay:
+    """Recorded trajectory shown by MapWindow in place of a live simulation.
+
+    step() advances a cursor instead of simulating, and seek() jumps to any
+    timestep directly through the memory-mapped recording.
+    """
+
+    def __init__(self, trajectory: Trajectory):
+        self.trajectory = trajectory
+        self.layout = trajectory.layout
+        self.timestep = 0
+
+    @property
+    def num_steps(self) -> int:
+        """Last timestep that can be shown."""
+        return len(self.trajectory) - 1
+
+    def step(self):
+        """Advance to the next recorded timestep (stays at the last one)."""
+        self.seek(self.timestep + 1)
+
+    def seek(self, timestep: int):
+        self.timestep = max(0, min(timestep, self.num_steps))
+
+    def frame(self) -> Frame:
+        """Frame of the current timestep."""
+        t = self.timestep
+        pickups, deliveries, completed = self.trajectory.task_states(t)
+
+        def rows(tasks) -> tuple:
+            return tuple((x, y, agent if agent >= 0 else None) for x, y, agent in tasks.tolist())
+
+        return Frame(
+            step=t,
+            agents=tuple((x, y, agent_id) for agent_id, (x, y)
+                         in zip(self.trajectory.meta['agent_ids'], self.trajectory.positions[t].tolist())),
+            pickups=rows(pickups),
+            deliveries=rows(deliveries),
+            tasks_completed=completed,
+            tasks_total=self.trajectory.meta['tasks_total'],
+        )
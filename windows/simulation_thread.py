@@ -0,0 +1,86 @@
+import threading
+import time
+
+from models.simulation import SimulationBase
+from windows.frame import Frame
+
+
+class SimulationThread(threading.Thread):
+    """Steps a simulation in a background thread and publishes frames.
+
+    The GUI thread never touches the simulation while this thread runs; it
+    reads `frame`, an immutable snapshot replaced at most every
+    publish_interval seconds (and whenever the thread pauses), so the canvas
+    can poll at display refresh rate and intermediate steps are skipped.
+    """
+
+    def __init__(self, simulation: SimulationBase, step_interval: float = 0.0,
+                 publish_interval: float = 1 / 60):
+        super().__init__(daemon=True)
+        self.simulation = simulation
+        self.step_interval = step_interval  # seconds between steps, 0 runs as fast as possible
+        self.publish_interval = publish_interval
+        self.step_count = 0
+        self.frame = Frame.capture(simulation, 0)
+        self._cond = threading.Condition()
+        self._running = False
+        self._stopped = False
+        self._requested_steps = 0
+
+    def resume(self):
+        """Step continuously."""
+        with self._cond:
+            self._running = True
+            self._cond.notify()
+
+    def pause(self):
+        """Stop stepping after the current step."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    def step_once(self):
+        """Perform a single step while paused."""
+        with self._cond:
+            self._requested_steps += 1
+            self._cond.notify()
+
+    def stop(self, timeout: float | None = None):
+        """Terminate the thread and wait for it."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self.is_alive():
+            self.join(timeout)
+
+    def _publish(self):
+        self.frame = Frame.capture(self.simulation, self.step_count)
+
+    def run(self):
+        last_publish = time.perf_counter()
+        while True:
+            with self._cond:
+                while not (self._stopped or self._running or self._requested_steps):
+                    if self.frame.step != self.step_count:
+                        self._publish()
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                continuous = self._running
+                if not continuous:
+                    self._requested_steps -= 1
+
+            started = time.perf_counter()
+            self.simulation.step()
+            self.step_count += 1
+
+            now = time.perf_counter()
+            if not continuous or now - last_publish >= self.publish_interval:
+                self._publish()
+                last_publish = now
+
+            delay = self.step_interval - (time.perf_counter() - started)
+            if continuous and delay > 0:
+                with self._cond:
+                    # Woken early by pause/stop
+                    self._cond.wait_for(lambda: self._stopped or not self._running, timeout=delay)